@@ -0,0 +1,181 @@
+"""add ml_input_features typed table and ml_inputs_compat view
+
+Revision ID: 5e8b2d41c6a9
+Revises: a3c91e5d7f20
+Create Date: 2026-10-19 10:02:17.530914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '5e8b2d41c6a9'
+down_revision: Union[str, Sequence[str], None] = 'a3c91e5d7f20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Features typées (FEATURE_STORAGE=columns) : pas de JSONB ni de GIN
+    op.create_table(
+        "ml_input_features",
+        sa.Column(
+            "input_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("ml_inputs.id", ondelete="CASCADE"),
+            primary_key=True,
+            nullable=False,
+        ),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("model_name", sa.String(length=100), nullable=True),
+        sa.Column("SK_ID_CURR", sa.BigInteger(), nullable=True),
+        sa.Column("CNT_CHILDREN", sa.Float(), nullable=True),
+        sa.Column("AMT_INCOME_TOTAL", sa.Float(), nullable=True),
+        sa.Column("AMT_CREDIT", sa.Float(), nullable=True),
+        sa.Column("AMT_ANNUITY", sa.Float(), nullable=True),
+        sa.Column("AMT_GOODS_PRICE", sa.Float(), nullable=True),
+        sa.Column("REGION_POPULATION_RELATIVE", sa.Float(), nullable=True),
+        sa.Column("DAYS_BIRTH", sa.Float(), nullable=True),
+        sa.Column("DAYS_EMPLOYED", sa.Float(), nullable=True),
+        sa.Column("DAYS_REGISTRATION", sa.Float(), nullable=True),
+        sa.Column("DAYS_ID_PUBLISH", sa.Float(), nullable=True),
+        sa.Column("OWN_CAR_AGE", sa.Float(), nullable=True),
+        sa.Column("FLAG_MOBIL", sa.Float(), nullable=True),
+        sa.Column("FLAG_EMP_PHONE", sa.Float(), nullable=True),
+        sa.Column("FLAG_WORK_PHONE", sa.Float(), nullable=True),
+        sa.Column("FLAG_CONT_MOBILE", sa.Float(), nullable=True),
+        sa.Column("FLAG_PHONE", sa.Float(), nullable=True),
+        sa.Column("FLAG_EMAIL", sa.Float(), nullable=True),
+        sa.Column("CNT_FAM_MEMBERS", sa.Float(), nullable=True),
+        sa.Column("REGION_RATING_CLIENT", sa.Float(), nullable=True),
+        sa.Column("REGION_RATING_CLIENT_W_CITY", sa.Float(), nullable=True),
+        sa.Column("HOUR_APPR_PROCESS_START", sa.Float(), nullable=True),
+        sa.Column("REG_REGION_NOT_LIVE_REGION", sa.Float(), nullable=True),
+        sa.Column("REG_REGION_NOT_WORK_REGION", sa.Float(), nullable=True),
+        sa.Column("LIVE_REGION_NOT_WORK_REGION", sa.Float(), nullable=True),
+        sa.Column("REG_CITY_NOT_LIVE_CITY", sa.Float(), nullable=True),
+        sa.Column("REG_CITY_NOT_WORK_CITY", sa.Float(), nullable=True),
+        sa.Column("LIVE_CITY_NOT_WORK_CITY", sa.Float(), nullable=True),
+        sa.Column("EXT_SOURCE_1", sa.Float(), nullable=True),
+        sa.Column("EXT_SOURCE_2", sa.Float(), nullable=True),
+        sa.Column("EXT_SOURCE_3", sa.Float(), nullable=True),
+        sa.Column("APARTMENTS_AVG", sa.Float(), nullable=True),
+        sa.Column("BASEMENTAREA_AVG", sa.Float(), nullable=True),
+        sa.Column("YEARS_BEGINEXPLUATATION_AVG", sa.Float(), nullable=True),
+        sa.Column("YEARS_BUILD_AVG", sa.Float(), nullable=True),
+        sa.Column("COMMONAREA_AVG", sa.Float(), nullable=True),
+        sa.Column("ELEVATORS_AVG", sa.Float(), nullable=True),
+        sa.Column("ENTRANCES_AVG", sa.Float(), nullable=True),
+        sa.Column("FLOORSMAX_AVG", sa.Float(), nullable=True),
+        sa.Column("FLOORSMIN_AVG", sa.Float(), nullable=True),
+        sa.Column("LANDAREA_AVG", sa.Float(), nullable=True),
+        sa.Column("LIVINGAPARTMENTS_AVG", sa.Float(), nullable=True),
+        sa.Column("LIVINGAREA_AVG", sa.Float(), nullable=True),
+        sa.Column("NONLIVINGAPARTMENTS_AVG", sa.Float(), nullable=True),
+        sa.Column("NONLIVINGAREA_AVG", sa.Float(), nullable=True),
+        sa.Column("TOTALAREA_MODE", sa.Float(), nullable=True),
+        sa.Column("OBS_30_CNT_SOCIAL_CIRCLE", sa.Float(), nullable=True),
+        sa.Column("DEF_30_CNT_SOCIAL_CIRCLE", sa.Float(), nullable=True),
+        sa.Column("OBS_60_CNT_SOCIAL_CIRCLE", sa.Float(), nullable=True),
+        sa.Column("DEF_60_CNT_SOCIAL_CIRCLE", sa.Float(), nullable=True),
+        sa.Column("DAYS_LAST_PHONE_CHANGE", sa.Float(), nullable=True),
+        sa.Column("FLAG_DOCUMENT_2", sa.Float(), nullable=True),
+        sa.Column("FLAG_DOCUMENT_3", sa.Float(), nullable=True),
+        sa.Column("FLAG_DOCUMENT_4", sa.Float(), nullable=True),
+        sa.Column("FLAG_DOCUMENT_5", sa.Float(), nullable=True),
+        sa.Column("FLAG_DOCUMENT_6", sa.Float(), nullable=True),
+        sa.Column("FLAG_DOCUMENT_7", sa.Float(), nullable=True),
+        sa.Column("FLAG_DOCUMENT_8", sa.Float(), nullable=True),
+        sa.Column("FLAG_DOCUMENT_9", sa.Float(), nullable=True),
+        sa.Column("FLAG_DOCUMENT_10", sa.Float(), nullable=True),
+        sa.Column("FLAG_DOCUMENT_11", sa.Float(), nullable=True),
+        sa.Column("FLAG_DOCUMENT_12", sa.Float(), nullable=True),
+        sa.Column("FLAG_DOCUMENT_13", sa.Float(), nullable=True),
+        sa.Column("FLAG_DOCUMENT_14", sa.Float(), nullable=True),
+        sa.Column("FLAG_DOCUMENT_15", sa.Float(), nullable=True),
+        sa.Column("FLAG_DOCUMENT_16", sa.Float(), nullable=True),
+        sa.Column("FLAG_DOCUMENT_17", sa.Float(), nullable=True),
+        sa.Column("FLAG_DOCUMENT_18", sa.Float(), nullable=True),
+        sa.Column("FLAG_DOCUMENT_19", sa.Float(), nullable=True),
+        sa.Column("FLAG_DOCUMENT_20", sa.Float(), nullable=True),
+        sa.Column("FLAG_DOCUMENT_21", sa.Float(), nullable=True),
+        sa.Column("AMT_REQ_CREDIT_BUREAU_HOUR", sa.Float(), nullable=True),
+        sa.Column("AMT_REQ_CREDIT_BUREAU_DAY", sa.Float(), nullable=True),
+        sa.Column("AMT_REQ_CREDIT_BUREAU_WEEK", sa.Float(), nullable=True),
+        sa.Column("AMT_REQ_CREDIT_BUREAU_MON", sa.Float(), nullable=True),
+        sa.Column("AMT_REQ_CREDIT_BUREAU_QRT", sa.Float(), nullable=True),
+        sa.Column("AMT_REQ_CREDIT_BUREAU_YEAR", sa.Float(), nullable=True),
+        sa.Column("nb_loans", sa.Float(), nullable=True),
+        sa.Column("sum_debt", sa.Float(), nullable=True),
+        sa.Column("AGE", sa.Float(), nullable=True),
+        sa.Column("CHILDREN_RATIO", sa.Float(), nullable=True),
+        sa.Column("INCOME_PER_PERSON", sa.Float(), nullable=True),
+        sa.Column("AGE_PER_MEMBER", sa.Float(), nullable=True),
+        sa.Column("DAYS_EMPLOYED_PERC", sa.Float(), nullable=True),
+        sa.Column("INCOME_CREDIT_PERC", sa.Float(), nullable=True),
+        sa.Column("ANNUITY_INCOME_PERC", sa.Float(), nullable=True),
+        sa.Column("PAYMENT_RATE", sa.Float(), nullable=True),
+        sa.Column("NAME_CONTRACT_TYPE", sa.String(length=255), nullable=True),
+        sa.Column("CODE_GENDER", sa.String(length=255), nullable=True),
+        sa.Column("FLAG_OWN_CAR", sa.String(length=255), nullable=True),
+        sa.Column("FLAG_OWN_REALTY", sa.String(length=255), nullable=True),
+        sa.Column("NAME_TYPE_SUITE", sa.String(length=255), nullable=True),
+        sa.Column("NAME_INCOME_TYPE", sa.String(length=255), nullable=True),
+        sa.Column("NAME_EDUCATION_TYPE", sa.String(length=255), nullable=True),
+        sa.Column("NAME_FAMILY_STATUS", sa.String(length=255), nullable=True),
+        sa.Column("NAME_HOUSING_TYPE", sa.String(length=255), nullable=True),
+        sa.Column("OCCUPATION_TYPE", sa.String(length=255), nullable=True),
+        sa.Column("WEEKDAY_APPR_PROCESS_START", sa.String(length=255), nullable=True),
+        sa.Column("ORGANIZATION_TYPE", sa.String(length=255), nullable=True),
+        sa.Column("FONDKAPREMONT_MODE", sa.String(length=255), nullable=True),
+        sa.Column("HOUSETYPE_MODE", sa.String(length=255), nullable=True),
+        sa.Column("WALLSMATERIAL_MODE", sa.String(length=255), nullable=True),
+        sa.Column("EMERGENCYSTATE_MODE", sa.String(length=255), nullable=True),
+        sa.Column("CNT_CHILDREN_BIN", sa.String(length=255), nullable=True),
+        sa.Column("EXT_SOURCE_1_ISNA", sa.SmallInteger(), nullable=True),
+        sa.Column("EXT_SOURCE_2_ISNA", sa.SmallInteger(), nullable=True),
+        sa.Column("EXT_SOURCE_3_ISNA", sa.SmallInteger(), nullable=True),
+        sa.Column("OWN_CAR_AGE_ISNA", sa.SmallInteger(), nullable=True),
+        sa.Column("COMMONAREA_AVG_ISNA", sa.SmallInteger(), nullable=True),
+        sa.Column("NONLIVINGAPARTMENTS_AVG_ISNA", sa.SmallInteger(), nullable=True),
+        sa.Column("LIVINGAPARTMENTS_AVG_ISNA", sa.SmallInteger(), nullable=True),
+        sa.Column("FLOORSMIN_AVG_ISNA", sa.SmallInteger(), nullable=True),
+        sa.Column("YEARS_BUILD_AVG_ISNA", sa.SmallInteger(), nullable=True),
+        sa.Column("LANDAREA_AVG_ISNA", sa.SmallInteger(), nullable=True),
+        sa.Column("BASEMENTAREA_AVG_ISNA", sa.SmallInteger(), nullable=True),
+        sa.Column("NONLIVINGAREA_AVG_ISNA", sa.SmallInteger(), nullable=True),
+        sa.Column("ELEVATORS_AVG_ISNA", sa.SmallInteger(), nullable=True),
+        sa.Column("FONDKAPREMONT_MODE_ISNA", sa.SmallInteger(), nullable=True),
+    )
+    op.create_index(
+        "ix_ml_input_features_model_created",
+        "ml_input_features",
+        ["model_name", "created_at"],
+        unique=False,
+    )
+
+    # Vue de compatibilité : `features` reste lisible en JSONB quel que soit
+    # le mode de stockage (NULL pour les lignes archivées en Parquet).
+    op.execute("""
+        CREATE VIEW ml_inputs_compat AS
+        SELECT
+            i.id,
+            i.created_at,
+            i.model_name,
+            i.raw_data,
+            COALESCE(
+                i.features,
+                to_jsonb(f) - 'input_id' - 'created_at' - 'model_name'
+            ) AS features
+        FROM ml_inputs i
+        LEFT JOIN ml_input_features f ON f.input_id = i.id
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP VIEW IF EXISTS ml_inputs_compat")
+    op.drop_index("ix_ml_input_features_model_created", table_name="ml_input_features")
+    op.drop_table("ml_input_features")
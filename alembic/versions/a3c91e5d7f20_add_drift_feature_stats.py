@@ -0,0 +1,36 @@
+"""add drift_feature_stats table
+
+Revision ID: a3c91e5d7f20
+Revises: 419d89d05f88
+Create Date: 2026-10-19 09:12:41.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c91e5d7f20'
+down_revision: Union[str, Sequence[str], None] = '419d89d05f88'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Histogrammes additifs par (modèle, fenêtre horaire, feature, bucket).
+    # La clé primaire sert aussi d'index pour les lectures par modèle/fenêtre.
+    op.create_table(
+        "drift_feature_stats",
+        sa.Column("model_name", sa.String(length=100), nullable=False),
+        sa.Column("window_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("feature", sa.String(length=100), nullable=False),
+        sa.Column("bucket", sa.String(length=255), nullable=False),
+        sa.Column("kind", sa.String(length=3), nullable=False),
+        sa.Column("count", sa.BigInteger(), nullable=False, server_default=sa.text("0")),
+        sa.PrimaryKeyConstraint("model_name", "window_start", "feature", "bucket"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("drift_feature_stats")
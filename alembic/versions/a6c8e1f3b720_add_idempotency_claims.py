@@ -0,0 +1,30 @@
+"""add idempotency_claims
+
+Revision ID: a6c8e1f3b720
+Revises: d29f6b3e8a41
+Create Date: 2026-10-19 18:02:41.530912
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6c8e1f3b720'
+down_revision: Union[str, Sequence[str], None] = 'd29f6b3e8a41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "idempotency_claims",
+        sa.Column("key", sa.String(length=64), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("key"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("idempotency_claims")
@@ -0,0 +1,35 @@
+"""add ml_inputs.request_id
+
+Revision ID: b1d8e4f2a693
+Revises: e7a1c5b9d302
+Create Date: 2026-10-20 09:12:04.551870
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'b1d8e4f2a693'
+down_revision: Union[str, Sequence[str], None] = 'e7a1c5b9d302'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Requête d'origine de chaque entrée : le recalcul des features se fait par requête.
+    op.add_column("ml_inputs", sa.Column("request_id", sa.String(length=64), nullable=True))
+    # Reprise depuis la sortie d'origine (même created_at ; les sorties de re-scoring n'en ont pas).
+    op.execute("""
+        UPDATE ml_inputs i
+        SET request_id = o.request_id
+        FROM ml_outputs o
+        WHERE o.input_id = i.id
+          AND o.created_at = i.created_at
+          AND o.request_id IS NOT NULL
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column("ml_inputs", "request_id")
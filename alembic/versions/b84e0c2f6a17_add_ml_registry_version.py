@@ -0,0 +1,60 @@
+"""add ml_registry_version counter and ml_models keyset index
+
+Revision ID: b84e0c2f6a17
+Revises: f5b3a7e91c24
+Create Date: 2026-10-19 15:32:11.208734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'b84e0c2f6a17'
+down_revision: Union[str, Sequence[str], None] = 'f5b3a7e91c24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BUMP_FN = """
+CREATE OR REPLACE FUNCTION bump_ml_registry_version()
+RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE ml_registry_version SET version = version + 1 WHERE id = 1;
+    RETURN NULL;
+END $$;
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ml_registry_version",
+        sa.Column("id", sa.SmallInteger(), nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.CheckConstraint("id = 1", name="ck_ml_registry_version_singleton"),
+    )
+    op.execute("INSERT INTO ml_registry_version (id, version) VALUES (1, 1)")
+
+    op.execute(BUMP_FN)
+    op.execute("""
+        CREATE TRIGGER ml_models_bump_registry_version
+        AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON ml_models
+        FOR EACH STATEMENT EXECUTE FUNCTION bump_ml_registry_version()
+    """)
+
+    op.create_index(
+        "ix_ml_models_created_id",
+        "ml_models",
+        [sa.text("created_at DESC"), sa.text("id DESC")],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_ml_models_created_id", table_name="ml_models")
+    op.execute("DROP TRIGGER IF EXISTS ml_models_bump_registry_version ON ml_models")
+    op.execute("DROP FUNCTION IF EXISTS bump_ml_registry_version()")
+    op.drop_table("ml_registry_version")
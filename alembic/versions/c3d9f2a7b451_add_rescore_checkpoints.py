@@ -0,0 +1,39 @@
+"""add rescore_checkpoints
+
+Revision ID: c3d9f2a7b451
+Revises: a6c8e1f3b720
+Create Date: 2026-10-19 21:14:07.218340
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3d9f2a7b451'
+down_revision: Union[str, Sequence[str], None] = 'a6c8e1f3b720'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "rescore_checkpoints",
+        sa.Column("run_id", sa.String(length=56), nullable=False),
+        sa.Column("source_model", sa.String(length=100), nullable=False),
+        sa.Column("model_name", sa.String(length=255), nullable=False),
+        sa.Column("model_version", sa.String(length=64), nullable=False),
+        sa.Column("last_created_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_input_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("rows_done", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("run_id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("rescore_checkpoints")
@@ -0,0 +1,37 @@
+"""add ml_models.version
+
+Revision ID: c4f7a2d9e815
+Revises: b1d8e4f2a693
+Create Date: 2026-10-21 10:04:37.218406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4f7a2d9e815'
+down_revision: Union[str, Sequence[str], None] = 'b1d8e4f2a693'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Version déployée : clé du seuil de décision et ml_outputs.model_version.
+    op.add_column("ml_models", sa.Column("version", sa.String(length=64), nullable=True))
+    # Reprise depuis le dernier re-scoring de chaque modèle ; NULL sinon (artefacts sans version).
+    op.execute("""
+        UPDATE ml_models m
+        SET version = c.model_version
+        FROM (
+            SELECT DISTINCT ON (model_name) model_name, model_version
+            FROM rescore_checkpoints
+            ORDER BY model_name, updated_at DESC
+        ) c
+        WHERE c.model_name = m.name
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column("ml_models", "version")
@@ -0,0 +1,171 @@
+"""partition ml_inputs, ml_outputs, profiling_logs, ml_input_features by created_at
+
+Revision ID: c71f0a9e3b58
+Revises: 5e8b2d41c6a9
+Create Date: 2026-10-19 11:24:08.671390
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'c71f0a9e3b58'
+down_revision: Union[str, Sequence[str], None] = '5e8b2d41c6a9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+MONTHS_AHEAD = 3
+
+# Partitionnement mensuel par RANGE(created_at). La clé de partition doit faire
+# partie de la clé primaire, et une table partitionnée ne peut pas être
+# référencée par `id` seul : les FK `input_id -> ml_inputs.id` sont supprimées.
+# L'intégrité reste assurée par l'écriture dans une même transaction, et la
+# rétention supprime les mêmes mois sur toutes les tables.
+TABLES = {
+    "ml_inputs": {
+        "pk": ["id", "created_at"],
+        "indexes": [
+            ("ix_ml_inputs_created_at", ["created_at"], None),
+            ("ix_ml_inputs_model_name", ["model_name"], None),
+            ("ix_ml_inputs_raw_data_gin", ["raw_data"], "gin"),
+            ("ix_ml_inputs_features_gin", ["features"], "gin"),
+        ],
+    },
+    "ml_outputs": {
+        "pk": ["id", "created_at"],
+        "indexes": [
+            ("ix_ml_outputs_input_id", ["input_id"], None),
+            ("ix_ml_outputs_request_id", ["request_id"], None),
+            ("ix_ml_outputs_model_name", ["model_name"], None),
+            ("ix_ml_outputs_created_at", ["created_at"], None),
+            ("ix_ml_outputs_model_created", ["model_name", "created_at"], None),
+            ("ix_ml_outputs_request_created", ["request_id", "created_at"], None),
+        ],
+    },
+    "profiling_logs": {
+        "pk": ["id", "created_at"],
+        "indexes": [
+            ("ix_profiling_logs_endpoint", ["endpoint"], None),
+            ("ix_profiling_logs_created_at", ["created_at"], None),
+            ("ix_profiling_logs_model_name", ["model_name"], None),
+            ("ix_profiling_logs_endpoint_created", ["endpoint", "created_at"], None),
+            ("ix_profiling_logs_model_created", ["model_name", "created_at"], None),
+        ],
+    },
+    "ml_input_features": {
+        "pk": ["input_id", "created_at"],
+        "indexes": [
+            ("ix_ml_input_features_model_created", ["model_name", "created_at"], None),
+        ],
+    },
+}
+
+ENSURE_PARTITIONS_FN = """
+CREATE OR REPLACE FUNCTION ensure_monthly_partitions(parent text, from_month date, to_month date)
+RETURNS integer
+LANGUAGE plpgsql AS $$
+DECLARE
+    m date := date_trunc('month', from_month)::date;
+    part text;
+    created integer := 0;
+BEGIN
+    WHILE m <= to_month LOOP
+        part := format('%s_p%s', parent, to_char(m, 'YYYY_MM'));
+        IF to_regclass(part) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                part,
+                parent,
+                m::timestamp AT TIME ZONE 'UTC',
+                (m + interval '1 month')::timestamp AT TIME ZONE 'UTC'
+            );
+            created := created + 1;
+        END IF;
+        m := (m + interval '1 month')::date;
+    END LOOP;
+    RETURN created;
+END $$;
+"""
+
+COMPAT_VIEW = """
+    CREATE VIEW ml_inputs_compat AS
+    SELECT
+        i.id,
+        i.created_at,
+        i.model_name,
+        i.raw_data,
+        COALESCE(
+            i.features,
+            to_jsonb(f) - 'input_id' - 'created_at' - 'model_name'
+        ) AS features
+    FROM ml_inputs i
+    LEFT JOIN ml_input_features f ON f.input_id = i.id
+"""
+
+
+def _create_indexes(table: str) -> None:
+    for name, cols, using in TABLES[table]["indexes"]:
+        op.create_index(name, table, cols, unique=False, postgresql_using=using)
+
+
+def _swap_table(table: str, partitioned: bool) -> None:
+    spec = TABLES[table]
+    legacy = f"{table}_legacy"
+
+    op.execute(f'ALTER TABLE {table} RENAME TO {legacy}')
+    op.execute(f'ALTER TABLE {legacy} RENAME CONSTRAINT {table}_pkey TO {legacy}_pkey')
+    for name, _, _ in spec["indexes"]:
+        op.execute(f'DROP INDEX IF EXISTS {name}')
+
+    pk = spec["pk"] if partitioned else [spec["pk"][0]]
+    suffix = " PARTITION BY RANGE (created_at)" if partitioned else ""
+    op.execute(f'CREATE TABLE {table} (LIKE {legacy} INCLUDING DEFAULTS){suffix}')
+    op.execute(f'ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY ({", ".join(pk)})')
+
+    if partitioned:
+        op.execute(f"""
+            SELECT ensure_monthly_partitions(
+                '{table}',
+                COALESCE((SELECT min(created_at) FROM {legacy}), now())::date,
+                (now() + interval '{MONTHS_AHEAD} months')::date
+            )
+        """)
+
+    op.execute(f'INSERT INTO {table} SELECT * FROM {legacy}')
+    _create_indexes(table)
+
+
+def upgrade() -> None:
+    op.execute(ENSURE_PARTITIONS_FN)
+    op.execute("DROP VIEW IF EXISTS ml_inputs_compat")
+
+    for table in TABLES:
+        _swap_table(table, partitioned=True)
+    for table in TABLES:
+        op.execute(f"DROP TABLE {table}_legacy CASCADE")
+
+    op.execute(COMPAT_VIEW)
+
+
+def downgrade() -> None:
+    op.execute("DROP VIEW IF EXISTS ml_inputs_compat")
+
+    for table in TABLES:
+        _swap_table(table, partitioned=False)
+    for table in TABLES:
+        op.execute(f"DROP TABLE {table}_legacy CASCADE")
+
+    for table in ("ml_outputs", "ml_input_features"):
+        op.create_foreign_key(
+            f"{table}_input_id_fkey",
+            table,
+            "ml_inputs",
+            ["input_id"],
+            ["id"],
+            ondelete="CASCADE",
+        )
+
+    op.execute(COMPAT_VIEW)
+    op.execute("DROP FUNCTION IF EXISTS ensure_monthly_partitions(text, date, date)")
@@ -0,0 +1,50 @@
+"""add ml_explanations (partitioned by created_at)
+
+Revision ID: d29f6b3e8a41
+Revises: b84e0c2f6a17
+Create Date: 2026-10-19 16:48:02.117305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'd29f6b3e8a41'
+down_revision: Union[str, Sequence[str], None] = 'b84e0c2f6a17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+MONTHS_AHEAD = 3
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE ml_explanations (
+            input_id uuid NOT NULL,
+            created_at timestamptz NOT NULL,
+            model_name varchar(100) NOT NULL,
+            base_value double precision NOT NULL,
+            contributions jsonb NOT NULL,
+            CONSTRAINT ml_explanations_pkey PRIMARY KEY (input_id, created_at)
+        ) PARTITION BY RANGE (created_at)
+    """)
+    op.execute(f"""
+        SELECT ensure_monthly_partitions(
+            'ml_explanations',
+            now()::date,
+            (now() + interval '{MONTHS_AHEAD} months')::date
+        )
+    """)
+    op.create_index(
+        "ix_ml_explanations_model_created",
+        "ml_explanations",
+        ["model_name", "created_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_ml_explanations_model_created", table_name="ml_explanations")
+    op.execute("DROP TABLE ml_explanations CASCADE")
@@ -0,0 +1,124 @@
+"""add prediction/request rollup tables and dashboard views
+
+Revision ID: e2a4d6c8b013
+Revises: c71f0a9e3b58
+Create Date: 2026-10-19 13:40:52.208117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a4d6c8b013'
+down_revision: Union[str, Sequence[str], None] = 'c71f0a9e3b58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+LATENCY_BOUNDS_MS = [10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+
+def _bucket_columns():
+    return [
+        sa.Column(f"lat_le_{b}", sa.BigInteger(), nullable=False, server_default=sa.text("0"))
+        for b in LATENCY_BOUNDS_MS
+    ]
+
+
+def _approx_quantile(q: float) -> str:
+    # Borne du premier bucket cumulatif qui atteint q * count (NULL au-delà de 10 s).
+    cases = " ".join(
+        f"WHEN sum(lat_le_{b}) >= {q} * sum(count) THEN {b}" for b in LATENCY_BOUNDS_MS
+    )
+    return f"CASE {cases} END"
+
+
+def upgrade() -> None:
+    op.create_table(
+        "prediction_rollups",
+        sa.Column("granularity", sa.String(length=2), nullable=False),
+        sa.Column("bucket_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("model_name", sa.String(length=255), nullable=False),
+        sa.Column("label", sa.String(length=255), nullable=False),
+        sa.Column("count", sa.BigInteger(), nullable=False, server_default=sa.text("0")),
+        sa.Column("error_count", sa.BigInteger(), nullable=False, server_default=sa.text("0")),
+        sa.Column("sum_proba_defaut", sa.Float(), nullable=False, server_default=sa.text("0")),
+        sa.Column("sum_latency_ms", sa.BigInteger(), nullable=False, server_default=sa.text("0")),
+        *_bucket_columns(),
+        sa.PrimaryKeyConstraint("granularity", "bucket_start", "model_name", "label"),
+    )
+
+    op.create_table(
+        "request_rollups",
+        sa.Column("granularity", sa.String(length=2), nullable=False),
+        sa.Column("bucket_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("endpoint", sa.String(length=255), nullable=False),
+        sa.Column("method", sa.String(length=10), nullable=False),
+        sa.Column("model_name", sa.String(length=100), nullable=False),
+        sa.Column("count", sa.BigInteger(), nullable=False, server_default=sa.text("0")),
+        sa.Column("num_predictions", sa.BigInteger(), nullable=False, server_default=sa.text("0")),
+        sa.Column("sum_total_ms", sa.Float(), nullable=False, server_default=sa.text("0")),
+        sa.Column("max_total_ms", sa.Float(), nullable=False, server_default=sa.text("0")),
+        sa.Column("sum_preprocessing_ms", sa.Float(), nullable=False, server_default=sa.text("0")),
+        sa.Column("sum_inference_ms", sa.Float(), nullable=False, server_default=sa.text("0")),
+        sa.Column("sum_database_ms", sa.Float(), nullable=False, server_default=sa.text("0")),
+        *_bucket_columns(),
+        sa.PrimaryKeyConstraint("granularity", "bucket_start", "endpoint", "method", "model_name"),
+    )
+
+    op.create_table(
+        "rollup_watermarks",
+        sa.Column("source", sa.String(length=50), primary_key=True, nullable=False),
+        sa.Column("processed_until", sa.DateTime(timezone=True), nullable=True),
+    )
+
+    # Vues prêtes pour Grafana (un point par bucket et par modèle / endpoint)
+    op.execute(f"""
+        CREATE VIEW prediction_rollups_v AS
+        SELECT
+            granularity,
+            bucket_start,
+            model_name,
+            sum(count) AS count,
+            sum(error_count) AS error_count,
+            sum(count) FILTER (WHERE label = 'solvable') AS n_solvable,
+            sum(count) FILTER (WHERE label = 'non_solvable') AS n_non_solvable,
+            sum(sum_proba_defaut) / NULLIF(sum(count), 0) AS mean_proba_defaut,
+            sum(sum_latency_ms)::float / NULLIF(sum(count), 0) AS mean_latency_ms,
+            {_approx_quantile(0.5)} AS p50_latency_ms,
+            {_approx_quantile(0.95)} AS p95_latency_ms,
+            {_approx_quantile(0.99)} AS p99_latency_ms
+        FROM prediction_rollups
+        GROUP BY granularity, bucket_start, model_name
+    """)
+    op.execute(f"""
+        CREATE VIEW request_rollups_v AS
+        SELECT
+            granularity,
+            bucket_start,
+            endpoint,
+            method,
+            model_name,
+            sum(count) AS count,
+            sum(num_predictions) AS num_predictions,
+            sum(sum_total_ms) / NULLIF(sum(count), 0) AS mean_total_ms,
+            max(max_total_ms) AS max_total_ms,
+            sum(sum_preprocessing_ms) / NULLIF(sum(count), 0) AS mean_preprocessing_ms,
+            sum(sum_inference_ms) / NULLIF(sum(count), 0) AS mean_inference_ms,
+            sum(sum_database_ms) / NULLIF(sum(count), 0) AS mean_database_ms,
+            {_approx_quantile(0.5)} AS p50_total_ms,
+            {_approx_quantile(0.95)} AS p95_total_ms,
+            {_approx_quantile(0.99)} AS p99_total_ms
+        FROM request_rollups
+        GROUP BY granularity, bucket_start, endpoint, method, model_name
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP VIEW IF EXISTS request_rollups_v")
+    op.execute("DROP VIEW IF EXISTS prediction_rollups_v")
+    op.drop_table("rollup_watermarks")
+    op.drop_table("request_rollups")
+    op.drop_table("prediction_rollups")
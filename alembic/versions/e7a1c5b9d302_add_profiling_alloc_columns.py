@@ -0,0 +1,29 @@
+"""add profiling_logs allocation columns
+
+Revision ID: e7a1c5b9d302
+Revises: c3d9f2a7b451
+Create Date: 2026-10-19 22:31:46.107254
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a1c5b9d302'
+down_revision: Union[str, Sequence[str], None] = 'c3d9f2a7b451'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Profil tracemalloc des requêtes échantillonnées (PROFILING_ALLOC_SAMPLE_RATE).
+    op.add_column("profiling_logs", sa.Column("alloc_stages", postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+    op.add_column("profiling_logs", sa.Column("alloc_top", postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("profiling_logs", "alloc_top")
+    op.drop_column("profiling_logs", "alloc_stages")
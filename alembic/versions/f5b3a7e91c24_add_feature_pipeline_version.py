@@ -0,0 +1,30 @@
+"""add ml_inputs.feature_pipeline_version
+
+Revision ID: f5b3a7e91c24
+Revises: e2a4d6c8b013
+Create Date: 2026-10-19 14:55:30.402716
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5b3a7e91c24'
+down_revision: Union[str, Sequence[str], None] = 'e2a4d6c8b013'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Les lignes existantes ont été produites par la version "1" de compute_features.
+    op.add_column(
+        "ml_inputs",
+        sa.Column("feature_pipeline_version", sa.String(length=20), nullable=True),
+    )
+    op.execute("UPDATE ml_inputs SET feature_pipeline_version = '1'")
+
+
+def downgrade() -> None:
+    op.drop_column("ml_inputs", "feature_pipeline_version")
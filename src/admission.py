@@ -0,0 +1,209 @@
+"""Contrôle d'admission de ``/predict`` : lignes en vol par modèle et au total.
+
+Une requête coûte son nombre de lignes. Si elle ne tient pas dans les limites,
+elle attend au plus ``ADMISSION_QUEUE_TIMEOUT_S`` puis est rejetée (503 +
+``Retry-After``) au lieu de s'empiler dans le threadpool et le pool DB.
+
+Priorité : les requêtes d'au plus ``ADMISSION_INTERACTIVE_MAX_ROWS`` lignes sont
+interactives. Les lots ne peuvent occuper que ``1 - ADMISSION_INTERACTIVE_RESERVE``
+de la capacité, et la file sert les interactives d'abord.
+
+Les compteurs sont par processus (un contrôleur par worker uvicorn).
+"""
+import asyncio
+import os
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+
+ADMISSION_MAX_ROWS = int(os.getenv("ADMISSION_MAX_ROWS", "50000"))
+ADMISSION_MAX_ROWS_PER_MODEL = int(os.getenv("ADMISSION_MAX_ROWS_PER_MODEL", str(ADMISSION_MAX_ROWS)))
+ADMISSION_INTERACTIVE_MAX_ROWS = int(os.getenv("ADMISSION_INTERACTIVE_MAX_ROWS", "100"))
+ADMISSION_INTERACTIVE_RESERVE = float(os.getenv("ADMISSION_INTERACTIVE_RESERVE", "0.2"))
+ADMISSION_QUEUE_TIMEOUT_S = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_S", "0.25"))
+ADMISSION_RETRY_AFTER_S = int(os.getenv("ADMISSION_RETRY_AFTER_S", "1"))
+
+# Bornes (ms) des buckets cumulatifs d'attente en file : le_<b> = nb d'admissions <= b ms.
+QUEUE_WAIT_BOUNDS_MS = [1, 5, 10, 25, 50, 100, 250, 500, 1000]
+
+
+class AdmissionRejected(Exception):
+
+    def __init__(self, reason: str, retry_after_s: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after_s = retry_after_s
+
+
+@dataclass
+class _Waiter:
+    model: str
+    rows: int
+    interactive: bool
+    future: asyncio.Future = field(repr=False)
+
+
+class AdmissionController:
+
+    def __init__(
+        self,
+        max_rows: int,
+        max_rows_per_model: int,
+        interactive_max_rows: int,
+        interactive_reserve: float,
+        queue_timeout_s: float,
+        retry_after_s: int,
+    ):
+        self.max_rows = max_rows
+        self.max_rows_per_model = max_rows_per_model
+        self.interactive_max_rows = interactive_max_rows
+        self.interactive_reserve = interactive_reserve
+        self.queue_timeout_s = queue_timeout_s
+        self.retry_after_s = retry_after_s
+
+        self._in_flight = 0
+        self._per_model: dict[str, int] = defaultdict(int)
+        self._waiters: list[_Waiter] = []
+
+        self._admitted = 0
+        self._shed: dict[str, int] = defaultdict(int)
+        self._wait_buckets = [0] * len(QUEUE_WAIT_BOUNDS_MS)
+        self._wait_total_ms = 0.0
+        self._wait_max_ms = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_rows > 0
+
+    def _limits(self, interactive: bool) -> tuple[int, int]:
+        share = 1.0 if interactive else 1.0 - self.interactive_reserve
+        return (
+            max(1, int(self.max_rows * share)),
+            max(1, int(self.max_rows_per_model * share)),
+        )
+
+    def _blocked_by(self, model: str, rows: int, interactive: bool) -> str | None:
+        """``None`` si la requête tient, sinon la limite qui bloque."""
+        limit, model_limit = self._limits(interactive)
+        # Un lot plus gros que la limite passe seul plutôt que jamais.
+        if self._in_flight + min(rows, limit) > limit:
+            return "global"
+        if self._per_model[model] + min(rows, model_limit) > model_limit:
+            return "model"
+        return None
+
+    def _take(self, model: str, rows: int) -> None:
+        self._in_flight += rows
+        self._per_model[model] += rows
+
+    def release(self, model: str, rows: int) -> None:
+        self._in_flight -= rows
+        self._per_model[model] -= rows
+        if self._per_model[model] <= 0:
+            del self._per_model[model]
+        self._wake()
+
+    def _wake(self) -> None:
+        for waiter in list(self._waiters):
+            if waiter.future.done():
+                self._waiters.remove(waiter)
+                continue
+            blocked = self._blocked_by(waiter.model, waiter.rows, waiter.interactive)
+            if blocked == "global":
+                # Ordre de la file respecté : pas de dépassement par un plus petit.
+                break
+            if blocked is None:
+                self._waiters.remove(waiter)
+                self._take(waiter.model, waiter.rows)
+                waiter.future.set_result(None)
+
+    def _observe_wait(self, elapsed_ms: float) -> None:
+        self._admitted += 1
+        self._wait_total_ms += elapsed_ms
+        self._wait_max_ms = max(self._wait_max_ms, elapsed_ms)
+        for i, b in enumerate(QUEUE_WAIT_BOUNDS_MS):
+            if elapsed_ms <= b:
+                self._wait_buckets[i] += 1
+
+    def _shed_request(self, reason: str, interactive: bool) -> AdmissionRejected:
+        self._shed[f"{reason}_{'interactive' if interactive else 'batch'}"] += 1
+        return AdmissionRejected(reason, self.retry_after_s)
+
+    async def acquire(self, model: str, rows: int) -> None:
+        interactive = rows <= self.interactive_max_rows
+        start = time.perf_counter()
+
+        queued_ahead = any(w.interactive or not interactive for w in self._waiters)
+        blocked = self._blocked_by(model, rows, interactive)
+        if blocked is None and not queued_ahead:
+            self._take(model, rows)
+            self._observe_wait(0.0)
+            return
+
+        if self.queue_timeout_s <= 0:
+            raise self._shed_request(blocked or "global", interactive)
+
+        waiter = _Waiter(model, rows, interactive, asyncio.get_running_loop().create_future())
+        # Interactives avant les lots, FIFO dans chaque classe.
+        position = len(self._waiters)
+        if interactive:
+            position = next((i for i, w in enumerate(self._waiters) if not w.interactive), position)
+        self._waiters.insert(position, waiter)
+
+        try:
+            await asyncio.wait_for(waiter.future, self.queue_timeout_s)
+        except asyncio.TimeoutError:
+            # Place accordée par ``release`` au tick du timeout (Python >= 3.12 lève
+            # quand même) : les lignes sont déjà prises, la requête est admise.
+            if not waiter.future.done() or waiter.future.cancelled():
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                raise self._shed_request(self._blocked_by(model, rows, interactive) or "global", interactive)
+        except asyncio.CancelledError:
+            # Client parti : rendre la place si elle venait d'être accordée.
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            elif waiter.future.done() and not waiter.future.cancelled():
+                self.release(model, rows)
+            raise
+
+        self._observe_wait((time.perf_counter() - start) * 1000)
+
+    @asynccontextmanager
+    async def admit(self, model: str, rows: int):
+        if not self.enabled:
+            yield
+            return
+        await self.acquire(model, rows)
+        try:
+            yield
+        finally:
+            self.release(model, rows)
+
+    def snapshot(self) -> dict:
+        return {
+            "max_rows": self.max_rows,
+            "max_rows_per_model": self.max_rows_per_model,
+            "in_flight_rows": self._in_flight,
+            "in_flight_rows_by_model": dict(self._per_model),
+            "queued": len(self._waiters),
+            "admitted": self._admitted,
+            "shed": dict(self._shed),
+            "queue_wait_total_ms": round(self._wait_total_ms, 3),
+            "queue_wait_max_ms": round(self._wait_max_ms, 3),
+            "queue_wait_ms": {
+                **{f"le_{b}": n for b, n in zip(QUEUE_WAIT_BOUNDS_MS, self._wait_buckets)},
+                "count": self._admitted,
+            },
+        }
+
+
+admission = AdmissionController(
+    max_rows=ADMISSION_MAX_ROWS,
+    max_rows_per_model=ADMISSION_MAX_ROWS_PER_MODEL,
+    interactive_max_rows=ADMISSION_INTERACTIVE_MAX_ROWS,
+    interactive_reserve=ADMISSION_INTERACTIVE_RESERVE,
+    queue_timeout_s=ADMISSION_QUEUE_TIMEOUT_S,
+    retry_after_s=ADMISSION_RETRY_AFTER_S,
+)
@@ -0,0 +1,165 @@
+"""Profil d'allocations (``tracemalloc``) par étape, sur des requêtes échantillonnées.
+
+Activé par ``PROFILING_ALLOC_SAMPLE_RATE`` (0 = désactivé) : ``ProfilingMiddleware``
+trace une requête tirée au sort, une seule à la fois. Les étapes sont marquées
+par ``alloc_stage(nom)`` ; ``tracemalloc`` n'est actif que pendant une étape
+(démarré à l'entrée, arrêté à la sortie), donc seules les allocations faites
+pendant l'étape sont comptées. Pour chacune :
+
+- ``peak_mb`` : pic des allocations de l'étape (max sur les appels) ;
+- ``net_mb`` : allocations de l'étape encore vivantes à la sortie (somme sur les appels) ;
+- sites de ces blocs vivants : ``site``, la ligne du code de l'application la plus
+  proche (ex. ``src/features.py:68``), et ``alloc``, la ligne qui a réellement
+  alloué (souvent dans pandas / NumPy).
+
+``tracemalloc`` est global au processus : les allocations des requêtes
+concurrentes pendant une étape y entrent aussi. Une étape ouverte dans une autre
+est comptée dans l'englobante. Hors requête tracée, ``alloc_stage`` ne coûte
+qu'une lecture de ``ContextVar``.
+"""
+import os
+import sys
+import threading
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+
+PROFILING_ALLOC_SAMPLE_RATE = float(os.getenv("PROFILING_ALLOC_SAMPLE_RATE", "0"))
+PROFILING_ALLOC_FRAMES = int(os.getenv("PROFILING_ALLOC_FRAMES", "10"))
+PROFILING_ALLOC_TOP = int(os.getenv("PROFILING_ALLOC_TOP", "15"))
+
+MB = 1024 * 1024
+
+# Allocations ignorées : snapshot lui-même, imports.
+_IGNORED = (tracemalloc.__file__, "<frozen importlib", "<unknown>")
+
+_APP_ROOT = os.getcwd()
+_PREFIXES = sorted({p for p in sys.path if p}, key=len, reverse=True)
+
+_current: ContextVar["AllocationTrace | None"] = ContextVar("alloc_trace", default=None)
+_lock = threading.Lock()
+
+
+def _is_app(filename: str) -> bool:
+    return filename.startswith(_APP_ROOT + os.sep) and "site-packages" not in filename
+
+
+def short_path(filename: str) -> str:
+    """Chemin relatif à l'application ou au ``sys.path`` (``src/features.py``, ``pandas/core/frame.py``)."""
+    if _is_app(filename):
+        return os.path.relpath(filename, _APP_ROOT)
+    for prefix in _PREFIXES:
+        if filename.startswith(prefix + os.sep):
+            return filename[len(prefix) + 1:]
+    return filename
+
+
+def _site(traceback: tracemalloc.Traceback) -> tuple[str, str]:
+    """(ligne applicative la plus récente, ligne qui alloue)."""
+    frames = list(reversed(traceback))
+    app = next((f for f in frames if _is_app(f.filename)), frames[0])
+    return f"{short_path(app.filename)}:{app.lineno}", f"{short_path(frames[0].filename)}:{frames[0].lineno}"
+
+
+class AllocationTrace:
+
+    def __init__(self, frames: int = PROFILING_ALLOC_FRAMES, top: int = PROFILING_ALLOC_TOP):
+        self.frames = frames
+        self.top = top
+        self.stages: dict[str, dict] = {}
+        self.sites: dict[tuple, list] = {}
+        self._mutex = threading.Lock()
+        self._open = False
+
+    @contextmanager
+    def stage(self, name: str):
+        with self._mutex:
+            owner = not self._open
+            self._open = True
+        if not owner:
+            yield
+            return
+
+        tracemalloc.start(self.frames)
+        try:
+            yield
+        finally:
+            try:
+                current, peak = tracemalloc.get_traced_memory()
+                stats = tracemalloc.take_snapshot().statistics("traceback")
+            finally:
+                tracemalloc.stop()
+                with self._mutex:
+                    self._open = False
+            self._record(name, peak, current, stats)
+
+    def _record(self, name: str, peak: int, net: int, stats: list) -> None:
+        stage = self.stages.setdefault(name, {"calls": 0, "peak_mb": 0.0, "net_mb": 0.0})
+        stage["calls"] += 1
+        stage["peak_mb"] = max(stage["peak_mb"], peak / MB)
+        stage["net_mb"] += net / MB
+
+        for s in stats:
+            if s.traceback[-1].filename.startswith(_IGNORED):
+                continue
+            site = self.sites.setdefault((name, *_site(s.traceback)), [0, 0])
+            site[0] += s.size
+            site[1] += s.count
+
+    def result(self) -> dict:
+        top = sorted(self.sites.items(), key=lambda kv: kv[1][0], reverse=True)[:self.top]
+        return {
+            "peak_mb": round(max((s["peak_mb"] for s in self.stages.values()), default=0.0), 3),
+            "stages": {
+                name: {**s, "peak_mb": round(s["peak_mb"], 3), "net_mb": round(s["net_mb"], 3)}
+                for name, s in self.stages.items()
+            },
+            "top": [
+                {
+                    "stage": stage,
+                    "site": site,
+                    "alloc": alloc,
+                    "size_mb": round(size / MB, 3),
+                    "count": count,
+                }
+                for (stage, site, alloc), (size, count) in top
+            ],
+        }
+
+
+def start(frames: int = PROFILING_ALLOC_FRAMES) -> AllocationTrace | None:
+    """Trace la requête courante ; ``None`` si une autre est déjà tracée."""
+    if not _lock.acquire(blocking=False):
+        return None
+    if tracemalloc.is_tracing():
+        # Tracé par ailleurs (PYTHONTRACEMALLOC, débogage) : on ne le coupe pas.
+        _lock.release()
+        return None
+    trace = AllocationTrace(frames)
+    _current.set(trace)
+    return trace
+
+
+def stop(trace: AllocationTrace) -> dict:
+    try:
+        return trace.result()
+    finally:
+        _current.set(None)
+        _lock.release()
+
+
+def tracing() -> bool:
+    """Vrai si la requête courante est tracée (le pipeline passe alors en séquentiel)."""
+    return _current.get() is not None
+
+
+def alloc_stage(name: str):
+    """Marque une étape ; sans effet hors d'une requête tracée."""
+    trace = _current.get()
+    return trace.stage(name) if trace is not None else nullcontext()
+
+
+def staged(name: str, fn, *args):
+    """``fn(*args)`` dans l'étape ``name`` (pour ``asyncio.to_thread``)."""
+    with alloc_stage(name):
+        return fn(*args)
@@ -1,32 +1,161 @@
+import asyncio
+import functools
+import threading
+
+from fastapi import Depends
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker, DeclarativeBase
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from sqlalchemy.pool import QueuePool
+
+from src.pool_metrics import InstrumentedAsyncQueuePool, InstrumentedQueuePool
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 3600
+    DB_ASYNC_ENABLED: bool = True
+    DB_ASYNC_POOL_SIZE: int = 10
+    DB_ASYNC_MAX_OVERFLOW: int = 20
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore",)
 
-settings = Settings()
-
 class Base(DeclarativeBase):
     pass
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    poolclass=QueuePool,
-    pool_size=10,             
-    max_overflow=20,           
-    pool_pre_ping=True,        
-    pool_recycle=3600,
-    echo=False,
-)
 
-SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+# Settings et engines sont créés au premier accès, pas à l'import : importer
+# l'application (ou les modèles ORM, comme Alembic) ne lit pas `.env` et
+# n'importe pas le driver DB. ``from src.config.db import engine`` reste
+# possible via ``__getattr__`` ci-dessous.
+_lock = threading.RLock()
+
+
+def _once(create):
+    value = None
+
+    @functools.wraps(create)
+    def get():
+        nonlocal value
+        if value is None:
+            with _lock:
+                if value is None:
+                    value = (create(),)
+        return value[0]
+
+    return get
+
+
+@_once
+def get_settings() -> Settings:
+    return Settings()
+
+
+@_once
+def get_engine() -> Engine:
+    settings = get_settings()
+    return create_engine(
+        settings.DATABASE_URL,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_pre_ping=True,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        echo=False,
+    )
+
+
+@_once
+def get_sessionmaker() -> sessionmaker:
+    return sessionmaker(bind=get_engine(), autocommit=False, autoflush=False)
+
+
+def _create_async_engine(url: str):
+    """Engine async psycopg3 pour Postgres ; ``None`` ailleurs (SQLite des tests)."""
+    url = make_url(url)
+    if url.get_backend_name() != "postgresql":
+        return None
+    settings = get_settings()
+    return create_async_engine(
+        url.set(drivername="postgresql+psycopg"),
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=settings.DB_ASYNC_POOL_SIZE,
+        max_overflow=settings.DB_ASYNC_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_pre_ping=True,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        echo=False,
+    )
+
+
+# Modèle, écritures MLInput/MLOutput et profiling : les attentes DB se font sur
+# la boucle d'événements, sans occuper un thread. Alembic, les jobs et les
+# tests SQLite restent sur l'engine sync.
+@_once
+def get_async_engine() -> AsyncEngine | None:
+    settings = get_settings()
+    return _create_async_engine(settings.DATABASE_URL) if settings.DB_ASYNC_ENABLED else None
+
+
+@_once
+def get_async_sessionmaker() -> async_sessionmaker | None:
+    async_engine = get_async_engine()
+    if async_engine is None:
+        return None
+    return async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+
+_LAZY = {
+    "settings": get_settings,
+    "engine": get_engine,
+    "SessionLocal": get_sessionmaker,
+    "async_engine": get_async_engine,
+    "AsyncSessionLocal": get_async_sessionmaker,
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY:
+        return _LAZY[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 def get_db():
-    db = SessionLocal()
+    db = get_sessionmaker()()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db(db: Session = Depends(get_db)):
+    """Session async, ou ``None`` (on retombe sur ``db``) sans engine async ou
+    si ``get_db`` est surchargé (tests) : une seule surcharge couvre les deux."""
+    AsyncSessionLocal = get_async_sessionmaker()
+    if AsyncSessionLocal is None or db.get_bind() is not get_engine():
+        yield None
+        return
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def run_db(adb: AsyncSession | None, db: Session, fn, *args):
+    """Exécute ``fn(session, *args)`` (code ORM sync) sur la session async si
+    elle existe (greenlet, sans thread), sinon sur ``db`` dans un thread."""
+    if adb is not None:
+        return await adb.run_sync(fn, *args)
+    return await asyncio.to_thread(fn, db, *args)
+
+
+def release_connection(db: Session) -> None:
+    """Rend la connexion au pool avant une étape CPU (features, inférence).
+
+    La session prend une connexion à sa première requête et la garde jusqu'à
+    la fin de la transaction ; elle reste utilisable après coup et en
+    reprendra une à la prochaine requête. Les objets chargés sont détachés :
+    lire leurs attributs avant.
+    """
+    db.close()
@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta, timezone
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from src.config.db import get_db
+from src.drift.reference import reference_histograms
+from src.drift.scores import drift_scores, load_histograms
+from src.model_loader import load_reference_profile
+from src.schemas.DriftReport import DriftReport
+
+router = APIRouter(prefix="/drift", tags=["Drift"])
+
+
+@router.get(
+    "/{model_name}",
+    response_model=DriftReport,
+    status_code=status.HTTP_200_OK,
+    summary="Scores de drift par feature (PSI / KS)",
+    description=(
+        "Compare deux fenêtres temporelles à partir des histogrammes agrégés "
+        "(`drift_feature_stats`), sans relire `ml_inputs`.\n\n"
+        "**Notes**\n"
+        "- Par défaut : les dernières 24h contre les 7 jours précédents.\n"
+        "- `baseline=profile` compare au profil de référence (données d'entraînement) du modèle.\n"
+        "- Les fenêtres sont alignées sur l'heure.\n"
+    ),
+    responses={
+        404: {"description": "Aucune statistique sur l'une des deux fenêtres, ou profil absent."},
+    },
+)
+def get_drift(
+    model_name: str,
+    start: Optional[datetime] = Query(None, description="Début de la fenêtre courante."),
+    end: Optional[datetime] = Query(None, description="Fin (exclue) de la fenêtre courante."),
+    ref_start: Optional[datetime] = Query(None, description="Début de la fenêtre de référence."),
+    ref_end: Optional[datetime] = Query(None, description="Fin (exclue) de la fenêtre de référence."),
+    baseline: Literal["window", "profile"] = Query("window", description="Référence : fenêtre passée ou profil d'entraînement."),
+    db: Session = Depends(get_db),
+) -> DriftReport:
+    end = end or datetime.now(timezone.utc)
+    start = start or end - timedelta(days=1)
+    profile_version = None
+
+    if baseline == "profile":
+        profile = load_reference_profile(model_name)
+        if profile is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Profil de référence introuvable pour '{model_name}'",
+            )
+        ref_hists, ref_kinds = reference_histograms(profile)
+        ref_start = ref_end = None
+        profile_version = profile["version"]
+    else:
+        ref_end = ref_end or start
+        ref_start = ref_start or ref_end - timedelta(days=7)
+        ref_hists, ref_kinds = load_histograms(db, model_name, ref_start, ref_end)
+
+    cur_hists, kinds = load_histograms(db, model_name, start, end)
+    if not cur_hists or not ref_hists:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Pas de statistiques de drift pour '{model_name}' sur ces fenêtres",
+        )
+
+    features = drift_scores(ref_hists, cur_hists, {**ref_kinds, **kinds})
+    return DriftReport(
+        model_name=model_name,
+        reference_start=ref_start,
+        reference_end=ref_end,
+        reference_profile_version=profile_version,
+        current_start=start,
+        current_end=end,
+        n_drifted=sum(f["drifted"] for f in features),
+        features=features,
+    )
@@ -1,11 +1,17 @@
+import base64
+import hashlib
+import json
+import uuid
 from datetime import datetime
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from pydantic import BaseModel, Field
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from pydantic import BaseModel, Field, TypeAdapter
+from sqlalchemy import select, tuple_
 from sqlalchemy.orm import Session
 
 from src.config.db import get_db
+from src.model_registry import model_list_cache
 from src.models.ml import MLModel
 
 router = APIRouter(tags=["Models"])
@@ -19,6 +25,9 @@ class MLModelOut(BaseModel):
         None, description="Date de création du modèle (UTC, ISO 8601)."
     )
     is_active: bool = Field(..., description="Modèle actif/inactif.")
+    version: Optional[str] = Field(
+        None, description="Version déployée (seuil `<name>@<version>.threshold.json`)."
+    )
     model_config = {"json_schema_extra": {
         "examples": [{
             "id": "5b1c7b3a-0000-4000-8000-000000000002",
@@ -39,6 +48,9 @@ class MLModelOut(BaseModel):
         "Retourne la liste des modèles disponibles, triés du plus récent au plus ancien.\n\n"
         "**Remarques**\n"
         "- Les champs sont mappés depuis la table `ml_models`.\n"
+        "- Pagination par curseur (keyset) : `limit` lignes par page, page suivante dans l'en-tête "
+        "`Link` (`rel=\"next\"`) à rappeler avec `cursor`.\n"
+        "- `ETag` dérivé de la version du registre : un `If-None-Match` identique répond **304**.\n"
     ),
     responses={
         200: {
@@ -64,25 +76,92 @@ class MLModelOut(BaseModel):
                 }
             },
         },
+        304: {"description": "Listing inchangé depuis l'`ETag` fourni."},
+        400: {"description": "Curseur invalide."},
         500: {"description": "Erreur serveur lors de la lecture des modèles."},
     },
 )
-def list_ml_models(db: Session = Depends(get_db)) -> List[MLModelOut]:
+def list_ml_models(
+    request: Request,
+    limit: int = Query(100, ge=1, le=1000, description="Nombre maximal de modèles par page."),
+    cursor: Optional[str] = Query(None, description="Curseur de page, issu de l'en-tête `Link`."),
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+) -> Response:
+    key = (cursor, limit)
+    version = model_list_cache.version(db)
+    page = model_list_cache.get(version, key) if version is not None else None
+
+    if page is None:
+        after = _decode_cursor(cursor) if cursor else None
+        try:
+            body, next_cursor = _list_page(db, after, limit)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+        page = (body, next_cursor)
+        if version is not None:
+            model_list_cache.put(version, key, page)
+
+    body, next_cursor = page
+    # Sans compteur de registre (ex. SQLite), l'ETag est un hash du contenu.
+    tag = f"r{version}" if version is not None else hashlib.sha256(body).hexdigest()[:16]
+    etag = f'W/"{tag}-{limit}-{cursor or ""}"'
+
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if next_cursor:
+        next_url = request.url.include_query_params(cursor=next_cursor, limit=limit)
+        headers["Link"] = f'<{next_url}>; rel="next"'
+
+    if if_none_match and etag in [t.strip() for t in if_none_match.split(",")]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+_MODELS_ADAPTER = TypeAdapter(List[MLModelOut])
+
+
+def _encode_cursor(created_at: datetime, id_: uuid.UUID) -> str:
+    raw = json.dumps([created_at.isoformat(), str(id_)]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
     try:
-        rows = (
-            db.query(MLModel)
-              .order_by(MLModel.created_at.desc())
-              .all()
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, id_ = json.loads(raw)
+        return datetime.fromisoformat(created_at), uuid.UUID(id_)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Curseur invalide")
+
+
+def _list_page(
+    db: Session,
+    after: tuple[datetime, uuid.UUID] | None,
+    limit: int,
+) -> tuple[bytes, str | None]:
+    stmt = (
+        select(MLModel)
+        .order_by(MLModel.created_at.desc(), MLModel.id.desc())
+        .limit(limit + 1)
+    )
+    if after is not None:
+        stmt = stmt.where(tuple_(MLModel.created_at, MLModel.id) < after)
+
+    rows = db.execute(stmt).scalars().all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_cursor(rows[-1].created_at, rows[-1].id)
+
+    body = _MODELS_ADAPTER.dump_json([
+        MLModelOut(
+            id=str(r.id),
+            name=r.name,
+            description=r.description,
+            created_at=r.created_at,
+            is_active=r.is_active,
+            version=r.version,
         )
-        return [
-            MLModelOut(
-                id=str(r.id),
-                name=r.name,
-                description=r.description,
-                created_at=r.created_at,
-                is_active=r.is_active,
-            )
-            for r in rows
-        ]
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        for r in rows
+    ])
+    return body, next_cursor
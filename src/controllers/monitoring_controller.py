@@ -0,0 +1,140 @@
+from datetime import datetime, timedelta, timezone
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from src.admission import admission
+from src.config.db import get_async_engine, get_db, get_engine
+from src.models.profiling import ProfilingLog
+from src.pool_metrics import async_pool_metrics, pool_metrics
+from src.stack_profile import collapsed, merge_profiles
+from src.storage.bureau_store import bureau_store
+from src.schemas.AdmissionStats import AdmissionStats
+from src.schemas.BureauStoreStats import BureauStoreStats
+from src.schemas.PoolStats import PoolStats
+
+router = APIRouter(prefix="/monitoring", tags=["Monitoring"])
+
+
+@router.get(
+    "/pool",
+    response_model=PoolStats,
+    status_code=status.HTTP_200_OK,
+    summary="État et métriques du pool de connexions",
+    description=(
+        "Connexions prises / libres / en overflow, et compteurs cumulés depuis le démarrage "
+        "du worker : checkouts, timeouts, attentes (> 1 ms), histogramme cumulatif de la "
+        "latence de checkout (`le_<ms>`).\n\n"
+        "**Notes**\n"
+        "- Métriques par processus : à collecter sur chaque worker.\n"
+        "- `engine=async` : pool de l'engine async (modèle, écritures `/predict`, profiling).\n"
+        "- Dimensionnement : `DB_POOL_SIZE`, `DB_MAX_OVERFLOW`, `DB_ASYNC_POOL_SIZE`, "
+        "`DB_ASYNC_MAX_OVERFLOW`, `DB_POOL_TIMEOUT`.\n"
+    ),
+    responses={
+        404: {"description": "Pas d'engine async (base non Postgres ou `DB_ASYNC_ENABLED=false`)."},
+    },
+)
+def get_pool_stats(
+    engine_kind: Literal["sync", "async"] = Query("sync", alias="engine", description="Pool à décrire."),
+) -> PoolStats:
+    if engine_kind == "async":
+        async_engine = get_async_engine()
+        if async_engine is None:
+            raise HTTPException(status_code=404, detail="Engine async non configuré")
+        return PoolStats(**async_pool_metrics.snapshot(async_engine.pool))
+    return PoolStats(**pool_metrics.snapshot(get_engine().pool))
+
+
+@router.get(
+    "/admission",
+    response_model=AdmissionStats,
+    status_code=status.HTTP_200_OK,
+    summary="Contrôle d'admission de /predict",
+    description=(
+        "Lignes en cours (au total et par modèle), requêtes en file, et compteurs cumulés depuis "
+        "le démarrage du worker : admissions, rejets **503** par limite et par classe "
+        "(`global_batch`, `model_interactive`, ...), histogramme cumulatif de l'attente en file "
+        "(`le_<ms>`).\n\n"
+        "**Notes**\n"
+        "- Métriques et limites par processus : à collecter sur chaque worker.\n"
+        "- Réglages : `ADMISSION_MAX_ROWS` (0 = désactivé), `ADMISSION_MAX_ROWS_PER_MODEL`, "
+        "`ADMISSION_INTERACTIVE_MAX_ROWS`, `ADMISSION_INTERACTIVE_RESERVE`, `ADMISSION_QUEUE_TIMEOUT_S`.\n"
+    ),
+)
+def get_admission_stats() -> AdmissionStats:
+    return AdmissionStats(**admission.snapshot())
+
+
+@router.get(
+    "/bureau",
+    response_model=BureauStoreStats,
+    status_code=status.HTTP_200_OK,
+    summary="Store des agrégats bureau",
+    description=(
+        "Version chargée et nombre de clients, durée du dernier chargement (memmap), et compteurs "
+        "cumulés depuis le démarrage du worker : lots enrichis, lignes recherchées, clients trouvés, "
+        "histogramme cumulatif de la latence de recherche par lot (`le_<ms>`).\n\n"
+        "**Notes**\n"
+        "- Reconstruction : `python -m src.jobs.bureau --input data/bureau.csv`.\n"
+        "- `version` nul : aucun store dans `BUREAU_STORE_DIR`.\n"
+    ),
+)
+def get_bureau_stats() -> BureauStoreStats:
+    return BureauStoreStats(**bureau_store.snapshot())
+
+
+@router.get(
+    "/flamegraph",
+    response_class=PlainTextResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Flamegraph agrégé des requêtes profilées",
+    description=(
+        "Somme des profils de piles (`profiling_logs.full_profile`) des requêtes échantillonnées "
+        "sur `[start, end[`, filtrées par endpoint et/ou modèle, au format replié `pile nombre` "
+        "(une pile par ligne, frames séparées par `;`), lisible par `flamegraph.pl`, inferno ou "
+        "speedscope.\n\n"
+        "**Notes**\n"
+        "- Par défaut : la dernière heure.\n"
+        "- Au plus `limit` profils, les plus récents ; nombre lu dans l'en-tête `X-Profiles`.\n"
+        "- Échantillonnage : `PROFILING_STACKS_SAMPLE_RATE` (0 = désactivé), un échantillon "
+        "toutes les `PROFILING_STACKS_INTERVAL_MS`.\n"
+    ),
+    responses={
+        200: {"description": "Piles repliées.", "content": {"text/plain": {}}},
+        404: {"description": "Aucun profil sur la plage."},
+    },
+)
+def get_flamegraph(
+    endpoint: Optional[str] = Query(None, description="Chemin de l'endpoint (ex. `/predict/`)."),
+    model_name: Optional[str] = Query(None, description="Nom du modèle."),
+    start: Optional[datetime] = Query(None, description="Début de la plage."),
+    end: Optional[datetime] = Query(None, description="Fin (exclue) de la plage."),
+    limit: int = Query(1000, ge=1, le=100_000, description="Nombre maximal de profils agrégés."),
+    db: Session = Depends(get_db),
+) -> PlainTextResponse:
+    end = end or datetime.now(timezone.utc)
+    start = start or end - timedelta(hours=1)
+
+    stmt = (
+        select(ProfilingLog.full_profile)
+        .where(
+            ProfilingLog.full_profile.is_not(None),
+            ProfilingLog.created_at >= start,
+            ProfilingLog.created_at < end,
+        )
+        .order_by(ProfilingLog.created_at.desc())
+        .limit(limit)
+    )
+    if endpoint is not None:
+        stmt = stmt.where(ProfilingLog.endpoint == endpoint)
+    if model_name is not None:
+        stmt = stmt.where(ProfilingLog.model_name == model_name)
+
+    stacks, n = merge_profiles(db.execute(stmt).scalars())
+    if not n:
+        raise HTTPException(status_code=404, detail="Aucun profil sur cette plage")
+    return PlainTextResponse(collapsed(stacks), headers={"X-Profiles": str(n)})
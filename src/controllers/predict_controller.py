@@ -1,24 +1,51 @@
+import asyncio
 from datetime import datetime, timezone
+from typing import Literal, Optional
 from uuid import uuid4
 import math
 
-from fastapi import APIRouter, Depends, HTTPException, Body, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Body, Header, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy import insert
 import pandas as pd
 import numpy as np  
 
-from src.config.db import get_db
+from src.admission import AdmissionRejected, admission
+from src.alloc_profile import staged
+from src.config.db import get_async_db, get_db, release_connection, run_db
 from src.models.ml import MLModel
 from src.models.ml_inputs import MLInput
 from src.models.ml_output import MLOutput
+from src.models.ml_input_features import ml_input_features
+
+from src.model_loader import load_model, load_reference_profile, load_threshold
+from src.features import FEATURE_PIPELINE_VERSION, compute_features
+from src.drift.reference import out_of_range
+from src.drift.sketch import record_feature_stats
+from src.idempotency import IdempotencyTimeout, acquire, inputs_fingerprint, release_claim
+from src.negotiation import ARROW_STREAM, predictions_ipc, preferred_format
+from src.explain import EXPLAIN_TOP_K, ExplainerUnavailable, store_explanations, top_contributions
+from src.pipeline import (
+    PREDICT_CHUNK_ROWS,
+    PREDICT_PIPELINE_DEPTH,
+    StageError,
+    chunk_bounds,
+    run_pipeline,
+)
+from src.storage.bureau_store import bureau_store
+from src.storage.feature_archive import (
+    FEATURE_STORAGE,
+    feature_column_records,
+    parquet_archive,
+)
 
-from src.model_loader import load_model
-from src.features import compute_features
-
+from src.schemas.ExplainItemResult import ExplainItemResult
+from src.schemas.ExplainResponse import ExplainResponse
 from src.schemas.PredictItemResult import PredictItemResult
 from src.schemas.PredictResponse import PredictResponse
-from src.schemas.PredictRequest import PredictRequest 
+from src.schemas.RawPredictRequest import RawPredictRequest
+from src.validation import validate_inputs
 
 from time import perf_counter
 
@@ -60,6 +87,20 @@ def series_to_jsonable(s: pd.Series) -> dict:
     return cleaned
 
 
+# Fonctions ORM sync, exécutées via `run_db` sur la session async ou sync.
+def find_model(db: Session, name: str) -> MLModel | None:
+    return db.query(MLModel).filter(MLModel.name == name).first()
+
+
+def insert_returning_ids(db: Session, input_dicts: list[dict]) -> list:
+    result = db.execute(insert(MLInput).returning(MLInput.id), input_dicts)
+    return [row[0] for row in result.fetchall()]
+
+
+def insert_rows(db: Session, target, rows: list[dict]) -> None:
+    db.execute(insert(target), rows)
+
+
 @router.post(
     "/",
     response_model=PredictResponse,
@@ -69,30 +110,170 @@ def series_to_jsonable(s: pd.Series) -> dict:
         "Calcule la probabilité qu'un dossier soit **solvable**.\n\n"
         "**Notes**\n"
         "- `model_name` doit référencer un modèle *actif* en base (`MLModel`).\n"
+        "- Seuil de décision : artefact `<model_name>@<version>.threshold.json` (`ml_models.version`, "
+        "`<model_name>.threshold.json` sans version), 0.5 à défaut.\n"
         "- Les données d'entrée sont persistées (`MLInput`) puis les sorties (`MLOutput`) sont enregistrées.\n"
+        "- L'identifiant de requête est renvoyé dans l'en-tête `X-Request-ID` (voir `/predictions/requests/{request_id}`).\n"
+        "- En-tête `Idempotency-Key` : la clé sert d'identifiant de requête. Une requête déjà traitée "
+        "est resservie depuis `ml_outputs` sans recalcul (`Idempotent-Replayed: true`) si ses entrées "
+        "sont identiques (**422** sinon) ; un doublon "
+        "concurrent attend la fin de la première (**409** après `IDEMPOTENCY_WAIT_S`).\n"
+        "- `nb_loans` / `sum_debt` absents sont complétés depuis le store des agrégats bureau "
+        "(par `SK_ID_CURR`) ; les valeurs fournies sont conservées.\n"
+        "- Les histogrammes de drift (`drift_feature_stats`) sont incrémentés pour la fenêtre courante.\n"
+        "- Si un profil de référence existe, les features hors plage sont listées dans `MLOutput.meta`.\n"
+        "- Selon `FEATURE_STORAGE`, les features sont stockées en JSONB, en colonnes typées, en Parquet, "
+        "ou pas du tout (`lazy` : recalculées à la demande depuis `raw_data`).\n"
+        "- Au-delà de `BULK_VALIDATION_MIN_ROWS` lignes, `inputs` est validé colonne par colonne "
+        "(mêmes règles et même format d'erreur **422** que `ModelFeatures`).\n"
+        "- `explain=background` : les `top_k` contributions SHAP sont stockées dans `ml_explanations` "
+        "après l'envoi de la réponse.\n"
+        "- Au-delà de `PREDICT_CHUNK_ROWS` lignes, le lot est traité en chunks pipelinés "
+        "(sérialisation, inférence et écriture en parallèle), dans une seule transaction.\n"
+        "- Contrôle d'admission sur les lignes en cours (par modèle et au total, `ADMISSION_*`) : "
+        "au-delà, **503** immédiat avec `Retry-After`. Les petites requêtes (interactives) sont "
+        "prioritaires sur les gros lots.\n"
+        "- `Accept: application/vnd.apache.arrow.stream` : réponse Arrow IPC en colonnes (`label` en "
+        "dictionnaire, `proba`, `proba_defaut`, `proba_solvable`), sans objet par ligne ; JSON par défaut.\n"
         "- En cas d'erreur de préparation des features ou de prédiction, la requête retourne **400**.\n"
     ),
     responses={
-        200: {"description": "Prédictions calculées avec succès."},
+        200: {
+            "description": "Prédictions calculées avec succès.",
+            "content": {ARROW_STREAM: {"schema": {"type": "string", "format": "binary"}}},
+        },
         400: {"description": "Erreur pendant la préparation des features ou la prédiction."},
         404: {"description": "Modèle introuvable ou inactif."},
+        409: {"description": "Requête de même `Idempotency-Key` toujours en cours."},
+        422: {"description": "Entrées invalides, ou `Idempotency-Key` déjà utilisée pour une autre requête."},
         500: {"description": "Impossible de charger le modèle/erreur serveur."},
+        503: {"description": "Trop de lignes en cours de traitement ; réessayer après `Retry-After`."},
     },
 )
-def batch_predict(
-    payload: PredictRequest = Body(...),
+async def batch_predict(
+    request: Request,
+    response: Response,
+    background_tasks: BackgroundTasks,
+    payload: RawPredictRequest = Body(...),
+    explain: Literal["none", "background"] = Query(
+        "none", description="`background` : explications SHAP stockées après la réponse."
+    ),
+    top_k: int = Query(EXPLAIN_TOP_K, ge=1, le=100, description="Nombre de contributions gardées par ligne."),
     db: Session = Depends(get_db),
+    adb: AsyncSession | None = Depends(get_async_db),
+    idempotency_key: Optional[str] = Header(
+        None,
+        alias="Idempotency-Key",
+        min_length=1,
+        max_length=64,
+        description="Clé client : une requête répétée renvoie les résultats déjà enregistrés.",
+    ),
+    accept: Optional[str] = Header(None, description=f"`{ARROW_STREAM}` pour une réponse Arrow IPC."),
 ):
     start_time = perf_counter()
-    request_id = str(uuid4())
+    request.state.model_name = payload.model_name
+    request_id = idempotency_key or str(uuid4())
+    response.headers["X-Request-ID"] = request_id
+    response.headers["Vary"] = "Accept"
+    fmt = preferred_format(accept)
     now = datetime.now(timezone.utc)
 
-    row = db.query(MLModel).filter(MLModel.name == payload.model_name).first()
+    n_rows = len(payload.inputs) if isinstance(payload.inputs, list) else 0
+
+    fingerprint = None
+    if idempotency_key is not None:
+        fingerprint = await asyncio.to_thread(inputs_fingerprint, payload.inputs)
+        try:
+            stored = await acquire(adb, db, idempotency_key)
+        except IdempotencyTimeout:
+            raise HTTPException(
+                status_code=409,
+                detail="Une requête avec cette clé d'idempotence est toujours en cours",
+            )
+        if stored is not None:
+            return replay(response, payload.model_name, n_rows, fingerprint, stored, fmt)
+
+    try:
+        # Admission avant la validation : un lot refusé ne coûte aucun CPU.
+        async with admission.admit(payload.model_name, n_rows):
+            df_raw = await asyncio.to_thread(staged, "validation", validate_inputs, payload.inputs)
+            return await run_batch_predict(
+                start_time, request_id, now, df_raw, background_tasks, payload, explain, top_k, db, adb,
+                response, fmt, fingerprint,
+            )
+    except AdmissionRejected as e:
+        raise overloaded(e)
+    finally:
+        if idempotency_key is not None:
+            await run_db(adb, db, release_claim, idempotency_key)
+
+
+def overloaded(e: AdmissionRejected) -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail=f"Trop de lignes en cours ({'pour ce modèle' if e.reason == 'model' else 'au total'}), réessayer plus tard",
+        headers={"Retry-After": str(e.retry_after_s)},
+    )
+
+
+def arrow_response(response: Response, body: bytes) -> Response:
+    # Réponse renvoyée telle quelle : les en-têtes posés sur `response` sont recopiés.
+    headers = {
+        k: v for k, v in response.headers.items() if k.lower() not in ("content-length", "content-type")
+    }
+    return Response(content=body, media_type=ARROW_STREAM, headers=headers)
+
+
+def replay(
+    response: Response, model_name: str, n_rows: int, fingerprint: str, stored: list, fmt: str = "json",
+):
+    # Sorties antérieures à l'empreinte : seuls le modèle et le nombre de lignes sont comparables.
+    stored_fingerprint = (stored[0].meta or {}).get("inputs_fingerprint", fingerprint)
+    if stored[0].model_name != model_name or len(stored) != n_rows or stored_fingerprint != fingerprint:
+        raise HTTPException(
+            status_code=422,
+            detail="Clé d'idempotence déjà utilisée pour une autre requête",
+        )
+    response.headers["Idempotent-Replayed"] = "true"
+    if fmt == "arrow":
+        return arrow_response(response, predictions_ipc(
+            model_name,
+            [r.prediction == "non_solvable" for r in stored],
+            [r.proba_defaut for r in stored],
+            [r.proba_solvable for r in stored],
+        ))
+    return PredictResponse(
+        model_name=model_name,
+        results=[PredictItemResult(label=r.prediction, proba=r.prob) for r in stored],
+    )
+
+
+async def run_batch_predict(
+    start_time: float,
+    request_id: str,
+    now: datetime,
+    df_raw: pd.DataFrame,
+    background_tasks: BackgroundTasks,
+    payload: RawPredictRequest,
+    explain: str,
+    top_k: int,
+    db: Session,
+    adb: AsyncSession | None,
+    response: Response,
+    fmt: str = "json",
+    fingerprint: str | None = None,
+) -> PredictResponse | Response:
+    row = await run_db(adb, db, find_model, payload.model_name)
     if not row or getattr(row, "is_active", True) is False:
         raise HTTPException(status_code=404, detail="Modèle introuvable ou inactif")
+    model_version = row.version
+
+    # Pas de connexion tenue pendant le chargement, les features et l'inférence :
+    # la session en reprend une à la première écriture.
+    await run_db(adb, db, release_connection)
 
     try:
-        model = load_model(payload.model_name)
+        model = await asyncio.to_thread(load_model, payload.model_name)
         classes = getattr(model, "classes_", [0, 1])
         classes = [int(c) for c in classes]
     except Exception as e:
@@ -102,17 +283,30 @@ def batch_predict(
             detail=f"Chargement du modèle '{payload.model_name}' impossible: {e}",
         )
 
-    try:
-        df_raw = pd.DataFrame([x.model_dump() for x in payload.inputs])
-
+    def prepare_features():
+        # Agrégats bureau manquants complétés avant stockage : raw_data reste
+        # suffisant pour recalculer les features (FEATURE_STORAGE=lazy).
+        raw = bureau_store.enrich(df_raw)
         try:
-            X = compute_features(df_raw.copy())
+            X = compute_features(raw.copy())
         except Exception:
-            X = df_raw.copy()
+            X = raw.copy()
 
         X = X.reset_index(drop=True)
-        df_raw = df_raw.reset_index(drop=True)
+        raw = raw.reset_index(drop=True)
+
+        out_of_range_cols: dict[int, list[str]] = {}
+        profile = load_reference_profile(payload.model_name)
+        if profile is not None:
+            mask = out_of_range(profile, raw)
+            flags = mask.to_numpy(dtype=bool)
+            if flags.size:
+                for i in np.flatnonzero(flags.any(axis=1)):
+                    out_of_range_cols[int(i)] = mask.columns[flags[i]].tolist()
+        return X, raw, out_of_range_cols
 
+    try:
+        X, df_raw, out_of_range_cols = await asyncio.to_thread(staged, "features", prepare_features)
     except Exception as e:
         print(f"[ERROR] Préparation features: {e}")
         raise HTTPException(
@@ -120,88 +314,270 @@ def batch_predict(
             detail=f"Erreur de préparation des features: {e}",
         )
 
-    try:
+    THRESH = await asyncio.to_thread(load_threshold, payload.model_name, model_version)
+
+    input_ids: list = []
+    # Probabilités par chunk, dans l'ordre : la réponse est construite à la fin.
+    scores: list[tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+    loop = asyncio.get_running_loop()
+
+    def db_call(fn, *args):
+        # Appelé depuis le thread du pipeline : la requête s'exécute sur la
+        # boucle d'événements (session async) ou sur la session sync.
+        return asyncio.run_coroutine_threadsafe(run_db(adb, db, fn, *args), loop).result()
+
+    def prepare_inputs(chunk: tuple[int, int]) -> list[dict]:
+        a, b = chunk
         input_dicts = []
-        for i in range(len(df_raw)):
+        for i in range(a, b):
             raw_dict = series_to_jsonable(df_raw.iloc[i])
-            feat_dict = series_to_jsonable(X.iloc[i])
+            feat_dict = series_to_jsonable(X.iloc[i]) if FEATURE_STORAGE == "jsonb" else None
 
             input_dicts.append({
                 "created_at": now,
                 "model_name": payload.model_name,
+                "request_id": request_id,
                 "raw_data": raw_dict,
                 "features": feat_dict,
+                "feature_pipeline_version": FEATURE_PIPELINE_VERSION,
             })
+        return input_dicts
+
+    def predict_chunk(chunk: tuple[int, int]):
+        a, b = chunk
+        return model.predict_proba(X.iloc[a:b])
 
-        stmt = insert(MLInput).returning(MLInput.id)
-        result = db.execute(stmt, input_dicts)
-        input_ids = [row[0] for row in result.fetchall()]
+    def write_chunk(chunk: tuple[int, int], out: dict) -> None:
+        a, b = chunk
+        try:
+            chunk_ids = db_call(insert_returning_ids, out["inputs"])
+
+            if FEATURE_STORAGE == "columns":
+                records = feature_column_records(chunk_ids, X.iloc[a:b], payload.model_name, now)
+                db_call(insert_rows, ml_input_features, records)
+        except Exception as e:
+            raise StageError("inputs", e) from e
+
+        input_ids.extend(chunk_ids)
+
+        try:
+            probas = np.asarray(out["predict"], dtype=np.float64).reshape(b - a, len(classes))
+            p_defs = probas[:, classes.index(1)]
+            p_sols = probas[:, classes.index(0)]
+            defauts = p_defs >= THRESH
+            scores.append((defauts, p_defs, p_sols))
+
+            output_dicts = []
+
+            elapsed_ms = int((perf_counter() - start_time) * 1000)
+
+            for j, i in enumerate(range(a, b)):
+                p_def = float(p_defs[j])
+                p_sol = float(p_sols[j])
+
+                if defauts[j]:
+                    label = "non_solvable"
+                    proba_retour = p_def
+                else:
+                    label = "solvable"
+                    proba_retour = p_sol
+
+                output_dicts.append({
+                    "input_id": input_ids[i],
+                    "request_id": request_id,
+                    "model_name": payload.model_name,
+                    "model_version": model_version,
+                    "prediction": label,
+                    "prob": proba_retour,
+                    "proba_defaut": p_def,
+                    "proba_solvable": p_sol,
+                    "threshold": THRESH,
+                    "classes": classes,
+                    "latency_ms": elapsed_ms,
+                    "meta": {
+                        "request_id": request_id,
+                        "row": i,
+                        "elapsed_ms": elapsed_ms,
+                        **({"out_of_range": out_of_range_cols[i]} if i in out_of_range_cols else {}),
+                        **({"inputs_fingerprint": fingerprint} if fingerprint else {}),
+                    },
+                    "created_at": now,
+                })
+
+            db_call(insert_rows, MLOutput, output_dicts)
+        except Exception as e:
+            raise StageError("predict", e) from e
+
+    # Features du chunk N+1, inférence du chunk N et écriture du chunk N-1 en
+    # parallèle ; une seule transaction pour toute la requête.
+    try:
+        await asyncio.to_thread(
+            run_pipeline,
+            chunk_bounds(len(X), PREDICT_CHUNK_ROWS),
+            {"inputs": prepare_inputs, "predict": predict_chunk},
+            write_chunk,
+            PREDICT_PIPELINE_DEPTH,
+        )
+        await run_db(adb, db, Session.commit)
+
+    except StageError as e:
+        await run_db(adb, db, Session.rollback)
+        if e.stage == "inputs":
+            print(f"[ERROR] Bulk insert MLInput: {e}")
+            raise HTTPException(
+                status_code=400,
+                detail=f"Erreur lors de l'enregistrement des entrées: {e}",
+            )
+        print(f"[ERROR] Prédiction/bulk insert: {e}")
+        raise HTTPException(
+            status_code=400,
+            detail=f"Erreur pendant la prédiction: {e}",
+        )
 
     except Exception as e:
-        print(f"[ERROR] Bulk insert MLInput: {e}")
-        db.rollback()
+        print(f"[ERROR] Prédiction/bulk insert: {e}")
+        await run_db(adb, db, Session.rollback)
         raise HTTPException(
             status_code=400,
-            detail=f"Erreur lors de l'enregistrement des entrées: {e}",
+            detail=f"Erreur pendant la prédiction: {e}",
         )
 
-    try:
-        probas = model.predict_proba(X)
-        i_def = classes.index(1)
-        i_sol = classes.index(0)
-        THRESH = 0.5
+    # Histogrammes de drift : calcul CPU, session sync dans un thread.
+    def record_stats():
+        try:
+            record_feature_stats(db, payload.model_name, df_raw, now)
+            db.commit()
+        except Exception as e:
+            print(f"[ERROR] Statistiques de drift: {e}")
+            db.rollback()
+
+        if FEATURE_STORAGE == "parquet":
+            try:
+                parquet_archive.append(input_ids, X, payload.model_name, now)
+            except Exception as e:
+                print(f"[ERROR] Archive Parquet des features: {e}")
+
+    await asyncio.to_thread(record_stats)
+
+    if explain == "background":
+        background_tasks.add_task(
+            store_explanations,
+            db.get_bind(),
+            model,
+            X,
+            input_ids,
+            payload.model_name,
+            now,
+            top_k,
+        )
 
-        results: list[PredictItemResult] = []
-        output_dicts = []
+    defauts, p_defs, p_sols = (np.concatenate(cols) for cols in zip(*scores))
+    if fmt == "arrow":
+        body = staged("response", predictions_ipc, payload.model_name, defauts, p_defs, p_sols)
+        return arrow_response(response, body)
+
+    def build_response() -> PredictResponse:
+        return PredictResponse(
+            model_name=payload.model_name,
+            results=[
+                PredictItemResult(label="non_solvable", proba=p_def) if d
+                else PredictItemResult(label="solvable", proba=p_sol)
+                for d, p_def, p_sol in zip(defauts.tolist(), p_defs.tolist(), p_sols.tolist())
+            ],
+        )
 
-        elapsed_ms = int((perf_counter() - start_time) * 1000)
+    return staged("response", build_response)
 
-        for i, p in enumerate(probas):
-            p_def = float(p[i_def])
-            p_sol = float(p[i_sol])
 
-            if p_def >= THRESH:
-                label = "non_solvable"
-                proba_retour = p_def
-            else:
-                label = "solvable"
-                proba_retour = p_sol
+@router.post(
+    "/explain",
+    response_model=ExplainResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Prédire et expliquer (SHAP)",
+    description=(
+        "Comme `/predict`, avec les `top_k` contributions SHAP de chaque ligne.\n\n"
+        "**Notes**\n"
+        "- Modèles à base d'arbres uniquement (`TreeExplainer`, construit une fois par modèle chargé).\n"
+        "- Contributions calculées pour tout le lot en un appel, dans l'espace des features transformées.\n"
+        "- Rien n'est enregistré en base : voir `/predict?explain=background` pour stocker les explications.\n"
+    ),
+    responses={
+        400: {"description": "Erreur de préparation, de prédiction, ou modèle non explicable."},
+        404: {"description": "Modèle introuvable ou inactif."},
+        500: {"description": "Impossible de charger le modèle/erreur serveur."},
+        503: {"description": "Trop de lignes en cours de traitement ; réessayer après `Retry-After`."},
+    },
+)
+async def explain_predict(
+    request: Request,
+    payload: RawPredictRequest = Body(...),
+    top_k: int = Query(EXPLAIN_TOP_K, ge=1, le=100, description="Nombre de contributions gardées par ligne."),
+    db: Session = Depends(get_db),
+    adb: AsyncSession | None = Depends(get_async_db),
+):
+    request.state.model_name = payload.model_name
+    n_rows = len(payload.inputs) if isinstance(payload.inputs, list) else 0
+    try:
+        async with admission.admit(payload.model_name, n_rows):
+            df_raw = await asyncio.to_thread(staged, "validation", validate_inputs, payload.inputs)
+
+            row = await run_db(adb, db, find_model, payload.model_name)
+            if not row or getattr(row, "is_active", True) is False:
+                raise HTTPException(status_code=404, detail="Modèle introuvable ou inactif")
+            model_version = row.version
+            await run_db(adb, db, release_connection)
 
-            results.append(
-                PredictItemResult(label=label, proba=proba_retour)
+            return await asyncio.to_thread(
+                staged, "explain", explain_batch, payload.model_name, df_raw, top_k, model_version,
             )
+    except AdmissionRejected as e:
+        raise overloaded(e)
 
-            output_dicts.append({
-                "input_id": input_ids[i],
-                "model_name": payload.model_name,
-                "model_version": getattr(row, "version", None),
-                "prediction": label,
-                "prob": proba_retour,
-                "proba_defaut": p_def,
-                "proba_solvable": p_sol,
-                "threshold": THRESH,
-                "classes": classes,
-                "latency_ms": elapsed_ms,
-                "meta": {
-                    "request_id": request_id,
-                    "elapsed_ms": elapsed_ms,
-                },
-                "created_at": now,
-            })
 
-        db.execute(insert(MLOutput), output_dicts)
+def explain_batch(
+    model_name: str, df_raw: pd.DataFrame, top_k: int, model_version: str | None = None,
+) -> ExplainResponse:
+    try:
+        model = load_model(model_name)
+        classes = [int(c) for c in getattr(model, "classes_", [0, 1])]
+    except Exception as e:
+        print(f"[ERROR] Chargement modèle: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Chargement du modèle '{model_name}' impossible: {e}",
+        )
 
-        db.commit()
+    df_raw = bureau_store.enrich(df_raw)
+    try:
+        X = compute_features(df_raw.copy())
+    except Exception:
+        X = df_raw.copy()
 
+    try:
+        probas = model.predict_proba(X)
+        base, contributions = top_contributions(model, X, top_k)
+    except ExplainerUnavailable as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        print(f"[ERROR] Prédiction/bulk insert: {e}")
-        db.rollback()
+        print(f"[ERROR] Explication: {e}")
         raise HTTPException(
             status_code=400,
-            detail=f"Erreur pendant la prédiction: {e}",
+            detail=f"Erreur pendant l'explication: {e}",
         )
 
-    return PredictResponse(
-        model_name=payload.model_name,
+    i_def = classes.index(1)
+    i_sol = classes.index(0)
+    THRESH = load_threshold(model_name, model_version)
+
+    results = []
+    for p, contribs in zip(probas, contributions):
+        p_def = float(p[i_def])
+        p_sol = float(p[i_sol])
+        label, proba = ("non_solvable", p_def) if p_def >= THRESH else ("solvable", p_sol)
+        results.append(ExplainItemResult(label=label, proba=proba, contributions=contribs))
+
+    return ExplainResponse(
+        model_name=model_name,
+        base_value=base,
         results=results,
-    )
\ No newline at end of file
+    )
@@ -0,0 +1,156 @@
+import base64
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, tuple_
+from sqlalchemy.orm import Session
+
+from src.config.db import get_db
+from src.models.ml_output import MLOutput
+from src.storage.prediction_stream import PREDICTION_COLUMNS, iter_ndjson, iter_parquet
+
+router = APIRouter(prefix="/predictions", tags=["Historique"])
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+_FORMAT = Query("ndjson", description="`ndjson` (une prédiction par ligne) ou `parquet`.")
+
+
+def _encode_cursor(created_at: datetime, id_: uuid.UUID) -> str:
+    raw = json.dumps([created_at.isoformat(), str(id_)]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, id_ = json.loads(raw)
+        return datetime.fromisoformat(created_at), uuid.UUID(id_)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Curseur invalide")
+
+
+def _paginate(
+    request: Request, db: Session, where: list, limit: int, cursor: Optional[str], **params,
+) -> tuple[list, dict]:
+    """Page de ``limit`` lignes par clé ``(created_at, id)`` ; page suivante dans l'en-tête ``Link``."""
+    key = tuple_(MLOutput.created_at, MLOutput.id)
+    where = list(where)
+    if cursor:
+        where.append(key >= _decode_cursor(cursor))
+
+    # Première clé de la page suivante : parcours d'index seul, avant d'ouvrir le flux.
+    boundary = db.execute(
+        select(MLOutput.created_at, MLOutput.id)
+        .where(*where)
+        .order_by(MLOutput.created_at, MLOutput.id)
+        .offset(limit)
+        .limit(1)
+    ).first()
+
+    headers = {}
+    if boundary is not None:
+        where.append(key < tuple(boundary))
+        next_url = request.url.include_query_params(cursor=_encode_cursor(*boundary), **params)
+        headers["Link"] = f'<{next_url}>; rel="next"'
+    return where, headers
+
+
+def _stream(db: Session, stmt, fmt: str, headers: dict) -> StreamingResponse:
+    # Connexion dédiée au flux : la session de la requête est fermée avant la fin de l'envoi.
+    engine = db.get_bind()
+    body = iter_parquet(engine, stmt) if fmt == "parquet" else iter_ndjson(engine, stmt)
+    return StreamingResponse(body, media_type=MEDIA_TYPES[fmt], headers=headers)
+
+
+@router.get(
+    "",
+    status_code=status.HTTP_200_OK,
+    summary="Historique des prédictions d'un modèle",
+    description=(
+        "Prédictions (`ml_outputs`) d'un modèle sur `[start, end[`, triées par `created_at`, "
+        "diffusées en flux (curseur serveur), sans charger la plage en mémoire.\n\n"
+        "**Notes**\n"
+        "- Par défaut : les dernières 24h.\n"
+        "- Pagination par curseur : au plus `limit` lignes, page suivante dans l'en-tête "
+        "`Link` (`rel=\"next\"`) à rappeler avec `cursor`.\n"
+        "- Utilise l'index `ix_ml_outputs_model_created`.\n"
+    ),
+    responses={
+        200: {
+            "description": "Flux NDJSON ou fichier Parquet.",
+            "content": {MEDIA_TYPES["ndjson"]: {}, MEDIA_TYPES["parquet"]: {}},
+        },
+        400: {"description": "Curseur invalide."},
+    },
+)
+def list_predictions(
+    request: Request,
+    model_name: str = Query(..., description="Nom du modèle."),
+    start: Optional[datetime] = Query(None, description="Début de la plage."),
+    end: Optional[datetime] = Query(None, description="Fin (exclue) de la plage."),
+    limit: int = Query(100_000, ge=1, le=1_000_000, description="Nombre maximal de lignes."),
+    cursor: Optional[str] = Query(None, description="Curseur de page, issu de l'en-tête `Link`."),
+    format: Literal["ndjson", "parquet"] = _FORMAT,
+    db: Session = Depends(get_db),
+) -> StreamingResponse:
+    end = end or datetime.now(timezone.utc)
+    start = start or end - timedelta(days=1)
+    where = [
+        MLOutput.model_name == model_name,
+        MLOutput.created_at >= start,
+        MLOutput.created_at < end,
+    ]
+    where, headers = _paginate(
+        request, db, where, limit, cursor, start=start.isoformat(), end=end.isoformat(),
+    )
+
+    stmt = (
+        select(*PREDICTION_COLUMNS)
+        .where(*where)
+        .order_by(MLOutput.created_at, MLOutput.id)
+    )
+    return _stream(db, stmt, format, headers)
+
+
+@router.get(
+    "/requests/{request_id}",
+    status_code=status.HTTP_200_OK,
+    summary="Prédictions d'une requête /predict",
+    description=(
+        "Prédictions produites par un appel à `/predict` (en-tête `X-Request-ID`), "
+        "via l'index `ix_ml_outputs_request_created`.\n\n"
+        "**Notes**\n"
+        "- Pagination par curseur, comme `/predictions` : au plus `limit` lignes, page suivante "
+        "dans l'en-tête `Link` (`rel=\"next\"`).\n"
+    ),
+    responses={
+        200: {
+            "description": "Flux NDJSON ou fichier Parquet.",
+            "content": {MEDIA_TYPES["ndjson"]: {}, MEDIA_TYPES["parquet"]: {}},
+        },
+        400: {"description": "Curseur invalide."},
+    },
+)
+def get_request_predictions(
+    request: Request,
+    request_id: str,
+    limit: int = Query(100_000, ge=1, le=1_000_000, description="Nombre maximal de lignes."),
+    cursor: Optional[str] = Query(None, description="Curseur de page, issu de l'en-tête `Link`."),
+    format: Literal["ndjson", "parquet"] = _FORMAT,
+    db: Session = Depends(get_db),
+) -> StreamingResponse:
+    where, headers = _paginate(request, db, [MLOutput.request_id == request_id], limit, cursor)
+    stmt = (
+        select(*PREDICTION_COLUMNS)
+        .where(*where)
+        .order_by(MLOutput.created_at, MLOutput.id)
+    )
+    return _stream(db, stmt, format, headers)
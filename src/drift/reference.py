@@ -0,0 +1,165 @@
+"""Profil de référence compact (baseline de drift) construit depuis les données d'entraînement.
+
+Usage :
+    python -m src.drift.reference data/application_train.csv lgbm_vanilla
+
+Écrit ``artifacts/<model>.profile.json`` à côté de ``<model>.joblib``.
+"""
+import argparse
+import hashlib
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.drift.sketch import (
+    CATEGORICAL_FEATURES,
+    NUMERIC_FEATURES,
+    sketch_frame,
+)
+
+PROFILE_FORMAT = 1
+N_QUANTILE_BINS = 10
+MAX_CATEGORIES = 50
+OTHER_CATEGORY = "__other__"
+
+
+def profile_filename(model_name: str) -> str:
+    return f"{model_name}.profile.json"
+
+
+def _numeric_profile(s: pd.Series) -> dict:
+    x = pd.to_numeric(s, errors="coerce").to_numpy(dtype=float)
+    present = x[~np.isnan(x)]
+    profile = {
+        "count": int(len(x)),
+        "null_count": int(len(x) - len(present)),
+    }
+    if not len(present):
+        return profile
+
+    edges = np.unique(np.quantile(present, np.linspace(0, 1, N_QUANTILE_BINS + 1)))
+    if len(edges) > 1:
+        hist = np.histogram(present, bins=edges)[0]
+    else:
+        hist = [len(present)]
+    profile.update({
+        "min": float(present.min()),
+        "max": float(present.max()),
+        "median": float(np.median(present)),
+        "mean": float(present.mean()),
+        "std": float(present.std()),
+        "quantile_edges": edges.tolist(),
+        "quantile_hist": [int(c) for c in hist],
+    })
+    return profile
+
+
+def _categorical_profile(s: pd.Series) -> dict:
+    counts = s.dropna().astype(str).value_counts()
+    top = counts.iloc[:MAX_CATEGORIES]
+    frequencies = {str(k): int(v) for k, v in top.items()}
+    other = int(counts.iloc[MAX_CATEGORIES:].sum())
+    if other:
+        frequencies[OTHER_CATEGORY] = other
+    return {
+        "count": int(len(s)),
+        "null_count": int(s.isna().sum()),
+        "mode": str(counts.index[0]) if len(counts) else None,
+        "frequencies": frequencies,
+    }
+
+
+def build_reference_profile(df: pd.DataFrame, model_name: str, source: str | None = None) -> dict:
+    features: dict[str, dict] = {}
+    for c in NUMERIC_FEATURES:
+        if c in df.columns:
+            features[c] = {"kind": "num", **_numeric_profile(df[c])}
+    for c in CATEGORICAL_FEATURES:
+        if c in df.columns:
+            features[c] = {"kind": "cat", **_categorical_profile(df[c])}
+
+    # Histogrammes dans les mêmes buckets que drift_feature_stats,
+    # pour comparer directement le trafic live au profil.
+    sketch = sketch_frame(df)
+    for feature, _, bucket, count in sketch.itertuples(index=False):
+        features[feature].setdefault("sketch", {})[bucket] = int(count)
+
+    body = json.dumps(features, sort_keys=True).encode()
+    return {
+        "format": PROFILE_FORMAT,
+        "model_name": model_name,
+        "version": hashlib.sha256(body).hexdigest()[:12],
+        "built_at": datetime.now(timezone.utc).isoformat(),
+        "source": source,
+        "n_rows": int(len(df)),
+        "missing_features": sorted(
+            c for c in (*NUMERIC_FEATURES, *CATEGORICAL_FEATURES) if c not in df.columns
+        ),
+        "features": features,
+    }
+
+
+def save_reference_profile(profile: dict, directory: Path) -> Path:
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / profile_filename(profile["model_name"])
+    path.write_text(json.dumps(profile, separators=(",", ":")))
+    return path
+
+
+def read_reference_profile(path: Path) -> dict:
+    profile = json.loads(Path(path).read_text())
+    if profile.get("format") != PROFILE_FORMAT:
+        raise ValueError(
+            f"Format de profil {profile.get('format')} non supporté (attendu {PROFILE_FORMAT})"
+        )
+    return profile
+
+
+def reference_histograms(profile: dict) -> tuple[dict[str, dict[str, int]], dict[str, str]]:
+    hists = {f: p.get("sketch", {}) for f, p in profile["features"].items()}
+    kinds = {f: p["kind"] for f, p in profile["features"].items()}
+    return hists, kinds
+
+
+def out_of_range(profile: dict, df: pd.DataFrame) -> pd.DataFrame:
+    """Masque booléen (lignes x features) : valeur hors [min, max] ou modalité inconnue."""
+    flags = {}
+    for feature, p in profile["features"].items():
+        if feature not in df.columns:
+            continue
+        if p["kind"] == "num":
+            if "min" not in p:
+                continue
+            x = pd.to_numeric(df[feature], errors="coerce")
+            flags[feature] = (x < p["min"]) | (x > p["max"])
+        elif OTHER_CATEGORY not in p["frequencies"]:
+            s = df[feature]
+            flags[feature] = s.notna() & ~s.astype(str).isin(p["frequencies"].keys())
+    return pd.DataFrame(flags, index=df.index)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Construit le profil de référence d'un modèle.")
+    parser.add_argument("csv", type=Path, help="Données d'entraînement (ex. application_train.csv)")
+    parser.add_argument("model_name")
+    parser.add_argument("--out", type=Path, default=None, help="Dossier de sortie (défaut: ARTIFACTS_DIR)")
+    args = parser.parse_args()
+
+    from src.model_loader import ARTIFACTS_DIR
+
+    df = pd.read_csv(args.csv)
+    profile = build_reference_profile(df, args.model_name, source=args.csv.name)
+    path = save_reference_profile(profile, args.out or ARTIFACTS_DIR)
+
+    print(f"Profil {profile['version']} ({profile['n_rows']} lignes, "
+          f"{len(profile['features'])} features) -> {path} "
+          f"[{path.stat().st_size / 1024:.1f} Ko]")
+    if profile["missing_features"]:
+        print(f"Features absentes des données : {', '.join(profile['missing_features'])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+from collections import defaultdict
+from datetime import datetime
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from src.drift.sketch import NULL_BUCKET
+from src.models.drift_stats import DriftFeatureStat
+
+PSI_EPS = 1e-4
+PSI_ALERT = 0.2
+
+
+def load_histograms(
+    db: Session,
+    model_name: str,
+    start: datetime,
+    end: datetime,
+) -> tuple[dict[str, dict[str, int]], dict[str, str]]:
+    """Histogrammes fusionnés de ``[start, end)`` : {feature: {bucket: count}}, {feature: kind}."""
+    stmt = (
+        select(
+            DriftFeatureStat.feature,
+            DriftFeatureStat.kind,
+            DriftFeatureStat.bucket,
+            func.sum(DriftFeatureStat.count),
+        )
+        .where(
+            DriftFeatureStat.model_name == model_name,
+            DriftFeatureStat.window_start >= start,
+            DriftFeatureStat.window_start < end,
+        )
+        .group_by(DriftFeatureStat.feature, DriftFeatureStat.kind, DriftFeatureStat.bucket)
+    )
+
+    hists: dict[str, dict[str, int]] = defaultdict(dict)
+    kinds: dict[str, str] = {}
+    for feature, kind, bucket, count in db.execute(stmt):
+        hists[feature][bucket] = int(count)
+        kinds[feature] = kind
+    return dict(hists), kinds
+
+
+def psi(ref: dict[str, int], cur: dict[str, int]) -> float:
+    keys = sorted(set(ref) | set(cur))
+    p = np.array([ref.get(k, 0) for k in keys], dtype=float)
+    q = np.array([cur.get(k, 0) for k in keys], dtype=float)
+    if p.sum() == 0 or q.sum() == 0:
+        return float("nan")
+    p = np.clip(p / p.sum(), PSI_EPS, None)
+    q = np.clip(q / q.sum(), PSI_EPS, None)
+    return float(np.sum((q - p) * np.log(q / p)))
+
+
+def ks_statistic(ref: dict[str, int], cur: dict[str, int]) -> float:
+    """KS sur histogrammes (buckets numériques ordonnés, nulls exclus)."""
+    keys = sorted({int(k) for k in (*ref, *cur) if k != NULL_BUCKET})
+    if not keys:
+        return float("nan")
+    p = np.array([ref.get(str(k), 0) for k in keys], dtype=float)
+    q = np.array([cur.get(str(k), 0) for k in keys], dtype=float)
+    if p.sum() == 0 or q.sum() == 0:
+        return float("nan")
+    return float(np.max(np.abs(np.cumsum(p) / p.sum() - np.cumsum(q) / q.sum())))
+
+
+def _null_rate(hist: dict[str, int]) -> float | None:
+    total = sum(hist.values())
+    return hist.get(NULL_BUCKET, 0) / total if total else None
+
+
+def _nan_to_none(x: float) -> float | None:
+    return None if np.isnan(x) else round(x, 6)
+
+
+def drift_scores(
+    ref_hists: dict[str, dict[str, int]],
+    cur_hists: dict[str, dict[str, int]],
+    kinds: dict[str, str],
+) -> list[dict]:
+    scores = []
+    for feature in sorted(set(ref_hists) & set(cur_hists)):
+        ref, cur = ref_hists[feature], cur_hists[feature]
+        value = psi(ref, cur)
+        scores.append({
+            "feature": feature,
+            "kind": kinds.get(feature, "num"),
+            "n_reference": sum(ref.values()),
+            "n_current": sum(cur.values()),
+            "null_rate_reference": _null_rate(ref),
+            "null_rate_current": _null_rate(cur),
+            "psi": _nan_to_none(value),
+            "ks": _nan_to_none(ks_statistic(ref, cur)) if kinds.get(feature) == "num" else None,
+            "drifted": bool(value >= PSI_ALERT),
+        })
+    scores.sort(key=lambda s: -(s["psi"] or 0.0))
+    return scores
@@ -0,0 +1,130 @@
+from datetime import datetime, timedelta
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from sqlalchemy.orm import Session
+
+from src.models.drift_stats import DriftFeatureStat
+from src.schemas.ModelFeatures import ModelFeatures
+
+WINDOW = timedelta(hours=1)
+
+NULL_BUCKET = "__null__"
+
+# Buckets fixes, indépendants des données : pas linéaire de 1/20 sur [-1, 1]
+# (ratios, EXT_SOURCE_*, *_AVG), puis 4 buckets par doublement au-delà
+# (montants, DAYS_*). L'index est monotone en x, ce qui permet le KS.
+LINEAR_STEPS = 20
+LOG_STEPS = 4
+MAX_BUCKET = 200
+
+IGNORED_FEATURES = {"SK_ID_CURR"}
+
+CATEGORICAL_FEATURES = [
+    name for name, field in ModelFeatures.model_fields.items()
+    if field.annotation == Optional[str]
+]
+NUMERIC_FEATURES = [
+    name for name in ModelFeatures.model_fields
+    if name not in CATEGORICAL_FEATURES and name not in IGNORED_FEATURES
+]
+
+
+def window_start(ts: datetime) -> datetime:
+    return ts.replace(minute=0, second=0, microsecond=0)
+
+
+def numeric_buckets(values: np.ndarray) -> np.ndarray:
+    x = np.asarray(values, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        linear = np.floor(x * LINEAR_STEPS)
+        log = np.sign(x) * (LINEAR_STEPS + 1 + np.floor(LOG_STEPS * np.log2(np.abs(x))))
+    buckets = np.where(np.abs(x) <= 1, linear, log)
+    return np.clip(buckets, -MAX_BUCKET, MAX_BUCKET)
+
+
+def sketch_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Histogrammes d'un batch au format long : feature, kind, bucket, count."""
+    parts = []
+    n = len(df)
+
+    num_cols = [c for c in NUMERIC_FEATURES if c in df.columns]
+    if num_cols and n:
+        values = df[num_cols].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+        buckets = numeric_buckets(values)
+        keys = np.where(
+            np.isnan(buckets),
+            NULL_BUCKET,
+            np.nan_to_num(buckets).astype(np.int64).astype(str),
+        )
+        parts.append(pd.DataFrame({
+            "feature": np.tile(num_cols, n),
+            "kind": "num",
+            "bucket": keys.ravel(),
+        }))
+
+    cat_cols = [c for c in CATEGORICAL_FEATURES if c in df.columns]
+    if cat_cols and n:
+        cats = df[cat_cols].astype(object)
+        keys = cats.where(cats.notna(), NULL_BUCKET).astype(str).to_numpy()
+        parts.append(pd.DataFrame({
+            "feature": np.tile(cat_cols, n),
+            "kind": "cat",
+            "bucket": keys.ravel(),
+        }))
+
+    if not parts:
+        return pd.DataFrame(columns=["feature", "kind", "bucket", "count"])
+
+    return (
+        pd.concat(parts, ignore_index=True)
+          .groupby(["feature", "kind", "bucket"], sort=True)
+          .size()
+          .reset_index(name="count")
+    )
+
+
+def _upsert_statement(db: Session):
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise NotImplementedError(f"Upsert non supporté pour le dialecte '{dialect}'")
+
+    stmt = insert(DriftFeatureStat)
+    return stmt.on_conflict_do_update(
+        index_elements=["model_name", "window_start", "feature", "bucket"],
+        set_={"count": DriftFeatureStat.count + stmt.excluded["count"]},
+    )
+
+
+def record_feature_stats(
+    db: Session,
+    model_name: str,
+    df: pd.DataFrame,
+    ts: datetime,
+) -> int:
+    """Incrémente les sketches de la fenêtre contenant ``ts``. Ne commit pas."""
+    hist = sketch_frame(df)
+    if hist.empty:
+        return 0
+
+    start = window_start(ts)
+    # Lignes triées par clé (groupby sort=True) : ordre de verrouillage stable
+    # entre requêtes concurrentes, pas de deadlock sur l'upsert.
+    rows = [
+        {
+            "model_name": model_name,
+            "window_start": start,
+            "feature": feature,
+            "kind": kind,
+            "bucket": bucket,
+            "count": int(count),
+        }
+        for feature, kind, bucket, count in hist.itertuples(index=False)
+    ]
+    db.execute(_upsert_statement(db), rows)
+    return len(rows)
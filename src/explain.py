@@ -0,0 +1,137 @@
+"""Explications SHAP des prédictions (modèles à base d'arbres).
+
+Le ``TreeExplainer`` est construit une seule fois par modèle chargé et rangé
+sur l'objet modèle lui-même : quand ``load_model`` recharge une autre
+version, l'explainer est reconstruit avec elle.
+
+Les contributions sont calculées pour tout le lot en un appel, dans l'espace
+des features transformées (sortie de l'étape ``preprocessing``), puis seules
+les ``top_k`` plus fortes en valeur absolue sont gardées par ligne.
+"""
+import os
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from src.models.ml_explanation import MLExplanation
+
+EXPLAIN_TOP_K = int(os.getenv("EXPLAIN_TOP_K", "5"))
+
+_ATTR = "_shap_explainer"
+_lock = threading.Lock()
+
+
+class ExplainerUnavailable(Exception):
+    pass
+
+
+@dataclass
+class ModelExplainer:
+    preprocess: Any | None
+    explainer: Any
+    feature_names: list[str] | None
+
+    def contributions(self, X: pd.DataFrame) -> tuple[np.ndarray, float, list[str]]:
+        """(contributions (n, f) pour la classe 1, valeur de base, noms des features)."""
+        Xt = self.preprocess.transform(X) if self.preprocess is not None else X
+        if hasattr(Xt, "toarray"):
+            Xt = Xt.toarray()
+        names = self.feature_names or list(getattr(Xt, "columns", range(np.shape(Xt)[1])))
+
+        values = self.explainer.shap_values(Xt)
+        base = self.explainer.expected_value
+        if isinstance(values, list):
+            values = values[1]
+        values = np.asarray(values)
+        if values.ndim == 3:
+            values = values[:, :, 1]
+        base = np.ravel(base)
+        return values, float(base[-1]), [str(n) for n in names]
+
+
+def _build(model) -> ModelExplainer:
+    import shap
+
+    steps = getattr(model, "steps", None)
+    estimator = steps[-1][1] if steps else model
+    preprocess = model[:-1] if steps and len(steps) > 1 else None
+
+    try:
+        explainer = shap.TreeExplainer(estimator)
+    except Exception as e:
+        raise ExplainerUnavailable(
+            f"Explications SHAP indisponibles pour {type(estimator).__name__}: {e}"
+        ) from e
+
+    names = None
+    if preprocess is not None and hasattr(preprocess, "get_feature_names_out"):
+        try:
+            names = list(preprocess.get_feature_names_out())
+        except Exception:
+            names = None
+    return ModelExplainer(preprocess, explainer, names)
+
+
+def get_explainer(model) -> ModelExplainer:
+    explainer = getattr(model, _ATTR, None)
+    if explainer is None:
+        with _lock:
+            explainer = getattr(model, _ATTR, None)
+            if explainer is None:
+                explainer = _build(model)
+                setattr(model, _ATTR, explainer)
+    return explainer
+
+
+def top_contributions(model, X: pd.DataFrame, top_k: int = EXPLAIN_TOP_K) -> tuple[float, list[list[dict]]]:
+    """Valeur de base et, par ligne, les ``top_k`` contributions triées par |valeur|."""
+    values, base, names = get_explainer(model).contributions(X)
+    k = min(top_k, values.shape[1])
+    if k == 0:
+        return base, [[] for _ in range(len(values))]
+
+    idx = np.argpartition(-np.abs(values), k - 1, axis=1)[:, :k]
+    top = np.take_along_axis(values, idx, axis=1)
+    order = np.argsort(-np.abs(top), axis=1)
+    idx = np.take_along_axis(idx, order, axis=1)
+    top = np.take_along_axis(top, order, axis=1)
+
+    return base, [
+        [{"feature": names[j], "contribution": float(c)} for j, c in zip(row_idx, row_val)]
+        for row_idx, row_val in zip(idx, top)
+    ]
+
+
+def store_explanations(
+    engine: Engine,
+    model,
+    X: pd.DataFrame,
+    input_ids: list,
+    model_name: str,
+    created_at: datetime,
+    top_k: int = EXPLAIN_TOP_K,
+) -> None:
+    """Tâche de fond de ``/predict?explain=background``."""
+    try:
+        base, contributions = top_contributions(model, X, top_k)
+        with Session(engine) as db:
+            db.execute(insert(MLExplanation), [
+                {
+                    "input_id": input_id,
+                    "created_at": created_at,
+                    "model_name": model_name,
+                    "base_value": base,
+                    "contributions": contribs,
+                }
+                for input_id, contribs in zip(input_ids, contributions)
+            ])
+            db.commit()
+    except Exception as e:
+        print(f"[ERROR] Explications SHAP: {e}")
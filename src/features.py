@@ -1,6 +1,29 @@
 import pandas as pd
 import numpy as np
 
+# À incrémenter à chaque changement de compute_features : les features non
+# stockées (FEATURE_STORAGE=lazy) sont recalculées avec la version enregistrée.
+FEATURE_PIPELINE_VERSION = "1"
+
+TO_DROP = [
+    'COMMONAREA_MODE', 'COMMONAREA_MEDI',
+    'NONLIVINGAPARTMENTS_MODE', 'NONLIVINGAPARTMENTS_MEDI',
+    'LIVINGAPARTMENTS_MODE', 'LIVINGAPARTMENTS_MEDI',
+    'FLOORSMIN_MODE', 'FLOORSMIN_MEDI',
+    'YEARS_BUILD_MODE', 'YEARS_BUILD_MEDI',
+    'LANDAREA_MODE', 'LANDAREA_MEDI',
+    'BASEMENTAREA_MODE', 'BASEMENTAREA_MEDI',
+    'ELEVATORS_MODE', 'ELEVATORS_MEDI'
+]
+
+ISNA_COLS = [
+    'EXT_SOURCE_1', 'EXT_SOURCE_2', 'EXT_SOURCE_3', 'OWN_CAR_AGE',
+    'COMMONAREA_AVG', 'NONLIVINGAPARTMENTS_AVG', 'LIVINGAPARTMENTS_AVG',
+    'FLOORSMIN_AVG', 'YEARS_BUILD_AVG', 'LANDAREA_AVG', 'BASEMENTAREA_AVG',
+    'NONLIVINGAREA_AVG', 'ELEVATORS_AVG', 'FONDKAPREMONT_MODE'
+]
+
+
 def safe_div(a, b):
     return np.where(b == 0, 0, a / b)
 
@@ -12,25 +35,9 @@ def compute_features(df: pd.DataFrame) -> pd.DataFrame:
     if 'DAYS_EMPLOYED' in df.columns:
         df['DAYS_EMPLOYED'] = df['DAYS_EMPLOYED'].replace(365243, np.nan)
     
-    to_drop = [
-        'COMMONAREA_MODE', 'COMMONAREA_MEDI',
-        'NONLIVINGAPARTMENTS_MODE', 'NONLIVINGAPARTMENTS_MEDI',
-        'LIVINGAPARTMENTS_MODE', 'LIVINGAPARTMENTS_MEDI',
-        'FLOORSMIN_MODE', 'FLOORSMIN_MEDI',
-        'YEARS_BUILD_MODE', 'YEARS_BUILD_MEDI',
-        'LANDAREA_MODE', 'LANDAREA_MEDI',
-        'BASEMENTAREA_MODE', 'BASEMENTAREA_MEDI',
-        'ELEVATORS_MODE', 'ELEVATORS_MEDI'
-    ]
-    df = df.drop(columns=[c for c in to_drop if c in df.columns])
-    
-    isna_cols = [
-        'EXT_SOURCE_1', 'EXT_SOURCE_2', 'EXT_SOURCE_3', 'OWN_CAR_AGE',
-        'COMMONAREA_AVG', 'NONLIVINGAPARTMENTS_AVG', 'LIVINGAPARTMENTS_AVG',
-        'FLOORSMIN_AVG', 'YEARS_BUILD_AVG', 'LANDAREA_AVG', 'BASEMENTAREA_AVG',
-        'NONLIVINGAREA_AVG', 'ELEVATORS_AVG', 'FONDKAPREMONT_MODE'
-    ]
-    for c in isna_cols:
+    df = df.drop(columns=[c for c in TO_DROP if c in df.columns])
+    
+    for c in ISNA_COLS:
         if c in df.columns:
             df[c + "_ISNA"] = df[c].isna().astype(int)
     
@@ -60,4 +67,19 @@ def compute_features(df: pd.DataFrame) -> pd.DataFrame:
             fill_val = "Unknown"
         df[c] = df[c].fillna(fill_val)
     
-    return df
\ No newline at end of file
+    return df
+
+
+FEATURE_PIPELINES = {
+    "1": compute_features,
+}
+
+
+def rebuild_features(raw: pd.DataFrame, version: str) -> pd.DataFrame:
+    if version not in FEATURE_PIPELINES:
+        raise ValueError(f"Version de pipeline de features inconnue: {version}")
+    try:
+        return FEATURE_PIPELINES[version](raw)
+    except Exception:
+        # Même repli que batch_predict : le modèle a reçu les données brutes.
+        return raw.copy()
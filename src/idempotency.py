@@ -0,0 +1,118 @@
+"""Clés d'idempotence de ``/predict`` (en-tête ``Idempotency-Key``).
+
+La clé devient le ``request_id`` des lignes ``ml_outputs``. Une requête déjà
+terminée est resservie depuis ``ml_outputs`` (``ix_ml_outputs_request_created``,
+fenêtre de ``IDEMPOTENCY_TTL_S``) sans recalcul. Pendant le calcul, la clé est
+réservée dans ``idempotency_claims`` : un doublon concurrent, sur ce worker ou
+un autre, attend la fin de la première requête en relisant la réservation.
+Une réservation plus vieille que ``IDEMPOTENCY_STALE_S`` (worker tombé) est reprise.
+
+L'empreinte des entrées (``inputs_fingerprint``) est stockée dans
+``ml_outputs.meta`` : la même clé avec d'autres entrées est refusée (422)
+au lieu de resservir les anciennes prédictions.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from src.config.db import run_db
+from src.models.idempotency import IdempotencyClaim
+from src.models.ml_output import MLOutput
+
+IDEMPOTENCY_TTL_S = float(os.getenv("IDEMPOTENCY_TTL_S", "86400"))
+IDEMPOTENCY_WAIT_S = float(os.getenv("IDEMPOTENCY_WAIT_S", "60"))
+IDEMPOTENCY_STALE_S = float(os.getenv("IDEMPOTENCY_STALE_S", "600"))
+IDEMPOTENCY_POLL_S = 0.1
+
+
+class IdempotencyTimeout(Exception):
+    """La requête d'origine est toujours en cours après ``IDEMPOTENCY_WAIT_S``."""
+
+
+def inputs_fingerprint(inputs) -> str:
+    """Empreinte des entrées brutes, indépendante de l'ordre des clés JSON."""
+    raw = json.dumps(inputs, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+
+def stored_results(db: Session, key: str) -> list:
+    """Sorties déjà enregistrées pour ``key``, dans l'ordre des entrées."""
+    since = datetime.now(timezone.utc) - timedelta(seconds=IDEMPOTENCY_TTL_S)
+    rows = db.execute(
+        select(
+            MLOutput.model_name,
+            MLOutput.prediction,
+            MLOutput.prob,
+            MLOutput.proba_defaut,
+            MLOutput.proba_solvable,
+            MLOutput.meta,
+        )
+        .where(MLOutput.request_id == key, MLOutput.created_at >= since)
+    ).all()
+    db.rollback()
+    return sorted(rows, key=lambda r: (r.meta or {}).get("row", 0))
+
+
+def _insert_ignore(db: Session):
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise NotImplementedError(f"Insert idempotent non supporté pour le dialecte '{dialect}'")
+    return insert(IdempotencyClaim).on_conflict_do_nothing(index_elements=["key"])
+
+
+def try_claim(db: Session, key: str) -> bool:
+    now = datetime.now(timezone.utc)
+    # Réservation abandonnée (worker tombé pendant le calcul) : on la reprend.
+    db.execute(
+        delete(IdempotencyClaim).where(
+            IdempotencyClaim.key == key,
+            IdempotencyClaim.created_at < now - timedelta(seconds=IDEMPOTENCY_STALE_S),
+        )
+    )
+    claimed = db.execute(
+        _insert_ignore(db)
+        .values(key=key, created_at=now)
+        .returning(IdempotencyClaim.key)
+    ).scalar_one_or_none() is not None
+    db.commit()
+    return claimed
+
+
+def release_claim(db: Session, key: str) -> None:
+    db.execute(delete(IdempotencyClaim).where(IdempotencyClaim.key == key))
+    db.commit()
+
+
+async def acquire(adb, db: Session, key: str) -> list | None:
+    """Réserve ``key`` (renvoie ``None``) ou renvoie les sorties déjà enregistrées.
+
+    Si une autre requête tient la clé, attend qu'elle se termine. L'appelant
+    qui obtient ``None`` doit appeler ``release_claim`` en fin de requête.
+    """
+    deadline = time.monotonic() + IDEMPOTENCY_WAIT_S
+    while True:
+        rows = await run_db(adb, db, stored_results, key)
+        if rows:
+            return rows
+
+        if await run_db(adb, db, try_claim, key):
+            # La requête d'origine a pu se terminer entre les deux lectures.
+            rows = await run_db(adb, db, stored_results, key)
+            if rows:
+                await run_db(adb, db, release_claim, key)
+                return rows
+            return None
+
+        if time.monotonic() > deadline:
+            raise IdempotencyTimeout(key)
+        await asyncio.sleep(IDEMPOTENCY_POLL_S)
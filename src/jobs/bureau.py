@@ -0,0 +1,28 @@
+"""Reconstruit le store des agrégats bureau (``nb_loans``, ``sum_debt``).
+
+    python -m src.jobs.bureau --input data/bureau.csv
+
+La nouvelle version devient active atomiquement ; les workers la chargent à
+leur prochaine vérification (``BUREAU_STORE_CHECK_S``).
+"""
+import argparse
+import time
+from pathlib import Path
+
+from src.storage.bureau_store import BUREAU_STORE_DIR, aggregate_bureau, build_store
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reconstruit le store des agrégats bureau par SK_ID_CURR.")
+    parser.add_argument("--input", type=Path, required=True, help="bureau.csv")
+    parser.add_argument("--output-dir", type=Path, default=BUREAU_STORE_DIR)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    agg = aggregate_bureau(args.input)
+    version = build_store(agg, args.output_dir)
+    print(f"Store bureau {version} : {len(agg)} clients ({time.perf_counter() - start:.1f} s) -> {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
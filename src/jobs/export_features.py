@@ -0,0 +1,73 @@
+"""Export Parquet des features recalculées depuis ``raw_data``.
+
+    python -m src.jobs.export_features --model lgbm_v1 --start 2026-10-01 --end 2026-11-01 \\
+        --output exports/lgbm_v1_2026_10.parquet
+
+Utile en ``FEATURE_STORAGE=lazy`` (features non stockées), mais fonctionne
+quel que soit le mode : seules ``raw_data`` et la version du pipeline sont lues.
+Le fichier suit le schéma typé de l'archive Parquet (``archive_schema``).
+"""
+import argparse
+from datetime import datetime, timezone
+from pathlib import Path
+
+from sqlalchemy.engine import Engine
+
+from src.storage.feature_archive import archive_schema, typed_feature_frame
+from src.storage.feature_rebuild import REBUILD_CHUNK_ROWS, iter_rebuilt_features
+
+
+def export_features(
+    engine: Engine,
+    model_name: str,
+    output: Path,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    chunk_rows: int = REBUILD_CHUNK_ROWS,
+) -> int:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp = output.with_name(f".{output.name}.tmp")
+
+    rows = 0
+    with pq.ParquetWriter(tmp, archive_schema(), compression="zstd") as writer:
+        for X in iter_rebuilt_features(engine, model_name, start, end, chunk_rows):
+            frame = typed_feature_frame(
+                X,
+                input_id=X["input_id"].astype(str),
+                created_at=X["created_at"],
+            )
+            writer.write_table(
+                pa.Table.from_pandas(frame, schema=archive_schema(), preserve_index=False)
+            )
+            rows += len(frame)
+
+    tmp.rename(output)
+    return rows
+
+
+def _utc(value: str) -> datetime:
+    dt = datetime.fromisoformat(value)
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exporte les features recalculées en Parquet.")
+    parser.add_argument("--model", required=True)
+    parser.add_argument("--output", type=Path, required=True)
+    parser.add_argument("--start", type=_utc, default=None)
+    parser.add_argument("--end", type=_utc, default=None)
+    parser.add_argument("--chunk-rows", type=int, default=REBUILD_CHUNK_ROWS)
+    args = parser.parse_args()
+
+    from src.config.db import engine
+
+    rows = export_features(engine, args.model, args.output, args.start, args.end, args.chunk_rows)
+    print(f"{rows} ligne(s) exportée(s) vers {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""Maintenance des partitions mensuelles (``created_at``).
+
+    python -m src.jobs.partitions ensure --months-ahead 3
+    python -m src.jobs.partitions retention --keep-months 6 --mode archive --archive-dir archive/db
+
+L'API crée aussi les partitions à venir au démarrage puis toutes les
+``PARTITION_CHECK_INTERVAL_S`` (``partition_loop``). Il n'y a pas de
+partition DEFAULT : sans cela, un worker resté en vie plus de
+``PARTITION_MONTHS_AHEAD`` mois ne pourrait plus écrire.
+
+La rétention opère par partition entière (DETACH / DROP), jamais par DELETE.
+Un même mois est traité sur toutes les tables pour garder `ml_outputs` et
+`ml_inputs` cohérents (plus de FK entre elles).
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import uuid
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Literal
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+PARTITIONED_TABLES = [
+    "ml_inputs", "ml_outputs", "ml_input_features", "ml_explanations", "profiling_logs",
+]
+
+PARTITION_SUFFIX = re.compile(r"_p(\d{4})_(\d{2})$")
+
+ARCHIVE_CHUNK_ROWS = 50_000
+
+PARTITION_MONTHS_AHEAD = int(os.getenv("PARTITION_MONTHS_AHEAD", "3"))
+PARTITION_CHECK_INTERVAL_S = float(os.getenv("PARTITION_CHECK_INTERVAL_S", "3600"))
+
+# pg_advisory_xact_lock : deux workers ne créent pas la même partition en même temps.
+_ENSURE_LOCK_KEY = 0x70617274
+
+
+def _add_months(d: date, months: int) -> date:
+    m = d.month - 1 + months
+    return date(d.year + m // 12, m % 12 + 1, 1)
+
+
+def ensure_partitions(
+    conn: Connection, months_ahead: int = PARTITION_MONTHS_AHEAD, tables=PARTITIONED_TABLES,
+) -> int:
+    today = datetime.now(timezone.utc).date()
+    conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _ENSURE_LOCK_KEY})
+    created = 0
+    for table in tables:
+        created += conn.execute(
+            text("SELECT ensure_monthly_partitions(:parent, :from_month, :to_month)"),
+            {
+                "parent": table,
+                "from_month": today.replace(day=1),
+                "to_month": _add_months(today, months_ahead),
+            },
+        ).scalar_one()
+    return created
+
+
+def ensure_once(engine: Engine) -> int:
+    with engine.begin() as conn:
+        return ensure_partitions(conn)
+
+
+async def partition_loop(engine: Engine, interval_s: float = PARTITION_CHECK_INTERVAL_S):
+    """Crée les partitions à venir toutes les ``interval_s`` (première passe : au démarrage)."""
+    while True:
+        await asyncio.sleep(interval_s)
+        try:
+            created = await asyncio.to_thread(ensure_once, engine)
+            if created:
+                print(f"[INFO] {created} partition(s) créée(s)")
+        except Exception as e:
+            print(f"[ERROR] Création des partitions: {e}")
+
+
+def _partition_month(name: str) -> date | None:
+    """Mois couvert par une partition ``<table>_pAAAA_MM`` ; ``None`` pour un autre nom."""
+    m = PARTITION_SUFFIX.search(name)
+    if not m:
+        return None
+    try:
+        return date(int(m.group(1)), int(m.group(2)), 1)
+    except ValueError:
+        return None
+
+
+def list_partitions(conn: Connection, table: str) -> list[tuple[str, date]]:
+    rows = conn.execute(
+        text("""
+            SELECT c.relname
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = CAST(:parent AS regclass)
+            ORDER BY c.relname
+        """),
+        {"parent": table},
+    ).scalars()
+
+    partitions = []
+    for name in rows:
+        month = _partition_month(name)
+        if month is not None:
+            partitions.append((name, month))
+    return partitions
+
+
+def _jsonable(v):
+    if isinstance(v, (dict, list)):
+        return json.dumps(v)
+    if isinstance(v, uuid.UUID):
+        return str(v)
+    return v
+
+
+def archive_partition(engine: Engine, table: str, partition: str, archive_dir: Path) -> list[Path]:
+    """Exporte une partition en segments Parquet via un curseur serveur."""
+    import pandas as pd
+
+    directory = archive_dir / table / partition
+    directory.mkdir(parents=True, exist_ok=True)
+
+    paths = []
+    with engine.connect().execution_options(stream_results=True) as conn:
+        chunks = pd.read_sql_query(
+            text(f'SELECT * FROM "{partition}"'),
+            conn,
+            chunksize=ARCHIVE_CHUNK_ROWS,
+        )
+        for i, chunk in enumerate(chunks):
+            for col in chunk.select_dtypes(include="object").columns:
+                chunk[col] = chunk[col].map(_jsonable)
+            path = directory / f"part-{i:05d}.parquet"
+            chunk.to_parquet(path, index=False, compression="zstd")
+            paths.append(path)
+    return paths
+
+
+def apply_retention(
+    engine: Engine,
+    keep_months: int,
+    mode: Literal["detach", "drop", "archive"] = "detach",
+    archive_dir: Path | None = None,
+    tables=PARTITIONED_TABLES,
+) -> list[str]:
+    today = datetime.now(timezone.utc).date()
+    cutoff = _add_months(today.replace(day=1), -keep_months)
+    handled = []
+
+    for table in tables:
+        with engine.connect() as conn:
+            expired = [name for name, month in list_partitions(conn, table) if month < cutoff]
+
+        for partition in expired:
+            if mode == "archive":
+                paths = archive_partition(engine, table, partition, archive_dir)
+                print(f"[INFO] {partition} archivée ({len(paths)} segments)")
+
+            with engine.begin() as conn:
+                conn.execute(text(f'ALTER TABLE "{table}" DETACH PARTITION "{partition}"'))
+                if mode in ("drop", "archive"):
+                    conn.execute(text(f'DROP TABLE "{partition}"'))
+            handled.append(partition)
+
+    return handled
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Partitions mensuelles et rétention.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_ensure = sub.add_parser("ensure", help="Crée les partitions des mois à venir.")
+    p_ensure.add_argument("--months-ahead", type=int, default=PARTITION_MONTHS_AHEAD)
+
+    p_ret = sub.add_parser("retention", help="Détache/supprime/archive les vieilles partitions.")
+    p_ret.add_argument("--keep-months", type=int, required=True)
+    p_ret.add_argument("--mode", choices=["detach", "drop", "archive"], default="detach")
+    p_ret.add_argument("--archive-dir", type=Path, default=Path("archive/db"))
+    p_ret.add_argument("--table", action="append", choices=PARTITIONED_TABLES)
+
+    args = parser.parse_args()
+
+    from src.config.db import engine
+
+    if args.command == "ensure":
+        with engine.begin() as conn:
+            created = ensure_partitions(conn, args.months_ahead)
+        print(f"{created} partition(s) créée(s)")
+    else:
+        handled = apply_retention(
+            engine,
+            keep_months=args.keep_months,
+            mode=args.mode,
+            archive_dir=args.archive_dir,
+            tables=args.table or PARTITIONED_TABLES,
+        )
+        print(f"{len(handled)} partition(s) traitée(s) ({args.mode}) : {', '.join(handled)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""Re-scoring de l'historique ``ml_inputs.raw_data`` avec une nouvelle version de modèle.
+
+    python -m src.jobs.rescore --source-model best_model --model best_model_v2 --model-version 2026-10 \\
+        --start 2026-09-01 --workers 4
+
+Les entrées de ``--source-model`` sont lues par curseur serveur, par paquets
+d'environ ``--chunk-rows`` lignes qui ne coupent jamais une requête d'origine
+(l'imputation de ``compute_features`` dépend du lot, comme dans
+``src.storage.feature_rebuild``). Features et ``predict_proba`` tournent dans
+``--workers`` processus forkés après le chargement du modèle (partagé en
+copy-on-write).
+
+Les sorties sont écrites dans ``ml_outputs`` avec ``model_name`` /
+``model_version`` du nouveau modèle et ``request_id = "rescore-<run_id>"``
+(exclues des rollups) ; comparaison par ``input_id`` avec les sorties
+d'origine. Chaque paquet est écrit dans la même transaction que le
+checkpoint ``rescore_checkpoints`` (dernier ``(created_at, id)``) : relancer
+la même commande reprend après le dernier paquet validé.
+"""
+import argparse
+import multiprocessing
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+import numpy as np
+from sqlalchemy import insert, select, tuple_, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from src.models.ml_inputs import MLInput
+from src.models.ml_output import MLOutput
+from src.models.rescore import RescoreCheckpoint
+from src.storage.feature_rebuild import REBUILD_CHUNK_ROWS, iter_request_rows, rebuild_request, request_key
+
+RESCORE_REQUEST_PREFIX = "rescore-"
+
+# Modèle des processus de scoring : chargé par le parent avant le fork.
+_model = None
+
+
+def _score(n_rows: int, groups: list[tuple[list[int], str | None, list[dict]]]) -> np.ndarray:
+    """``predict_proba`` des lignes d'un paquet, requête d'origine par requête d'origine."""
+    probas = None
+    for positions, version, raw_data in groups:
+        p = np.asarray(_model.predict_proba(rebuild_request(raw_data, version)), dtype=np.float64)
+        if probas is None:
+            probas = np.empty((n_rows, p.shape[1]))
+        probas[positions] = p
+    return probas
+
+
+def _groups(rows: list) -> list[tuple[list[int], str | None, list[dict]]]:
+    by_request: dict[tuple, tuple[list[int], str | None, list[dict]]] = {}
+    for i, r in enumerate(rows):
+        positions, _, raw_data = by_request.setdefault(request_key(r), ([], r.feature_pipeline_version, []))
+        positions.append(i)
+        raw_data.append(r.raw_data)
+    return list(by_request.values())
+
+
+def _checkpoint(
+    engine: Engine, run_id: str, source_model: str, model_name: str, model_version: str,
+) -> RescoreCheckpoint:
+    now = datetime.now(timezone.utc)
+    with Session(engine, expire_on_commit=False) as db:
+        ck = db.get(RescoreCheckpoint, run_id)
+        if ck is None:
+            ck = RescoreCheckpoint(
+                run_id=run_id,
+                source_model=source_model,
+                model_name=model_name,
+                model_version=model_version,
+                rows_done=0,
+                started_at=now,
+                updated_at=now,
+            )
+            db.add(ck)
+        elif (ck.source_model, ck.model_name, ck.model_version) != (source_model, model_name, model_version):
+            raise ValueError(
+                f"Run '{run_id}' déjà utilisé pour {ck.source_model} -> {ck.model_name}@{ck.model_version}"
+            )
+        else:
+            ck.completed_at = None
+        db.commit()
+        return ck
+
+
+def _write(
+    engine: Engine,
+    ck: RescoreCheckpoint,
+    rows: list,
+    probas: np.ndarray,
+    classes: list[int],
+    threshold: float,
+) -> None:
+    now = datetime.now(timezone.utc)
+    request_id = f"{RESCORE_REQUEST_PREFIX}{ck.run_id}"
+    i_def, i_sol = classes.index(1), classes.index(0)
+    p_def, p_sol = probas[:, i_def], probas[:, i_sol]
+    defaut = p_def >= threshold
+    labels = np.where(defaut, "non_solvable", "solvable")
+    probs = np.where(defaut, p_def, p_sol)
+
+    outputs = [
+        {
+            "input_id": r.id,
+            "request_id": request_id,
+            "model_name": ck.model_name,
+            "model_version": ck.model_version,
+            "created_at": now,
+            "prediction": str(labels[i]),
+            "prob": float(probs[i]),
+            "proba_defaut": float(p_def[i]),
+            "proba_solvable": float(p_sol[i]),
+            "threshold": threshold,
+            "classes": classes,
+            "meta": {
+                "rescore": ck.run_id,
+                "source_model": ck.source_model,
+                "input_created_at": r.created_at.isoformat(),
+            },
+        }
+        for i, r in enumerate(rows)
+    ]
+
+    with engine.begin() as conn:
+        conn.execute(insert(MLOutput), outputs)
+        conn.execute(
+            update(RescoreCheckpoint)
+            .where(RescoreCheckpoint.run_id == ck.run_id)
+            .values(
+                last_created_at=rows[-1].created_at,
+                last_input_id=rows[-1].id,
+                rows_done=RescoreCheckpoint.rows_done + len(rows),
+                updated_at=now,
+            )
+        )
+    ck.last_created_at, ck.last_input_id = rows[-1].created_at, rows[-1].id
+    ck.rows_done += len(rows)
+
+
+def rescore(
+    engine: Engine,
+    model_name: str,
+    model_version: str,
+    source_model: str | None = None,
+    run_id: str | None = None,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    chunk_rows: int = REBUILD_CHUNK_ROWS,
+    workers: int = 1,
+) -> RescoreCheckpoint:
+    """Re-score les entrées de ``source_model`` (défaut : ``model_name``) ; reprend
+    après le checkpoint de ``run_id`` (défaut : ``<model_name>@<model_version>``)."""
+    global _model
+    from src.model_loader import load_model, load_threshold
+
+    source_model = source_model or model_name
+    run_id = run_id or f"{model_name}@{model_version}"
+    ck = _checkpoint(engine, run_id, source_model, model_name, model_version)
+
+    _model = load_model(model_name)
+    classes = [int(c) for c in getattr(_model, "classes_", [0, 1])]
+    threshold = load_threshold(model_name, model_version)
+
+    stmt = (
+        select(MLInput.id, MLInput.created_at, MLInput.request_id, MLInput.feature_pipeline_version, MLInput.raw_data)
+        .where(MLInput.model_name == source_model)
+        .order_by(MLInput.created_at, MLInput.id)
+    )
+    if start is not None:
+        stmt = stmt.where(MLInput.created_at >= start)
+    if end is not None:
+        stmt = stmt.where(MLInput.created_at < end)
+    if ck.last_created_at is not None:
+        # La borne simple sur created_at garde l'élagage des partitions.
+        stmt = stmt.where(
+            MLInput.created_at >= ck.last_created_at,
+            tuple_(MLInput.created_at, MLInput.id) > tuple_(ck.last_created_at, ck.last_input_id),
+        )
+
+    pool = (
+        ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("fork"))
+        if workers > 1 else None
+    )
+    # Paquets en vol bornés ; écriture (et checkpoint) dans l'ordre de lecture.
+    in_flight: deque = deque()
+
+    def drain(keep: int) -> None:
+        while len(in_flight) > keep:
+            rows, result = in_flight.popleft()
+            probas = result.result() if pool is not None else result
+            _write(engine, ck, rows, probas, classes, threshold)
+
+    try:
+        for rows in iter_request_rows(engine, stmt, chunk_rows):
+            groups = _groups(rows)
+            if pool is not None:
+                in_flight.append((rows, pool.submit(_score, len(rows), groups)))
+                drain(2 * workers)
+            else:
+                in_flight.append((rows, _score(len(rows), groups)))
+                drain(0)
+        drain(0)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    with engine.begin() as conn:
+        conn.execute(
+            update(RescoreCheckpoint)
+            .where(RescoreCheckpoint.run_id == run_id)
+            .values(completed_at=datetime.now(timezone.utc))
+        )
+    return ck
+
+
+def _utc(value: str) -> datetime:
+    dt = datetime.fromisoformat(value)
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-score l'historique ml_inputs avec une nouvelle version de modèle.")
+    parser.add_argument("--model", required=True, help="Modèle à utiliser (artefact <model>.joblib).")
+    parser.add_argument("--model-version", required=True)
+    parser.add_argument("--source-model", default=None, help="model_name des entrées à re-scorer (défaut : --model).")
+    parser.add_argument("--run-id", default=None, help="Identifiant de reprise (défaut : <model>@<version>).")
+    parser.add_argument("--start", type=_utc, default=None)
+    parser.add_argument("--end", type=_utc, default=None)
+    parser.add_argument("--chunk-rows", type=int, default=REBUILD_CHUNK_ROWS)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    from src.config.db import engine
+
+    begin = time.perf_counter()
+    ck = rescore(
+        engine, args.model, args.model_version, args.source_model, args.run_id,
+        args.start, args.end, args.chunk_rows, args.workers,
+    )
+    print(f"Re-scoring {ck.run_id} : {ck.rows_done} ligne(s) au total, "
+          f"dernière entrée {ck.last_created_at} ({time.perf_counter() - begin:.1f} s)")
+
+
+if __name__ == "__main__":
+    main()
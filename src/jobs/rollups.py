@@ -0,0 +1,180 @@
+"""Agrégats incrémentaux (minute / heure) pour les dashboards Grafana.
+
+    python -m src.jobs.rollups            # une passe
+    python -m src.jobs.rollups --loop 60  # en continu
+
+Chaque passe recalcule entièrement, dans Postgres, les buckets de
+`ml_outputs` et `profiling_logs` depuis la passe précédente (watermark) et
+sur les ``ROLLUP_LATE_S`` dernières secondes, et remplace les rollups
+existants de ces buckets. ``created_at`` est l'heure de début de la
+requête : une ligne validée plus tard (gros lot, écriture de profiling
+lente) est comptée par la passe suivante tant qu'elle arrive dans cette
+fenêtre. Le remplacement rend une passe idempotente, et le watermark est
+verrouillé : plusieurs workers peuvent lancer le job sans double comptage.
+"""
+import argparse
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from src.models.rollups import GRANULARITIES, LATENCY_BOUNDS_MS
+
+ROLLUP_INTERVAL_S = float(os.getenv("ROLLUP_INTERVAL_S", "60"))
+ROLLUP_LATE_S = float(os.getenv("ROLLUP_LATE_S", "3600"))
+
+_BUCKET_COLS = [f"lat_le_{b}" for b in LATENCY_BOUNDS_MS]
+
+
+def _bucket_counts(latency_expr: str) -> str:
+    return ",\n".join(
+        f"count(*) FILTER (WHERE {latency_expr} <= {b})" for b in LATENCY_BOUNDS_MS
+    )
+
+
+def _replace(cols: list[str]) -> str:
+    return ",\n".join(f"{c} = EXCLUDED.{c}" for c in cols)
+
+
+# Buckets entiers à partir de :since (NULL : tout l'historique).
+_WINDOW = """created_at >= COALESCE(date_trunc(:unit, CAST(:since AS timestamptz), 'UTC'), '-infinity')
+  AND created_at <= :upper"""
+
+
+PREDICTIONS_SQL = f"""
+INSERT INTO prediction_rollups (
+    granularity, bucket_start, model_name, label,
+    count, error_count, sum_proba_defaut, sum_latency_ms,
+    {", ".join(_BUCKET_COLS)}
+)
+SELECT
+    :granularity,
+    date_trunc(:unit, created_at, 'UTC'),
+    COALESCE(model_name, ''),
+    prediction,
+    count(*),
+    count(*) FILTER (WHERE error IS NOT NULL),
+    COALESCE(sum(proba_defaut), 0),
+    COALESCE(sum(latency_ms), 0),
+    {_bucket_counts("latency_ms")}
+FROM ml_outputs
+WHERE {_WINDOW}
+  -- Sorties de src.jobs.rescore : pas du trafic.
+  AND (request_id IS NULL OR request_id NOT LIKE 'rescore-%')
+GROUP BY 2, 3, 4
+ON CONFLICT (granularity, bucket_start, model_name, label) DO UPDATE SET
+{_replace(["count", "error_count", "sum_proba_defaut", "sum_latency_ms", *_BUCKET_COLS])}
+"""
+
+REQUESTS_SQL = f"""
+INSERT INTO request_rollups (
+    granularity, bucket_start, endpoint, method, model_name,
+    count, num_predictions, sum_total_ms, max_total_ms,
+    sum_preprocessing_ms, sum_inference_ms, sum_database_ms,
+    {", ".join(_BUCKET_COLS)}
+)
+SELECT
+    :granularity,
+    date_trunc(:unit, created_at, 'UTC'),
+    endpoint,
+    method,
+    COALESCE(model_name, ''),
+    count(*),
+    COALESCE(sum(num_predictions), 0),
+    sum(total_time_ms),
+    max(total_time_ms),
+    COALESCE(sum(time_preprocessing_ms), 0),
+    COALESCE(sum(time_inference_ms), 0),
+    COALESCE(sum(time_database_ms), 0),
+    {_bucket_counts("total_time_ms")}
+FROM profiling_logs
+WHERE {_WINDOW}
+GROUP BY 2, 3, 4, 5
+ON CONFLICT (granularity, bucket_start, endpoint, method, model_name) DO UPDATE SET
+{_replace([
+    "count", "num_predictions", "sum_total_ms", "max_total_ms",
+    "sum_preprocessing_ms", "sum_inference_ms", "sum_database_ms", *_BUCKET_COLS,
+])}
+"""
+
+SOURCES = {
+    "ml_outputs": PREDICTIONS_SQL,
+    "profiling_logs": REQUESTS_SQL,
+}
+
+
+def run_rollups(conn: Connection, late_s: float = ROLLUP_LATE_S) -> dict[str, int]:
+    """Une passe. À appeler dans une transaction (``engine.begin()``)."""
+    upper = datetime.now(timezone.utc)
+    window_start = upper - timedelta(seconds=late_s)
+    processed = {}
+
+    for source, sql in SOURCES.items():
+        conn.execute(
+            text("""
+                INSERT INTO rollup_watermarks (source, processed_until)
+                VALUES (:source, NULL)
+                ON CONFLICT (source) DO NOTHING
+            """),
+            {"source": source},
+        )
+        lower = conn.execute(
+            text("SELECT processed_until FROM rollup_watermarks WHERE source = :source FOR UPDATE"),
+            {"source": source},
+        ).scalar_one()
+
+        # Depuis la passe précédente (rattrapage après un arrêt) et au moins sur la fenêtre des retardataires.
+        since = None if lower is None else min(lower, window_start)
+
+        rowcount = 0
+        for unit, granularity in GRANULARITIES.items():
+            result = conn.execute(
+                text(sql),
+                {"granularity": granularity, "unit": unit, "since": since, "upper": upper},
+            )
+            rowcount += result.rowcount
+
+        conn.execute(
+            text("UPDATE rollup_watermarks SET processed_until = :upper WHERE source = :source"),
+            {"source": source, "upper": upper},
+        )
+        processed[source] = rowcount
+
+    return processed
+
+
+def run_once(engine: Engine) -> dict[str, int]:
+    with engine.begin() as conn:
+        return run_rollups(conn)
+
+
+async def rollup_loop(engine: Engine, interval_s: float = ROLLUP_INTERVAL_S):
+    while True:
+        try:
+            await asyncio.to_thread(run_once, engine)
+        except Exception as e:
+            print(f"[ERROR] Rollups: {e}")
+        await asyncio.sleep(interval_s)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Met à jour les rollups minute/heure.")
+    parser.add_argument("--loop", type=float, default=None, metavar="SECONDES")
+    args = parser.parse_args()
+
+    from src.config.db import engine
+
+    while True:
+        start = time.perf_counter()
+        processed = run_once(engine)
+        print(f"Rollups : {processed} ({(time.perf_counter() - start) * 1000:.0f} ms)")
+        if args.loop is None:
+            break
+        time.sleep(args.loop)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Temps de démarrage de l'API : détail des imports et délai jusqu'à la première réponse.
+
+    python -m src.jobs.startup_profile --runs 3 --budget-ms 3000
+
+Deux mesures, chacune dans un interpréteur neuf :
+
+- ``python -X importtime -c "import src.main"`` : temps total d'import, modules
+  les plus coûteux (cumulé) et temps propre agrégé par paquet de premier niveau ;
+- démarrage de ``uvicorn src.main:app`` jusqu'à la première réponse 200 de
+  ``GET /monitoring/admission`` (sans base ni modèle) : le « start-to-first-ready ».
+
+Le rapport est écrit en JSON (``artifacts/startup_profile.json`` par défaut).
+Code de sortie 1 si la médiane dépasse ``--budget-ms``.
+"""
+import argparse
+import json
+import os
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+STARTUP_BUDGET_MS = float(os.getenv("STARTUP_BUDGET_MS", "3000"))
+READY_PATH = "/monitoring/admission"
+READY_TIMEOUT_S = 60.0
+
+_IMPORTTIME = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+def parse_importtime(stderr: str) -> list[dict]:
+    rows = []
+    for line in stderr.splitlines():
+        m = _IMPORTTIME.match(line)
+        if m:
+            rows.append({
+                "module": m[4],
+                "self_ms": int(m[1]) / 1000,
+                "cumulative_ms": int(m[2]) / 1000,
+                "depth": len(m[3]) // 2,
+            })
+    return rows
+
+
+def import_breakdown(module: str = "src.main", top: int = 25) -> dict:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=False,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Import de {module} en échec :\n{proc.stderr[-2000:]}")
+    rows = parse_importtime(proc.stderr)
+
+    packages: dict[str, float] = {}
+    for r in rows:
+        package = r["module"].split(".")[0]
+        packages[package] = packages.get(package, 0.0) + r["self_ms"]
+
+    total = next((r["cumulative_ms"] for r in rows if r["module"] == module), None)
+    return {
+        "module": module,
+        "total_ms": total,
+        "top_modules": sorted(
+            ({k: r[k] for k in ("module", "cumulative_ms", "self_ms")} for r in rows),
+            key=lambda r: r["cumulative_ms"],
+            reverse=True,
+        )[:top],
+        "packages_self_ms": {
+            k: round(v, 1) for k, v in sorted(packages.items(), key=lambda kv: kv[1], reverse=True)[:top]
+        },
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def time_to_ready(app: str = "src.main:app") -> float:
+    """Millisecondes entre le lancement de uvicorn et la première réponse 200."""
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}{READY_PATH}"
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", app, "--port", str(port), "--log-level", "warning"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+    )
+    try:
+        while time.perf_counter() - start < READY_TIMEOUT_S:
+            if proc.poll() is not None:
+                raise RuntimeError(f"uvicorn arrêté avant d'être prêt :\n{proc.stderr.read().decode()[-2000:]}")
+            try:
+                with urllib.request.urlopen(url, timeout=1) as resp:
+                    if resp.status == 200:
+                        return (time.perf_counter() - start) * 1000
+            except OSError:
+                time.sleep(0.02)
+        raise TimeoutError(f"API non prête après {READY_TIMEOUT_S} s")
+    finally:
+        proc.terminate()
+        proc.wait(10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mesure le temps d'import et de démarrage de l'API.")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--budget-ms", type=float, default=STARTUP_BUDGET_MS)
+    parser.add_argument("--output", default="artifacts/startup_profile.json")
+    args = parser.parse_args()
+
+    imports = import_breakdown()
+    ready = [round(time_to_ready(), 1) for _ in range(args.runs)]
+    ready_ms = statistics.median(ready)
+
+    report = {
+        "python": sys.version.split()[0],
+        "imports": imports,
+        "ready_ms": ready,
+        "ready_median_ms": ready_ms,
+        "budget_ms": args.budget_ms,
+        "within_budget": ready_ms <= args.budget_ms,
+    }
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+
+    print(f"Import src.main : {imports['total_ms']:.0f} ms")
+    for r in imports["top_modules"][1:11]:
+        print(f"  {r['cumulative_ms']:8.1f} ms  {r['module']}")
+    print(f"Prêt en {ready_ms:.0f} ms (médiane de {ready}), budget {args.budget_ms:.0f} ms -> {output}")
+    if not report["within_budget"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,39 @@
 
+import asyncio
 import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 
 
 from src.controllers.home_controller import router as ml_home_router
 from src.controllers.predict_controller import router as predict_router
+from src.controllers.drift_controller import router as drift_router
+from src.controllers.predictions_controller import router as predictions_router
+from src.controllers.monitoring_controller import router as monitoring_router
 from src.middleware.profiling import ProfilingMiddleware
+from src.storage.feature_archive import parquet_archive
+from src.config.db import get_engine
+from src.jobs.partitions import PARTITION_CHECK_INTERVAL_S, ensure_once, partition_loop
+from src.jobs.rollups import ROLLUP_INTERVAL_S, rollup_loop
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    tasks = []
+    engine = get_engine()
+    if engine.dialect.name == "postgresql":
+        try:
+            ensure_once(engine)
+        except Exception as e:
+            print(f"[ERROR] Création des partitions: {e}")
+        # Puis périodiquement : un worker peut tourner plus de PARTITION_MONTHS_AHEAD mois.
+        tasks.append(asyncio.create_task(partition_loop(engine, PARTITION_CHECK_INTERVAL_S)))
+        if ROLLUP_INTERVAL_S > 0:
+            tasks.append(asyncio.create_task(rollup_loop(engine, ROLLUP_INTERVAL_S)))
+    yield
+    for task in tasks:
+        task.cancel()
+    parquet_archive.flush()
 
 
 app = FastAPI(title="ML API",
@@ -13,7 +41,13 @@ app = FastAPI(title="ML API",
 API d’inférence pour la prédiction de la solvabilité d’un prêt.
 - **/predict**: prédire un résultat selon le modèle
 - **/**: lister les modèles disponibles
-""", version="1.0.0")
+- **/drift/{model_name}**: scores de drift par feature
+- **/predictions**: historique des prédictions (NDJSON / Parquet)
+- **/monitoring/pool**: métriques du pool de connexions
+- **/monitoring/admission**: lignes en cours, rejets et attente du contrôle d'admission
+- **/monitoring/bureau**: version, chargement et latence du store des agrégats bureau
+- **/monitoring/flamegraph**: piles repliées agrégées des requêtes profilées
+""", version="1.0.0", lifespan=lifespan)
 
 PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "true").lower() == "true"
 
@@ -26,3 +60,9 @@ if PROFILING_ENABLED:
 app.include_router(ml_home_router)
 
 app.include_router(predict_router)
+
+app.include_router(drift_router)
+
+app.include_router(predictions_router)
+
+app.include_router(monitoring_router)
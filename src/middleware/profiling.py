@@ -1,40 +1,58 @@
+import asyncio
 import cProfile
 import pstats
+import random
 import time
-import psutil
 from fastapi import Request
 from starlette.middleware.base import BaseHTTPMiddleware
 from sqlalchemy.orm import Session
 
-from src.config.db import SessionLocal
+from src import alloc_profile, stack_profile
+from src.config.db import get_async_sessionmaker, get_sessionmaker
 from src.models.profiling import ProfilingLog
 
 
 class ProfilingMiddleware(BaseHTTPMiddleware):
 
-    def __init__(self, app, enabled: bool = False):
+    def __init__(
+        self,
+        app,
+        enabled: bool = False,
+        alloc_sample_rate: float = alloc_profile.PROFILING_ALLOC_SAMPLE_RATE,
+        stacks_sample_rate: float = stack_profile.PROFILING_STACKS_SAMPLE_RATE,
+    ):
         super().__init__(app)
         self.enabled = enabled
-        self.process = psutil.Process()
+        self.alloc_sample_rate = alloc_sample_rate
+        self.stacks_sample_rate = stacks_sample_rate
     
     async def dispatch(self, request: Request, call_next):
         if not self.enabled:
             return await call_next(request)
         
-        cpu_before = self.process.cpu_percent()
-        mem_before = self.process.memory_info().rss / 1024 / 1024
+        # Allocations tracées sur un échantillon de requêtes (tracemalloc ralentit tout le processus).
+        trace = None
+        if self.alloc_sample_rate > 0 and random.random() < self.alloc_sample_rate:
+            trace = alloc_profile.start()
+        
+        # Piles de tous les threads (cProfile ne voit que la boucle d'événements).
+        sampler = None
+        if self.stacks_sample_rate > 0 and random.random() < self.stacks_sample_rate:
+            sampler = stack_profile.start()
         
         profiler = cProfile.Profile()
         profiler.enable()
         
+        cpu_before = time.process_time()
         start_time = time.perf_counter()
-        response = await call_next(request)
-        total_time = (time.perf_counter() - start_time) * 1000
-        
-        profiler.disable()
-        
-        cpu_after = self.process.cpu_percent()
-        mem_after = self.process.memory_info().rss / 1024 / 1024
+        try:
+            response = await call_next(request)
+        finally:
+            total_time = (time.perf_counter() - start_time) * 1000
+            cpu_ms = (time.process_time() - cpu_before) * 1000
+            profiler.disable()
+            alloc = alloc_profile.stop(trace) if trace is not None else None
+            stacks = stack_profile.stop(sampler) if sampler is not None else None
         
         stats = pstats.Stats(profiler)
         
@@ -43,17 +61,21 @@ class ProfilingMiddleware(BaseHTTPMiddleware):
         
         ncalls_total, ncalls_pandas, ncalls_db = self._count_calls_by_category(stats)
         
-        self._save_to_database(
+        await self._save_to_database(
             endpoint=request.url.path,
             method=request.method,
+            # Posé par le contrôleur (request.state partagé avec le middleware).
+            model_name=getattr(request.state, "model_name", None),
             total_time_ms=total_time,
             top_functions=top_functions,
             timings=timings,
             ncalls_total=ncalls_total,
             ncalls_pandas=ncalls_pandas,
             ncalls_database=ncalls_db,
-            cpu_percent=(cpu_after - cpu_before),
-            memory_mb=(mem_after - mem_before),
+            # Temps CPU du processus rapporté à la durée de la requête (toutes requêtes confondues).
+            cpu_percent=100 * cpu_ms / total_time if total_time > 0 else None,
+            alloc=alloc,
+            full_profile=stack_profile.encode(stacks) if stacks else None,
         )
         
         return response
@@ -129,7 +151,7 @@ class ProfilingMiddleware(BaseHTTPMiddleware):
         
         return ncalls_total, ncalls_pandas, ncalls_db
     
-    def _save_to_database(
+    async def _save_to_database(
         self,
         endpoint: str,
         method: str,
@@ -139,32 +161,49 @@ class ProfilingMiddleware(BaseHTTPMiddleware):
         ncalls_total: int,
         ncalls_pandas: int,
         ncalls_database: int,
-        cpu_percent: float,
-        memory_mb: float,
+        cpu_percent: float | None,
+        alloc: dict | None = None,
+        model_name: str | None = None,
+        full_profile: str | None = None,
     ):
-        db: Session = SessionLocal()
-        try:
-            time_preprocessing = timings.get("preprocessing") or None
-            time_inference = timings.get("inference") or None
-            time_database = timings.get("database") or None
-            time_serialization = timings.get("serialization") or None
+        log = ProfilingLog(
+            endpoint=endpoint,
+            method=method,
+            model_name=model_name,
+            total_time_ms=total_time_ms,
+            time_preprocessing_ms=timings.get("preprocessing") or None,
+            time_inference_ms=timings.get("inference") or None,
+            time_database_ms=timings.get("database") or None,
+            time_serialization_ms=timings.get("serialization") or None,
+            top_functions=top_functions,
+            ncalls_total=ncalls_total,
+            ncalls_pandas=ncalls_pandas,
+            ncalls_database=ncalls_database,
+            cpu_percent=cpu_percent,
+            memory_mb=alloc["peak_mb"] if alloc else None,
+            alloc_stages=alloc["stages"] if alloc else None,
+            alloc_top=alloc["top"] if alloc else None,
+            full_profile=full_profile,
+        )
 
-            log = ProfilingLog(
-                endpoint=endpoint,
-                method=method,
-                total_time_ms=total_time_ms,
-                time_preprocessing_ms=time_preprocessing,
-                time_inference_ms=time_inference,
-                time_database_ms=time_database,
-                time_serialization_ms=time_serialization,
-                top_functions=top_functions,
-                ncalls_total=ncalls_total,
-                ncalls_pandas=ncalls_pandas,
-                ncalls_database=ncalls_database,
-                cpu_percent=cpu_percent,
-                memory_mb=memory_mb,
-            )
-            
+        # Engine async : l'écriture ne bloque ni la boucle ni un thread.
+        AsyncSessionLocal = get_async_sessionmaker()
+        if AsyncSessionLocal is None:
+            await asyncio.to_thread(self._save_sync, log)
+            return
+
+        async with AsyncSessionLocal() as db:
+            try:
+                db.add(log)
+                await db.commit()
+            except Exception:
+                import traceback
+                traceback.print_exc()
+                await db.rollback()
+
+    def _save_sync(self, log: ProfilingLog):
+        db: Session = get_sessionmaker()()
+        try:
             db.add(log)
             db.commit()
                         
@@ -1,9 +1,8 @@
 import os
+import time
 from functools import lru_cache
 from pathlib import Path
 from typing import Any, Literal
-from huggingface_hub import hf_hub_download
-import joblib
 
 HF_REPO_ID  = os.getenv("HF_REPO_ID",  "Marintosti/mlops2_models")
 HF_TOKEN    = os.getenv("HF_TOKEN")      
@@ -11,7 +10,12 @@ HF_TOKEN    = os.getenv("HF_TOKEN")
 ENV: Literal["dev", "test", "prod"] = os.getenv("APP_ENV", "dev").lower()
 ARTIFACTS_DIR = Path(os.getenv("ARTIFACTS_DIR", "artifacts"))
 
+# Modèles gardés en mémoire (LRU) ; ``src.server`` précharge au plus autant de modèles actifs.
+MODEL_CACHE_SIZE = int(os.getenv("MODEL_CACHE_SIZE", "1"))
+
 def _load_local(name: str) -> Any:
+    import joblib
+
     path = ARTIFACTS_DIR / f"{name}.joblib"
     if not path.exists():
         raise FileNotFoundError(
@@ -20,12 +24,15 @@ def _load_local(name: str) -> Any:
         
     return joblib.load(path)
 
-@lru_cache(maxsize=1)
+@lru_cache(maxsize=MODEL_CACHE_SIZE)
 def load_model(name) -> Any:
 
-    if ENV in ("dev"):
+    if ENV == "dev":
         return _load_local(name)
-     
+
+    import joblib
+    from huggingface_hub import hf_hub_download
+
     hf_path = hf_hub_download(
         repo_id=HF_REPO_ID,
         filename=f"{name}.joblib",
@@ -34,3 +41,83 @@ def load_model(name) -> Any:
     )
 
     return joblib.load(hf_path)
+
+
+@lru_cache(maxsize=8)
+def load_reference_profile(name) -> dict | None:
+    from src.drift.reference import profile_filename, read_reference_profile
+
+    filename = profile_filename(name)
+    try:
+        if ENV == "dev":
+            path = ARTIFACTS_DIR / filename
+        else:
+            from huggingface_hub import hf_hub_download
+
+            path = hf_hub_download(
+                repo_id=HF_REPO_ID,
+                filename=filename,
+                token=HF_TOKEN,
+                local_files_only=False,
+            )
+        return read_reference_profile(path)
+    except Exception as e:
+        # Absence mise en cache : pas de téléchargement retenté à chaque requête.
+        print(f"[WARN] Profil de référence '{filename}' indisponible: {e}")
+        return None
+
+
+DEFAULT_THRESHOLD = 0.5
+# Seuil absent : défaut servi sans nouvelle recherche (Hub) pendant ce délai.
+THRESHOLD_MISS_TTL_S = float(os.getenv("THRESHOLD_MISS_TTL_S", "300"))
+
+# (name, model_version) -> instant (monotonic) de la prochaine recherche.
+_threshold_misses: dict[tuple[str, str | None], float] = {}
+
+
+def threshold_filename(name: str, model_version: str | None = None) -> str:
+    """``<name>@<model_version>.threshold.json``, ``<name>.threshold.json`` sans version."""
+    return f"{name}@{model_version}.threshold.json" if model_version else f"{name}.threshold.json"
+
+
+@lru_cache(maxsize=8)
+def _read_threshold(name: str, model_version: str | None) -> float:
+    import json
+
+    filename = threshold_filename(name, model_version)
+    if ENV == "dev":
+        path = ARTIFACTS_DIR / filename
+    else:
+        from huggingface_hub import hf_hub_download
+
+        path = hf_hub_download(
+            repo_id=HF_REPO_ID,
+            filename=filename,
+            token=HF_TOKEN,
+            local_files_only=False,
+        )
+    with open(path) as f:
+        return float(json.load(f)["threshold"])
+
+
+def load_threshold(name: str, model_version: str | None = None) -> float:
+    """Seuil de décision de ``(name, model_version)``, 0.5 par défaut.
+
+    Fichier ``threshold_filename(name, model_version)``. Les seuils lus sont
+    mis en cache ; une absence l'est ``THRESHOLD_MISS_TTL_S`` secondes : pas de
+    téléchargement à chaque requête, et un artefact publié après coup est pris
+    en compte à l'expiration.
+    """
+    key = (name, model_version)
+    retry_at = _threshold_misses.get(key)
+    if retry_at is not None and time.monotonic() < retry_at:
+        return DEFAULT_THRESHOLD
+    try:
+        threshold = _read_threshold(name, model_version)
+    except Exception as e:
+        _threshold_misses[key] = time.monotonic() + THRESHOLD_MISS_TTL_S
+        filename = threshold_filename(name, model_version)
+        print(f"[WARN] Seuil '{filename}' indisponible, seuil par défaut {DEFAULT_THRESHOLD}: {e}")
+        return DEFAULT_THRESHOLD
+    _threshold_misses.pop(key, None)
+    return threshold
@@ -0,0 +1,73 @@
+"""Cache en mémoire du listing des modèles (``GET /``).
+
+Le listing est indexé par la version du registre (``ml_registry_version``,
+incrémentée par trigger sur ``ml_models``). La version est relue au plus
+toutes les ``MODEL_LIST_TTL_S`` secondes : entre deux lectures, un
+``If-None-Match`` identique répond 304 et les pages déjà sérialisées sont
+resservies sans requête SQL.
+"""
+import os
+import threading
+import time
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from src.models.ml import MLRegistryVersion
+
+MODEL_LIST_TTL_S = float(os.getenv("MODEL_LIST_TTL_S", "2"))
+MODEL_LIST_MAX_PAGES = 64
+
+
+class ModelListCache:
+
+    def __init__(self, ttl_s: float, max_pages: int):
+        self.ttl_s = ttl_s
+        self.max_pages = max_pages
+        self._lock = threading.Lock()
+        self._version: int | None = None
+        self._checked_at = float("-inf")
+        self._pages: dict[tuple, tuple[bytes, str | None]] = {}
+
+    def version(self, db: Session) -> int | None:
+        """Version du registre, ``None`` si la table n'existe pas (pas de cache)."""
+        with self._lock:
+            if time.monotonic() - self._checked_at < self.ttl_s:
+                return self._version
+
+        try:
+            version = db.execute(select(MLRegistryVersion.version)).scalar_one_or_none()
+        except Exception as e:
+            print(f"[WARN] Version du registre indisponible: {e}")
+            db.rollback()
+            version = None
+
+        with self._lock:
+            if version != self._version:
+                self._pages.clear()
+            self._version = version
+            self._checked_at = time.monotonic()
+        return version
+
+    def get(self, version: int, key: tuple) -> tuple[bytes, str | None] | None:
+        with self._lock:
+            if version != self._version:
+                return None
+            return self._pages.get(key)
+
+    def put(self, version: int, key: tuple, page: tuple[bytes, str | None]) -> None:
+        with self._lock:
+            if version != self._version:
+                return
+            if len(self._pages) >= self.max_pages:
+                self._pages.clear()
+            self._pages[key] = page
+
+    def clear(self) -> None:
+        with self._lock:
+            self._version = None
+            self._checked_at = float("-inf")
+            self._pages.clear()
+
+
+model_list_cache = ModelListCache(MODEL_LIST_TTL_S, MODEL_LIST_MAX_PAGES)
@@ -0,0 +1,30 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class DriftFeatureStat(Base):
+    """Compteur d'un bucket d'histogramme, par modèle / fenêtre / feature.
+
+    Les lignes sont additives : une fenêtre quelconque s'obtient par
+    ``SUM(count) ... GROUP BY feature, bucket``.
+    """
+
+    __tablename__ = "drift_feature_stats"
+
+    model_name: Mapped[str] = mapped_column(String(100), primary_key=True)
+    window_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    feature: Mapped[str] = mapped_column(String(100), primary_key=True)
+    bucket: Mapped[str] = mapped_column(String(255), primary_key=True)
+
+    kind: Mapped[str] = mapped_column(String(3), nullable=False)
+    count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return (
+            f"<DriftFeatureStat {self.model_name} {self.window_start} "
+            f"{self.feature}[{self.bucket}]={self.count}>"
+        )
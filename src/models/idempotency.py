@@ -0,0 +1,16 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class IdempotencyClaim(Base):
+    """Clé d'idempotence en cours de traitement ; supprimée une fois la requête terminée."""
+
+    __tablename__ = "idempotency_claims"
+
+    # Même taille que ml_outputs.request_id, où la clé est ensuite stockée.
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
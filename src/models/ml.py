@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import String, Text, DateTime, Boolean
+from sqlalchemy import BigInteger, Boolean, DateTime, SmallInteger, String, Text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -20,4 +20,15 @@ class MLModel(Base):
         DateTime(timezone=True), default=datetime.utcnow, nullable=False
     )
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+    # Version déployée (seuil ``<name>@<version>.threshold.json``), NULL sans version.
+    version: Mapped[str | None] = mapped_column(String(64), nullable=True)
 
+
+
+class MLRegistryVersion(Base):
+    """Compteur incrémenté par trigger à chaque écriture sur `ml_models`."""
+
+    __tablename__ = "ml_registry_version"
+
+    id: Mapped[int] = mapped_column(SmallInteger, primary_key=True, default=1)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
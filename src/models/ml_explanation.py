@@ -0,0 +1,27 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, Float, Index, String
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class MLExplanation(Base):
+    """Top-k des contributions SHAP d'une entrée (`/predict?explain=background`)."""
+
+    __tablename__ = "ml_explanations"
+
+    input_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    # Clé de partition (RANGE mensuel), même created_at que l'entrée.
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+
+    model_name: Mapped[str] = mapped_column(String(100), nullable=False)
+    base_value: Mapped[float] = mapped_column(Float, nullable=False)
+    # [{"feature": ..., "contribution": ...}], trié par |contribution| décroissante.
+    contributions: Mapped[list] = mapped_column(JSONB, nullable=False)
+
+    __table_args__ = (
+        Index("ix_ml_explanations_model_created", "model_name", "created_at"),
+    )
@@ -0,0 +1,47 @@
+from typing import Optional
+
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    DateTime,
+    Float,
+    Index,
+    SmallInteger,
+    String,
+    Table,
+)
+from sqlalchemy.dialects.postgresql import UUID
+
+from src.features import ISNA_COLS, TO_DROP
+from src.schemas.ModelFeatures import ModelFeatures
+
+from .base import Base
+
+
+def _feature_type(annotation):
+    if annotation == Optional[str]:
+        return String(255)
+    if annotation is int:
+        return BigInteger()
+    # Les entiers optionnels deviennent flottants après l'imputation par la médiane.
+    return Float()
+
+
+FEATURE_COLUMNS: dict[str, object] = {
+    name: _feature_type(field.annotation)
+    for name, field in ModelFeatures.model_fields.items()
+    if name not in TO_DROP
+}
+FEATURE_COLUMNS.update({f"{c}_ISNA": SmallInteger() for c in ISNA_COLS})
+
+# Features typées, une colonne par feature : pas de JSONB ni d'index GIN
+# sur le chemin d'écriture. Lecture compatible via la vue `ml_inputs_compat`.
+ml_input_features = Table(
+    "ml_input_features",
+    Base.metadata,
+    Column("input_id", UUID(as_uuid=True), primary_key=True),
+    Column("created_at", DateTime(timezone=True), primary_key=True),
+    Column("model_name", String(100), nullable=True),
+    *[Column(name, type_, nullable=True) for name, type_ in FEATURE_COLUMNS.items()],
+    Index("ix_ml_input_features_model_created", "model_name", "created_at"),
+)
@@ -10,14 +10,23 @@ class MLInput(Base):
     __tablename__ = "ml_inputs"
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    # Clé de partition (RANGE mensuel), d'où la clé primaire composite.
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         default=lambda: datetime.now(timezone.utc),
+        primary_key=True,
         nullable=False
     )
 
     model_name: Mapped[str] = mapped_column(String(100), index=True)
 
+    # Requête /predict d'origine (X-Request-ID) ; NULL pour les lignes antérieures sans sortie.
+    request_id: Mapped[str | None] = mapped_column(String(64), nullable=True)
+
     raw_data: Mapped[dict] = mapped_column(JSONB)
 
     features: Mapped[dict] = mapped_column(JSONB, nullable=True)
+
+    # Version de compute_features : permet de recalculer `features` depuis
+    # `raw_data` quand elles ne sont pas stockées (FEATURE_STORAGE=lazy).
+    feature_pipeline_version: Mapped[str | None] = mapped_column(String(20), nullable=True)
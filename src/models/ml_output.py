@@ -4,7 +4,7 @@ import uuid
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import String, Float, DateTime, ForeignKey, Integer, Index
+from sqlalchemy import String, Float, DateTime, Integer, Index
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
 from sqlalchemy.dialects.postgresql import UUID, JSONB
@@ -21,9 +21,9 @@ class MLOutput(Base):
         default=uuid.uuid4,
     )
 
+    # Pas de FK : ml_inputs est partitionnée, sa clé primaire est (id, created_at).
     input_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
-        ForeignKey("ml_inputs.id", ondelete="CASCADE"),
         nullable=False,
         index=True,
     )
@@ -41,6 +41,7 @@ class MLOutput(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         server_default=func.now(),
+        primary_key=True,
         nullable=False,
         index=True,
     )
@@ -9,7 +9,7 @@ class ProfilingLog(Base):
     __tablename__ = "profiling_logs"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), primary_key=True, nullable=False)
     
     endpoint = Column(String(255), nullable=False) 
     method = Column(String(10), nullable=False)     
@@ -30,8 +30,12 @@ class ProfilingLog(Base):
     ncalls_database = Column(Integer, nullable=True)
     
     cpu_percent = Column(Float, nullable=True)
+    # Pic tracemalloc (requêtes échantillonnées), sinon NULL.
     memory_mb = Column(Float, nullable=True)
+    alloc_stages = Column(JSON, nullable=True)
+    alloc_top = Column(JSON, nullable=True)
     
+    # Piles repliées compressées (src.stack_profile), requêtes échantillonnées.
     full_profile = Column(Text, nullable=True)
 
     def __repr__(self):
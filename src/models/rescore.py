@@ -0,0 +1,31 @@
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import BigInteger, DateTime, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class RescoreCheckpoint(Base):
+    """Avancement d'un re-scoring (``src.jobs.rescore``), mis à jour dans la
+    transaction qui écrit chaque paquet de sorties."""
+
+    __tablename__ = "rescore_checkpoints"
+
+    # Les sorties portent request_id = "rescore-<run_id>" (64 caractères max).
+    run_id: Mapped[str] = mapped_column(String(56), primary_key=True)
+    source_model: Mapped[str] = mapped_column(String(100), nullable=False)
+    model_name: Mapped[str] = mapped_column(String(255), nullable=False)
+    model_version: Mapped[str] = mapped_column(String(64), nullable=False)
+
+    # Dernière ligne ml_inputs re-scorée, dans l'ordre (created_at, id).
+    last_created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_input_id: Mapped[Optional[uuid.UUID]] = mapped_column(UUID(as_uuid=True), nullable=True)
+    rows_done: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+    started_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -0,0 +1,67 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Float, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+# Bornes (ms) des buckets cumulatifs de latence : lat_le_<b> = nb de lignes <= b.
+LATENCY_BOUNDS_MS = [10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+GRANULARITIES = {"minute": "1m", "hour": "1h"}
+
+
+class _LatencyBuckets:
+    pass
+
+
+for _b in LATENCY_BOUNDS_MS:
+    setattr(
+        _LatencyBuckets,
+        f"lat_le_{_b}",
+        mapped_column(BigInteger, nullable=False, default=0),
+    )
+
+
+class PredictionRollup(_LatencyBuckets, Base):
+    """Agrégats de `ml_outputs` par granularité / bucket / modèle / label."""
+
+    __tablename__ = "prediction_rollups"
+
+    granularity: Mapped[str] = mapped_column(String(2), primary_key=True)
+    bucket_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    model_name: Mapped[str] = mapped_column(String(255), primary_key=True)
+    label: Mapped[str] = mapped_column(String(255), primary_key=True)
+
+    count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    error_count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    sum_proba_defaut: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    sum_latency_ms: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+
+class RequestRollup(_LatencyBuckets, Base):
+    """Agrégats de `profiling_logs` par granularité / bucket / endpoint / modèle."""
+
+    __tablename__ = "request_rollups"
+
+    granularity: Mapped[str] = mapped_column(String(2), primary_key=True)
+    bucket_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    endpoint: Mapped[str] = mapped_column(String(255), primary_key=True)
+    method: Mapped[str] = mapped_column(String(10), primary_key=True)
+    model_name: Mapped[str] = mapped_column(String(100), primary_key=True)
+
+    count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    num_predictions: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    sum_total_ms: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    max_total_ms: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    sum_preprocessing_ms: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    sum_inference_ms: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    sum_database_ms: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+
+
+class RollupWatermark(Base):
+    __tablename__ = "rollup_watermarks"
+
+    source: Mapped[str] = mapped_column(String(50), primary_key=True)
+    # NULL tant qu'aucune passe n'a été faite.
+    processed_until: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -0,0 +1,71 @@
+"""Négociation du format de réponse de ``/predict`` (en-tête ``Accept``).
+
+JSON (``PredictResponse``) reste le format par défaut. Un client qui préfère
+``application/vnd.apache.arrow.stream`` reçoit un flux Arrow IPC en colonnes,
+construit directement depuis la matrice de probabilités, sans objet par ligne :
+
+- ``label`` : tableau dictionnaire (indices ``int8`` vers ``solvable`` / ``non_solvable``) ;
+- ``proba``, ``proba_defaut``, ``proba_solvable`` : ``float64`` ;
+- ``model_name`` dans les métadonnées du schéma.
+"""
+import numpy as np
+
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+
+# Ordre du dictionnaire : indice 1 = ligne en défaut (``proba_defaut >= seuil``).
+ARROW_LABELS = ["solvable", "non_solvable"]
+
+_JSON_TYPES = ("application/json", "application/*", "*/*")
+
+
+def _weights(accept: str) -> dict[str, float]:
+    weights: dict[str, float] = {}
+    for part in accept.split(","):
+        media, *params = [p.strip() for p in part.split(";")]
+        if not media:
+            continue
+        q = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        media = media.lower()
+        weights[media] = max(weights.get(media, 0.0), q)
+    return weights
+
+
+def preferred_format(accept: str | None) -> str:
+    """``"arrow"`` si ``Accept`` demande Arrow avec un poids au moins égal à JSON, sinon ``"json"``."""
+    if not accept:
+        return "json"
+    weights = _weights(accept)
+    arrow = weights.get(ARROW_STREAM, 0.0)
+    if arrow <= 0:
+        return "json"
+    return "arrow" if arrow >= max(weights.get(t, 0.0) for t in _JSON_TYPES) else "json"
+
+
+def predictions_ipc(model_name: str, defaut: np.ndarray, p_def: np.ndarray, p_sol: np.ndarray) -> bytes:
+    """Flux Arrow IPC des prédictions d'un lot ; ``defaut`` : masque des lignes ``non_solvable``."""
+    import pyarrow as pa
+
+    defaut = np.asarray(defaut, dtype=bool)
+    p_def = np.asarray(p_def, dtype=np.float64)
+    p_sol = np.asarray(p_sol, dtype=np.float64)
+
+    table = pa.table({
+        "label": pa.DictionaryArray.from_arrays(
+            pa.array(defaut.astype(np.int8)), pa.array(ARROW_LABELS)
+        ),
+        "proba": np.where(defaut, p_def, p_sol),
+        "proba_defaut": p_def,
+        "proba_solvable": p_sol,
+    }).replace_schema_metadata({"model_name": model_name})
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
@@ -0,0 +1,92 @@
+"""Exécution en pipeline d'un lot découpé en chunks.
+
+Chaque étape de ``stages`` tourne sur son propre thread et traite les chunks
+dans l'ordre ; ``sink`` (thread appelant) reçoit les résultats chunk par
+chunk. Pendant que ``sink`` écrit le chunk N-1, les étapes calculent les
+chunks N, N+1... dans la limite de ``depth`` chunks en vol.
+
+Chaque étape est marquée ``alloc_stage`` (son nom, ``write`` pour ``sink``) ;
+une requête dont les allocations sont tracées s'exécute en séquentiel, pour
+que le pic mémoire mesuré soit celui d'une seule étape.
+"""
+import os
+from collections import deque
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any
+
+from src.alloc_profile import alloc_stage, tracing
+
+PREDICT_CHUNK_ROWS = int(os.getenv("PREDICT_CHUNK_ROWS", "2000"))
+PREDICT_PIPELINE_DEPTH = int(os.getenv("PREDICT_PIPELINE_DEPTH", "2"))
+
+
+class StageError(Exception):
+    """Erreur d'une étape, avec son nom (pour choisir le message renvoyé)."""
+
+    def __init__(self, stage: str, error: Exception):
+        super().__init__(str(error))
+        self.stage = stage
+        self.error = error
+
+
+def chunk_bounds(n: int, size: int) -> list[tuple[int, int]]:
+    if n <= size:
+        return [(0, n)]
+    return [(a, min(a + size, n)) for a in range(0, n, size)]
+
+
+def _result(stage: str, future: Future) -> Any:
+    try:
+        return future.result()
+    except Exception as e:
+        raise StageError(stage, e) from e
+
+
+def run_pipeline(
+    chunks: Iterable,
+    stages: dict[str, Callable[[Any], Any]],
+    sink: Callable[[Any, dict[str, Any]], None],
+    depth: int = PREDICT_PIPELINE_DEPTH,
+) -> None:
+    chunks = list(chunks)
+
+    if len(chunks) <= 1 or tracing():
+        for chunk in chunks:
+            out = {}
+            for name, fn in stages.items():
+                try:
+                    with alloc_stage(name):
+                        out[name] = fn(chunk)
+                except Exception as e:
+                    raise StageError(name, e) from e
+            with alloc_stage("write"):
+                sink(chunk, out)
+        return
+
+    pools = {name: ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"pipeline-{name}") for name in stages}
+    pending: deque = deque()
+    remaining = iter(chunks)
+
+    def submit(chunk):
+        pending.append((chunk, {name: pools[name].submit(fn, chunk) for name, fn in stages.items()}))
+
+    try:
+        for _ in range(max(depth, 1)):
+            chunk = next(remaining, None)
+            if chunk is None:
+                break
+            submit(chunk)
+
+        while pending:
+            chunk, futures = pending.popleft()
+            out = {name: _result(name, f) for name, f in futures.items()}
+
+            nxt = next(remaining, None)
+            if nxt is not None:
+                submit(nxt)
+
+            sink(chunk, out)
+    finally:
+        for pool in pools.values():
+            pool.shutdown(wait=True, cancel_futures=True)
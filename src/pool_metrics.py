@@ -0,0 +1,96 @@
+"""Métriques du pool de connexions SQLAlchemy.
+
+``InstrumentedQueuePool`` (engine sync) et ``InstrumentedAsyncQueuePool``
+(engine async) chronomètrent chaque checkout (attente d'une connexion libre
+comprise) ; ``snapshot(pool)`` combine ces compteurs avec l'état courant du
+pool (connexions prises, overflow). Exposé par ``GET /monitoring/pool``.
+"""
+import threading
+from time import perf_counter
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Bornes (ms) des buckets cumulatifs : le_<b> = nb de checkouts <= b ms.
+CHECKOUT_BOUNDS_MS = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000]
+
+# Au-delà, le checkout a attendu qu'une connexion se libère.
+WAIT_THRESHOLD_MS = 1.0
+
+
+class PoolMetrics:
+
+    def __init__(self, bounds_ms: list[float]):
+        self.bounds_ms = bounds_ms
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._checkouts = 0
+            self._timeouts = 0
+            self._waits = 0
+            self._wait_total_ms = 0.0
+            self._wait_max_ms = 0.0
+            self._buckets = [0] * len(self.bounds_ms)
+
+    def observe(self, elapsed_ms: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self._timeouts += 1
+            else:
+                self._checkouts += 1
+                for i, b in enumerate(self.bounds_ms):
+                    if elapsed_ms <= b:
+                        self._buckets[i] += 1
+            if elapsed_ms > WAIT_THRESHOLD_MS:
+                self._waits += 1
+                self._wait_total_ms += elapsed_ms
+                self._wait_max_ms = max(self._wait_max_ms, elapsed_ms)
+
+    def snapshot(self, pool) -> dict:
+        with self._lock:
+            counters = {
+                "checkouts": self._checkouts,
+                "timeouts": self._timeouts,
+                "waits": self._waits,
+                "wait_total_ms": round(self._wait_total_ms, 3),
+                "wait_max_ms": round(self._wait_max_ms, 3),
+                "checkout_latency_ms": {
+                    **{f"le_{b}": n for b, n in zip(self.bounds_ms, self._buckets)},
+                    "count": self._checkouts,
+                },
+            }
+
+        state = {"pool_class": type(pool).__name__}
+        if isinstance(pool, QueuePool):
+            state.update({
+                "size": pool.size(),
+                "max_overflow": pool._max_overflow,
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+            })
+        return {**state, **counters}
+
+
+pool_metrics = PoolMetrics(CHECKOUT_BOUNDS_MS)
+async_pool_metrics = PoolMetrics(CHECKOUT_BOUNDS_MS)
+
+
+class InstrumentedQueuePool(QueuePool):
+    metrics = pool_metrics
+
+    def _do_get(self):
+        start = perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.observe((perf_counter() - start) * 1000, timed_out=True)
+            raise
+        self.metrics.observe((perf_counter() - start) * 1000)
+        return conn
+
+
+class InstrumentedAsyncQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    metrics = async_pool_metrics
@@ -0,0 +1,15 @@
+from typing import Dict
+from pydantic import BaseModel
+
+
+class AdmissionStats(BaseModel):
+    max_rows: int
+    max_rows_per_model: int
+    in_flight_rows: int
+    in_flight_rows_by_model: Dict[str, int]
+    queued: int
+    admitted: int
+    shed: Dict[str, int]
+    queue_wait_total_ms: float
+    queue_wait_max_ms: float
+    queue_wait_ms: Dict[str, int]
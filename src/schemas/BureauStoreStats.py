@@ -0,0 +1,14 @@
+from typing import Dict, Optional
+from pydantic import BaseModel
+
+
+class BureauStoreStats(BaseModel):
+    version: Optional[str] = None
+    rows: int
+    loads: int
+    load_ms: float
+    lookups: int
+    rows_looked_up: int
+    hits: int
+    lookup_total_ms: float
+    lookup_latency_ms: Dict[str, int]
@@ -0,0 +1,13 @@
+from typing import Optional
+from pydantic import BaseModel, Field
+
+class DriftFeatureScore(BaseModel):
+    feature: str
+    kind: str = Field(..., description="`num` (buckets ordonnés) ou `cat` (modalités).")
+    n_reference: int
+    n_current: int
+    null_rate_reference: Optional[float] = None
+    null_rate_current: Optional[float] = None
+    psi: Optional[float] = Field(None, description="Population Stability Index.")
+    ks: Optional[float] = Field(None, description="Statistique KS sur histogrammes (numériques uniquement).")
+    drifted: bool = Field(..., description="PSI ≥ 0.2.")
@@ -0,0 +1,16 @@
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel
+
+from src.schemas.DriftFeatureScore import DriftFeatureScore
+
+
+class DriftReport(BaseModel):
+    model_name: str
+    reference_start: Optional[datetime] = None
+    reference_end: Optional[datetime] = None
+    reference_profile_version: Optional[str] = None
+    current_start: datetime
+    current_end: datetime
+    n_drifted: int
+    features: List[DriftFeatureScore]
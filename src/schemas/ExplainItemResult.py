@@ -0,0 +1,10 @@
+from typing import List
+from pydantic import Field
+
+from src.schemas.FeatureContribution import FeatureContribution
+from src.schemas.PredictItemResult import PredictItemResult
+
+class ExplainItemResult(PredictItemResult):
+    contributions: List[FeatureContribution] = Field(
+        ..., description="Top-k des contributions, triées par valeur absolue décroissante."
+    )
@@ -0,0 +1,10 @@
+from typing import List
+from pydantic import BaseModel, Field
+
+from src.schemas.ExplainItemResult import ExplainItemResult
+
+
+class ExplainResponse(BaseModel):
+    model_name: str
+    base_value: float = Field(..., description="Valeur SHAP de base (espérance du modèle).")
+    results: List[ExplainItemResult]
@@ -0,0 +1,5 @@
+from pydantic import BaseModel, Field
+
+class FeatureContribution(BaseModel):
+    feature: str = Field(..., description="Feature après preprocessing (ex. `num__EXT_SOURCE_2`).")
+    contribution: float = Field(..., description="Valeur SHAP (log-odds de la classe défaut).")
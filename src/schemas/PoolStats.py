@@ -0,0 +1,17 @@
+from typing import Dict, Optional
+from pydantic import BaseModel
+
+
+class PoolStats(BaseModel):
+    pool_class: str
+    size: Optional[int] = None
+    max_overflow: Optional[int] = None
+    checked_out: Optional[int] = None
+    checked_in: Optional[int] = None
+    overflow: Optional[int] = None
+    checkouts: int
+    timeouts: int
+    waits: int
+    wait_total_ms: float
+    wait_max_ms: float
+    checkout_latency_ms: Dict[str, int]
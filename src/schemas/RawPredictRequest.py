@@ -0,0 +1,12 @@
+from typing import List
+from pydantic import BaseModel, SkipValidation
+
+from src.schemas.ModelFeatures import ModelFeatures
+
+
+class RawPredictRequest(BaseModel):
+    """Même schéma (OpenAPI) que `PredictRequest`, mais `inputs` n'est pas
+    validé à la désérialisation : voir `src.validation.validate_inputs`."""
+
+    model_name: str
+    inputs: SkipValidation[List[ModelFeatures]]
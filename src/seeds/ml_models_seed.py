@@ -13,16 +13,17 @@ DATABASE_URL = os.environ["DATABASE_URL"]
 engine = create_engine(DATABASE_URL, future=True)
 
 UPSERT = text("""
-    INSERT INTO ml_models (id, name, description, created_at, is_active)
-    VALUES (:id, :name, :description, :created_at, :is_active)
+    INSERT INTO ml_models (id, name, description, created_at, is_active, version)
+    VALUES (:id, :name, :description, :created_at, :is_active, :version)
     ON CONFLICT (name) DO UPDATE
       SET description = EXCLUDED.description,
-          is_active  = EXCLUDED.is_active
+          is_active  = EXCLUDED.is_active,
+          version    = EXCLUDED.version
 """)
 
 def seed_ml_models(session: Session):
     rows = [
-        {"id": "5b1c7b3a-0000-4000-8000-000000000002", "name": "best_model", "description": "Best model",        "is_active": False},
+        {"id": "5b1c7b3a-0000-4000-8000-000000000002", "name": "best_model", "description": "Best model",        "is_active": False, "version": None},
     ]
     now = datetime.now(timezone.utc)
     for r in rows:
@@ -0,0 +1,198 @@
+"""Lanceur pre-fork de l'API : modèles chargés une fois, partagés par N workers.
+
+    python -m src.server --workers 4 --port 7860
+
+Le parent importe l'application, charge les modèles actifs (``load_model``,
+seuil, profil de référence), ouvre la socket d'écoute puis fork les workers :
+les pages des modèles sont partagées en copy-on-write au lieu d'être
+rechargées par chaque worker. Le GC est désactivé pendant le préchargement
+puis ``gc.freeze()`` range les objets existants hors des générations
+collectées, pour que ses passes dans les workers n'écrivent pas dans ces
+pages (et ne les dupliquent pas).
+
+Le parent relance un worker tombé (sans recharger les modèles) et affiche la
+mémoire propre (USS) et proportionnelle (PSS) de chaque worker.
+"""
+import argparse
+import gc
+import os
+import signal
+import socket
+import time
+
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", str(os.cpu_count() or 1)))
+PREFORK_REPORT_DELAY_S = float(os.getenv("PREFORK_REPORT_DELAY_S", "10"))
+PREFORK_REPORT_INTERVAL_S = float(os.getenv("PREFORK_REPORT_INTERVAL_S", "300"))
+
+MB = 1024 * 1024
+
+
+def active_model_names(db) -> list[str]:
+    from sqlalchemy import select
+
+    from src.models.ml import MLModel
+
+    return list(db.execute(
+        select(MLModel.name).where(MLModel.is_active.is_(True)).order_by(MLModel.created_at.desc())
+    ).scalars())
+
+
+def preload_models() -> list[str]:
+    """Charge les modèles actifs (les plus récents d'abord) dans le cache de ``load_model``."""
+    from src.config.db import SessionLocal, engine
+    from src.model_loader import MODEL_CACHE_SIZE, load_model, load_reference_profile, load_threshold
+
+    try:
+        with SessionLocal() as db:
+            names = active_model_names(db)
+    except Exception as e:
+        print(f"[ERROR] Lecture des modèles actifs: {e}")
+        names = []
+    finally:
+        # Pas de connexion ouverte par le parent partagée avec les workers.
+        engine.dispose()
+
+    if len(names) > MODEL_CACHE_SIZE:
+        print(f"[WARN] {len(names)} modèles actifs, MODEL_CACHE_SIZE={MODEL_CACHE_SIZE} : "
+              f"seuls {names[:MODEL_CACHE_SIZE]} sont préchargés")
+        names = names[:MODEL_CACHE_SIZE]
+
+    loaded = []
+    for name in names:
+        try:
+            load_model(name)
+        except Exception as e:
+            print(f"[ERROR] Préchargement du modèle '{name}': {e}")
+            continue
+        load_threshold(name)
+        load_reference_profile(name)
+        loaded.append(name)
+    return loaded
+
+
+def memory_report(pids: dict[int, int]) -> list[dict]:
+    """USS / PSS / RSS (Mo) de chaque worker, ``pids`` : pid -> numéro de worker."""
+    import psutil
+
+    report = []
+    for pid, worker_id in sorted(pids.items(), key=lambda kv: kv[1]):
+        try:
+            info = psutil.Process(pid).memory_full_info()
+        except psutil.Error:
+            continue
+        report.append({
+            "worker": worker_id,
+            "pid": pid,
+            "uss_mb": round(info.uss / MB, 1),
+            "pss_mb": round(getattr(info, "pss", 0) / MB, 1),
+            "rss_mb": round(info.rss / MB, 1),
+        })
+    return report
+
+
+def print_memory_report(pids: dict[int, int]) -> None:
+    import psutil
+
+    parent = psutil.Process().memory_info().rss / MB
+    print(f"[INFO] Mémoire : parent rss={parent:.1f} Mo (modèles partagés)")
+    for r in memory_report(pids):
+        print(f"[INFO]   worker {r['worker']} pid={r['pid']} uss={r['uss_mb']} Mo "
+              f"pss={r['pss_mb']} Mo rss={r['rss_mb']} Mo")
+
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_worker(worker_id: int, app, sock: socket.socket, log_level: str) -> None:
+    import uvicorn
+
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    os.environ["WORKER_ID"] = str(worker_id)
+    gc.enable()
+
+    server = uvicorn.Server(uvicorn.Config(app, log_level=log_level, lifespan="on"))
+    server.run(sockets=[sock])
+
+
+def spawn(worker_id: int, app, sock: socket.socket, log_level: str) -> int:
+    pid = os.fork()
+    if pid == 0:
+        code = 0
+        try:
+            run_worker(worker_id, app, sock, log_level)
+        except BaseException as e:
+            print(f"[ERROR] Worker {worker_id}: {e}")
+            code = 1
+        finally:
+            os._exit(code)
+    return pid
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lance l'API en pre-fork (modèles partagés en copy-on-write).")
+    parser.add_argument("--workers", type=int, default=WEB_CONCURRENCY)
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args()
+
+    # Pas de passe de GC pendant l'import et le chargement : les objets
+    # restent groupés, puis sont gelés d'un bloc avant le fork.
+    gc.disable()
+    start = time.perf_counter()
+    from src.main import app
+
+    loaded = preload_models()
+    gc.freeze()
+    print(f"[INFO] Préchargement : {loaded} en {time.perf_counter() - start:.1f} s, "
+          f"{gc.get_freeze_count()} objets gelés")
+
+    sock = bind_socket(args.host, args.port)
+    workers = {spawn(i, app, sock, args.log_level): i for i in range(args.workers)}
+    print(f"[INFO] {args.workers} workers sur {args.host}:{args.port} (pids {sorted(workers)})")
+
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in workers:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    next_report = time.monotonic() + PREFORK_REPORT_DELAY_S
+    while workers:
+        pid, status = os.waitpid(-1, os.WNOHANG)
+        if pid == 0:
+            time.sleep(0.5)
+            if not stopping and time.monotonic() >= next_report:
+                print_memory_report(workers)
+                next_report = (
+                    time.monotonic() + PREFORK_REPORT_INTERVAL_S if PREFORK_REPORT_INTERVAL_S > 0
+                    else float("inf")
+                )
+            continue
+
+        worker_id = workers.pop(pid, None)
+        if worker_id is None or stopping:
+            continue
+        print(f"[ERROR] Worker {worker_id} (pid {pid}) arrêté, code {os.waitstatus_to_exitcode(status)} : relance")
+        workers[spawn(worker_id, app, sock, args.log_level)] = worker_id
+
+    sock.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Profils de piles repliées (« collapsed stacks ») des requêtes échantillonnées.
+
+``cProfile`` (``ProfilingMiddleware``) ne voit que le thread de la boucle
+d'événements : la validation, les features, l'inférence et les écritures, qui
+tournent dans des threads (``asyncio.to_thread``, pipeline), lui échappent.
+Pour une requête tirée au sort (``PROFILING_STACKS_SAMPLE_RATE``, une seule à
+la fois), un thread échantillonne toutes les ``PROFILING_STACKS_INTERVAL_MS``
+les piles de tous les threads (``sys._current_frames``) et compte chaque pile
+repliée ``racine;...;feuille``. Les threads en attente (verrou, file, select)
+sont ignorés ; ceux des requêtes concurrentes sont comptés aussi.
+
+Le profil est stocké compressé (zlib + base64) dans
+``profiling_logs.full_profile`` ; ``merge_profiles`` en additionne plusieurs
+au format texte de ``flamegraph.pl`` / inferno / speedscope (``pile nombre``).
+Un échantillon vaut ``PROFILING_STACKS_INTERVAL_MS``.
+"""
+import base64
+import os
+import sys
+import threading
+import zlib
+from collections import Counter
+from collections.abc import Iterable
+
+from src.alloc_profile import short_path
+
+PROFILING_STACKS_SAMPLE_RATE = float(os.getenv("PROFILING_STACKS_SAMPLE_RATE", "0"))
+PROFILING_STACKS_INTERVAL_MS = float(os.getenv("PROFILING_STACKS_INTERVAL_MS", "5"))
+
+# Feuille dans l'un de ces fichiers : thread en attente, pas en train de travailler.
+_IDLE = tuple(
+    os.sep + p
+    for p in (
+        "threading.py",
+        "queue.py",
+        "selectors.py",
+        os.path.join("concurrent", "futures", "thread.py"),
+    )
+)
+
+_lock = threading.Lock()
+
+
+class StackSampler:
+
+    def __init__(self, interval_ms: float = PROFILING_STACKS_INTERVAL_MS):
+        self.interval_s = interval_ms / 1000
+        self.stacks: Counter[str] = Counter()
+        self._labels: dict = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = f"{code.co_qualname} ({short_path(code.co_filename)})".replace(";", ",")
+            self._labels[code] = label
+        return label
+
+    def sample(self) -> None:
+        me = threading.get_ident()
+        for ident, frame in sys._current_frames().items():
+            if ident == me or frame.f_code.co_filename.endswith(_IDLE):
+                continue
+            labels = []
+            while frame is not None:
+                labels.append(self._label(frame.f_code))
+                frame = frame.f_back
+            self.stacks[";".join(reversed(labels))] += 1
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            self.sample()
+
+    def start(self) -> "StackSampler":
+        self._thread.start()
+        return self
+
+    def stop(self) -> Counter[str]:
+        self._stop.set()
+        self._thread.join()
+        return self.stacks
+
+
+def start(interval_ms: float = PROFILING_STACKS_INTERVAL_MS) -> StackSampler | None:
+    """Échantillonne les piles jusqu'à ``stop`` ; ``None`` si une autre requête l'est déjà."""
+    if not _lock.acquire(blocking=False):
+        return None
+    try:
+        return StackSampler(interval_ms).start()
+    except Exception:
+        _lock.release()
+        raise
+
+
+def stop(sampler: StackSampler) -> Counter[str]:
+    try:
+        return sampler.stop()
+    finally:
+        _lock.release()
+
+
+def collapsed(stacks: Counter[str]) -> str:
+    """Texte ``pile nombre``, une pile par ligne, les plus fréquentes d'abord."""
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+def encode(stacks: Counter[str]) -> str:
+    return base64.b64encode(zlib.compress(collapsed(stacks).encode())).decode("ascii")
+
+
+def decode(profile: str) -> Counter[str]:
+    stacks: Counter[str] = Counter()
+    for line in zlib.decompress(base64.b64decode(profile)).decode().splitlines():
+        stack, _, count = line.rpartition(" ")
+        if stack:
+            stacks[stack] += int(count)
+    return stacks
+
+
+def merge_profiles(profiles: Iterable[str]) -> tuple[Counter[str], int]:
+    """Somme des profils encodés ; renvoie aussi le nombre de profils lus."""
+    merged: Counter[str] = Counter()
+    n = 0
+    for profile in profiles:
+        try:
+            merged.update(decode(profile))
+        except Exception as e:
+            print(f"[WARN] Profil de piles illisible ignoré: {e}")
+            continue
+        n += 1
+    return merged, n
@@ -0,0 +1,212 @@
+"""Agrégats bureau précalculés (``nb_loans``, ``sum_debt``) indexés par ``SK_ID_CURR``.
+
+Même agrégation que le notebook d'analyse (``bureau.groupby("SK_ID_CURR")``,
+nombre de ``SK_ID_BUREAU`` et somme de ``AMT_CREDIT_SUM_DEBT``), construite
+une fois par ``python -m src.jobs.bureau`` au lieu d'être refaite par chaque
+appelant avant le scoring.
+
+Disposition : ``BUREAU_STORE_DIR/<version>/{keys,nb_loans,sum_debt}.npy``
+(clés triées) et ``BUREAU_STORE_DIR/CURRENT`` qui désigne la version active,
+remplacé atomiquement à chaque reconstruction. Les tableaux sont ouverts en
+memmap (pages partagées entre workers) ; une recherche est un
+``np.searchsorted`` vectorisé sur tout le lot. Le pointeur ``CURRENT`` est
+relu au plus toutes les ``BUREAU_STORE_CHECK_S`` secondes.
+"""
+import json
+import os
+import shutil
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from uuid import uuid4
+
+import numpy as np
+import pandas as pd
+
+BUREAU_STORE_DIR = Path(os.getenv("BUREAU_STORE_DIR", "artifacts/bureau"))
+BUREAU_STORE_CHECK_S = float(os.getenv("BUREAU_STORE_CHECK_S", "60"))
+BUREAU_STORE_KEEP = 2
+
+BUREAU_COLUMNS = ["nb_loans", "sum_debt"]
+
+# Bornes (ms) des buckets cumulatifs de latence de recherche : le_<b> = nb de lots <= b ms.
+LOOKUP_BOUNDS_MS = [0.1, 0.5, 1, 5, 10, 50, 100]
+
+
+def aggregate_bureau(path: str | Path, chunksize: int = 1_000_000) -> pd.DataFrame:
+    """Agrège ``bureau.csv`` par client, par morceaux (mémoire bornée)."""
+    parts = []
+    for chunk in pd.read_csv(
+        path,
+        usecols=["SK_ID_CURR", "SK_ID_BUREAU", "AMT_CREDIT_SUM_DEBT"],
+        chunksize=chunksize,
+    ):
+        parts.append(
+            chunk.groupby("SK_ID_CURR").agg(
+                nb_loans=("SK_ID_BUREAU", "count"),
+                sum_debt=("AMT_CREDIT_SUM_DEBT", "sum"),
+            )
+        )
+    if not parts:
+        return pd.DataFrame(columns=BUREAU_COLUMNS, index=pd.Index([], name="SK_ID_CURR"))
+    return pd.concat(parts).groupby(level=0).sum().sort_index()
+
+
+def build_store(agg: pd.DataFrame, directory: Path = BUREAU_STORE_DIR) -> str:
+    """Écrit une nouvelle version du store puis la rend active ; renvoie la version."""
+    version = f"{datetime.now(timezone.utc):%Y%m%dT%H%M%S%fZ}-{uuid4().hex[:6]}"
+    target = directory / version
+    target.mkdir(parents=True)
+
+    agg = agg.sort_index()
+    np.save(target / "keys.npy", agg.index.to_numpy(dtype=np.int64))
+    for c in BUREAU_COLUMNS:
+        np.save(target / f"{c}.npy", agg[c].to_numpy(dtype=np.float64))
+    (target / "manifest.json").write_text(json.dumps({
+        "version": version,
+        "rows": int(len(agg)),
+        "built_at": datetime.now(timezone.utc).isoformat(),
+    }))
+
+    tmp = directory / f"CURRENT.{uuid4().hex}"
+    tmp.write_text(version)
+    os.replace(tmp, directory / "CURRENT")
+
+    # Les workers qui ont encore une ancienne version en memmap la gardent lisible.
+    versions = sorted(p for p in directory.iterdir() if p.is_dir() and p.name != version)
+    for old in versions[:max(len(versions) - (BUREAU_STORE_KEEP - 1), 0)]:
+        shutil.rmtree(old, ignore_errors=True)
+    return version
+
+
+class BureauStore:
+
+    def __init__(self, directory: Path, check_s: float):
+        self.directory = directory
+        self.check_s = check_s
+        self._lock = threading.Lock()
+        self._checked_at = float("-inf")
+        self._version: str | None = None
+        self._keys: np.ndarray | None = None
+        self._values: dict[str, np.ndarray] = {}
+        self._warned = False
+
+        self._loads = 0
+        self._load_ms = 0.0
+        self._lookups = 0
+        self._rows = 0
+        self._hits = 0
+        self._lookup_total_ms = 0.0
+        self._buckets = [0] * len(LOOKUP_BOUNDS_MS)
+
+    def _current(self) -> str | None:
+        try:
+            return (self.directory / "CURRENT").read_text().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def _refresh(self) -> None:
+        with self._lock:
+            if time.monotonic() - self._checked_at < self.check_s:
+                return
+            self._checked_at = time.monotonic()
+            version = self._current()
+            if version is None:
+                if not self._warned:
+                    print(f"[WARN] Store bureau absent ({self.directory}) : nb_loans / sum_debt non complétés")
+                    self._warned = True
+                return
+            if version == self._version:
+                return
+
+            start = time.perf_counter()
+            try:
+                path = self.directory / version
+                keys = np.load(path / "keys.npy", mmap_mode="r")
+                values = {c: np.load(path / f"{c}.npy", mmap_mode="r") for c in BUREAU_COLUMNS}
+            except Exception as e:
+                print(f"[ERROR] Chargement du store bureau '{version}': {e}")
+                return
+            self._keys, self._values, self._version = keys, values, version
+            self._loads += 1
+            self._load_ms = (time.perf_counter() - start) * 1000
+
+    def lookup(self, ids: np.ndarray) -> tuple[dict[str, np.ndarray], np.ndarray] | None:
+        """Valeurs des clients ``ids`` (NaN si absents) et masque des clients trouvés."""
+        self._refresh()
+        keys, values = self._keys, self._values
+        if keys is None or not len(keys):
+            return None
+
+        pos = np.searchsorted(keys, ids)
+        pos = np.minimum(pos, len(keys) - 1)
+        found = keys[pos] == ids
+        out = {}
+        for c in BUREAU_COLUMNS:
+            col = np.full(len(ids), np.nan)
+            col[found] = values[c][pos[found]]
+            out[c] = col
+        return out, found
+
+    def enrich(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Complète ``nb_loans`` / ``sum_debt`` absents ou nuls ; les valeurs fournies sont gardées."""
+        if "SK_ID_CURR" not in df.columns:
+            return df
+        missing = {
+            c: pd.to_numeric(df[c], errors="coerce").isna().to_numpy() if c in df.columns
+            else np.ones(len(df), dtype=bool)
+            for c in BUREAU_COLUMNS
+        }
+        rows = np.logical_or.reduce(list(missing.values()))
+        ids = pd.to_numeric(df["SK_ID_CURR"], errors="coerce")
+        rows &= ids.notna().to_numpy()
+        if not rows.any():
+            return df
+
+        start = time.perf_counter()
+        found = self.lookup(ids.to_numpy()[rows].astype(np.int64))
+        if found is None:
+            return df
+        values, hits = found
+
+        df = df.copy()
+        for c in BUREAU_COLUMNS:
+            col = pd.to_numeric(df[c], errors="coerce") if c in df.columns else pd.Series(np.nan, index=df.index)
+            col = col.to_numpy(dtype=np.float64, copy=True)
+            fill = missing[c][rows]
+            col[np.flatnonzero(rows)[fill]] = values[c][fill]
+            df[c] = col
+        self._observe(int(rows.sum()), int(hits.sum()), (time.perf_counter() - start) * 1000)
+        return df
+
+    def _observe(self, rows: int, hits: int, elapsed_ms: float) -> None:
+        with self._lock:
+            self._lookups += 1
+            self._rows += rows
+            self._hits += hits
+            self._lookup_total_ms += elapsed_ms
+            for i, b in enumerate(LOOKUP_BOUNDS_MS):
+                if elapsed_ms <= b:
+                    self._buckets[i] += 1
+
+    def snapshot(self) -> dict:
+        self._refresh()
+        with self._lock:
+            return {
+                "version": self._version,
+                "rows": int(len(self._keys)) if self._keys is not None else 0,
+                "loads": self._loads,
+                "load_ms": round(self._load_ms, 3),
+                "lookups": self._lookups,
+                "rows_looked_up": self._rows,
+                "hits": self._hits,
+                "lookup_total_ms": round(self._lookup_total_ms, 3),
+                "lookup_latency_ms": {
+                    **{f"le_{b}": n for b, n in zip(LOOKUP_BOUNDS_MS, self._buckets)},
+                    "count": self._lookups,
+                },
+            }
+
+
+bureau_store = BureauStore(BUREAU_STORE_DIR, BUREAU_STORE_CHECK_S)
@@ -0,0 +1,166 @@
+"""Stockage des features calculées hors JSONB.
+
+``FEATURE_STORAGE`` :
+- ``jsonb``   : comportement historique, ``ml_inputs.features`` (JSONB + GIN) ;
+- ``columns`` : table typée ``ml_input_features`` écrite dans la transaction ;
+- ``parquet`` : segments Parquet ``model_name=<m>/date=<jour>/`` tamponnés en
+  mémoire et roulés par taille ou par âge. Les features restant recalculables
+  depuis ``raw_data``, un segment perdu au crash n'est pas une perte de données ;
+- ``lazy``    : rien n'est stocké, seulement ``raw_data`` et
+  ``feature_pipeline_version`` ; voir ``src.storage.feature_rebuild``.
+"""
+import os
+import threading
+import time
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Literal
+from uuid import UUID, uuid4
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import BigInteger, SmallInteger, insert
+from sqlalchemy.orm import Session
+
+from src.models.ml_input_features import FEATURE_COLUMNS, ml_input_features
+
+FEATURE_STORAGE: Literal["jsonb", "columns", "parquet", "lazy"] = os.getenv("FEATURE_STORAGE", "jsonb").lower()
+FEATURE_ARCHIVE_DIR = Path(os.getenv("FEATURE_ARCHIVE_DIR", "archive/features"))
+FEATURE_ARCHIVE_MAX_ROWS = int(os.getenv("FEATURE_ARCHIVE_MAX_ROWS", "50000"))
+FEATURE_ARCHIVE_MAX_AGE_S = float(os.getenv("FEATURE_ARCHIVE_MAX_AGE_S", "300"))
+
+
+def typed_feature_frame(X: pd.DataFrame, **leading) -> pd.DataFrame:
+    """Aligne les features sur le schéma typé (colonnes manquantes à NULL).
+
+    ``leading`` : colonnes ajoutées en tête (input_id, created_at, ...).
+    """
+    columns = dict(leading)
+    for name, type_ in FEATURE_COLUMNS.items():
+        if name not in X.columns:
+            columns[name] = None
+        elif type_.python_type is str:
+            columns[name] = X[name].astype(object).where(X[name].notna(), None)
+        else:
+            columns[name] = pd.to_numeric(X[name], errors="coerce").replace([np.inf, -np.inf], np.nan)
+    return pd.DataFrame(columns, index=X.index)
+
+
+def feature_column_records(
+    input_ids: list[UUID],
+    X: pd.DataFrame,
+    model_name: str,
+    created_at: datetime,
+) -> list[dict]:
+    frame = typed_feature_frame(
+        X, input_id=input_ids, created_at=created_at, model_name=model_name,
+    ).astype(object)
+    frame = frame.where(frame.notna(), None)
+    return frame.to_dict(orient="records")
+
+
+def insert_feature_columns(
+    db: Session,
+    input_ids: list[UUID],
+    X: pd.DataFrame,
+    model_name: str,
+    created_at: datetime,
+) -> None:
+    db.execute(insert(ml_input_features), feature_column_records(input_ids, X, model_name, created_at))
+
+
+
+@lru_cache(maxsize=1)
+def archive_schema():
+    import pyarrow as pa
+
+    def arrow_type(type_):
+        if type_.python_type is str:
+            return pa.string()
+        if isinstance(type_, BigInteger):
+            return pa.int64()
+        if isinstance(type_, SmallInteger):
+            return pa.int8()
+        return pa.float64()
+
+    return pa.schema([
+        ("input_id", pa.string()),
+        ("created_at", pa.timestamp("us", tz="UTC")),
+        *[(name, arrow_type(type_)) for name, type_ in FEATURE_COLUMNS.items()],
+    ])
+
+
+class ParquetFeatureArchive:
+
+    def __init__(self, root: Path, max_rows: int, max_age_s: float):
+        self.root = Path(root)
+        self.max_rows = max_rows
+        self.max_age_s = max_age_s
+        self._lock = threading.Lock()
+        self._buffers: dict[tuple[str, str], list[pd.DataFrame]] = {}
+        self._rows: dict[tuple[str, str], int] = {}
+        self._opened_at: dict[tuple[str, str], float] = {}
+
+    def append(
+        self,
+        input_ids: list[UUID],
+        X: pd.DataFrame,
+        model_name: str,
+        created_at: datetime,
+    ) -> None:
+        frame = typed_feature_frame(
+            X, input_id=[str(i) for i in input_ids], created_at=created_at,
+        )
+        key = (model_name, created_at.date().isoformat())
+
+        with self._lock:
+            self._buffers.setdefault(key, []).append(frame)
+            self._rows[key] = self._rows.get(key, 0) + len(frame)
+            self._opened_at.setdefault(key, time.monotonic())
+            due = [
+                k for k in self._buffers
+                if self._rows[k] >= self.max_rows
+                or time.monotonic() - self._opened_at[k] >= self.max_age_s
+            ]
+            segments = [(k, self._pop(k)) for k in due]
+
+        for k, frames in segments:
+            self._write(k, frames)
+
+    def flush(self) -> list[Path]:
+        with self._lock:
+            segments = [(k, self._pop(k)) for k in list(self._buffers)]
+        return [self._write(k, frames) for k, frames in segments]
+
+    def _pop(self, key: tuple[str, str]) -> list[pd.DataFrame]:
+        self._rows.pop(key, None)
+        self._opened_at.pop(key, None)
+        return self._buffers.pop(key)
+
+    def _write(self, key: tuple[str, str], frames: list[pd.DataFrame]) -> Path:
+        model_name, day = key
+        directory = self.root / f"model_name={model_name}" / f"date={day}"
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"part-{uuid4().hex}.parquet"
+        # Préfixe "." : ignoré par pyarrow.dataset tant que l'écriture n'est pas finie.
+        tmp = directory / f".{path.name}.tmp"
+
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.Table.from_pandas(
+            pd.concat(frames, ignore_index=True),
+            schema=archive_schema(),
+            preserve_index=False,
+        )
+        pq.write_table(table, tmp, compression="zstd")
+        tmp.rename(path)
+        return path
+
+
+parquet_archive = ParquetFeatureArchive(
+    FEATURE_ARCHIVE_DIR,
+    max_rows=FEATURE_ARCHIVE_MAX_ROWS,
+    max_age_s=FEATURE_ARCHIVE_MAX_AGE_S,
+)
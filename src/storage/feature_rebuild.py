@@ -0,0 +1,113 @@
+"""Recalcul des features depuis ``raw_data`` (``FEATURE_STORAGE=lazy``).
+
+``compute_features`` impute par médiane / mode *du lot* : pour retrouver
+exactement les features vues par le modèle, le recalcul se fait par requête
+d'origine (``request_key`` : ``request_id`` du ``/predict``, avec son
+``created_at`` et sa ``feature_pipeline_version``). Deux requêtes de même
+``created_at`` restent séparées ; les lignes antérieures sans ``request_id``
+sont regroupées par ``created_at``. Les lignes sont lues en flux, par paquets
+de ``chunk_rows`` ; un ``created_at`` à cheval sur deux paquets est reporté
+au suivant.
+"""
+from collections.abc import Iterator
+from datetime import datetime
+
+import pandas as pd
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+
+from src.features import rebuild_features
+from src.models.ml_inputs import MLInput
+from src.schemas.ModelFeatures import ModelFeatures
+
+REBUILD_CHUNK_ROWS = 10_000
+
+# Lignes antérieures à la colonne : produites par la première version.
+LEGACY_PIPELINE_VERSION = "1"
+
+_RAW_COLUMNS = list(ModelFeatures.model_fields)
+
+
+def request_key(row) -> tuple:
+    """Clé de la requête d'origine d'une ligne ``ml_inputs``."""
+    return row.created_at, row.request_id, row.feature_pipeline_version
+
+
+def rebuild_request(raw_data: list[dict], version: str | None) -> pd.DataFrame:
+    """Features des lignes d'une même requête d'origine, depuis leurs ``raw_data``."""
+    # JSONB ne conserve pas l'ordre des clés : on rétablit celui de ModelFeatures.
+    raw = pd.DataFrame(raw_data)
+    raw = raw[[c for c in _RAW_COLUMNS if c in raw.columns]]
+    return rebuild_features(raw, version or LEGACY_PIPELINE_VERSION).reset_index(drop=True)
+
+
+def _rebuild_batch(rows: list) -> pd.DataFrame:
+    X = rebuild_request([r.raw_data for r in rows], rows[0].feature_pipeline_version)
+    X.insert(0, "input_id", [r.id for r in rows])
+    X.insert(1, "created_at", rows[0].created_at)
+    return X
+
+
+def _rebuild_rows(rows: list) -> Iterator[pd.DataFrame]:
+    batch = [rows[0]]
+    for r in rows[1:]:
+        if request_key(r) != request_key(batch[-1]):
+            yield _rebuild_batch(batch)
+            batch = []
+        batch.append(r)
+    yield _rebuild_batch(batch)
+
+
+def iter_rebuilt_features(
+    engine: Engine,
+    model_name: str,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    chunk_rows: int = REBUILD_CHUNK_ROWS,
+) -> Iterator[pd.DataFrame]:
+    """Features recalculées de ``model_name`` sur ``[start, end[``.
+
+    Produit un DataFrame par paquet (``input_id``, ``created_at``, features),
+    dans l'ordre de ``created_at``.
+    """
+    stmt = (
+        select(
+            MLInput.id,
+            MLInput.created_at,
+            MLInput.request_id,
+            MLInput.feature_pipeline_version,
+            MLInput.raw_data,
+        )
+        .where(MLInput.model_name == model_name)
+        .order_by(MLInput.created_at, MLInput.request_id, MLInput.feature_pipeline_version, MLInput.id)
+    )
+    if start is not None:
+        stmt = stmt.where(MLInput.created_at >= start)
+    if end is not None:
+        stmt = stmt.where(MLInput.created_at < end)
+
+    for rows in iter_request_rows(engine, stmt, chunk_rows):
+        yield pd.concat(list(_rebuild_rows(rows)), ignore_index=True)
+
+
+def iter_request_rows(engine: Engine, stmt, chunk_rows: int = REBUILD_CHUNK_ROWS) -> Iterator[list]:
+    """Lignes de ``stmt`` (triées par ``created_at``), lues par curseur serveur,
+    par paquets d'environ ``chunk_rows`` qui ne coupent jamais une requête d'origine."""
+    pending: list = []
+    with engine.connect().execution_options(stream_results=True, yield_per=chunk_rows) as conn:
+        for part in conn.execute(stmt).partitions(chunk_rows):
+            pending.extend(part)
+
+            # Le dernier lot peut continuer dans le paquet suivant.
+            last = pending[-1].created_at
+            cut = len(pending)
+            while cut and pending[cut - 1].created_at == last:
+                cut -= 1
+            if cut == 0:
+                continue
+
+            ready, pending = pending[:cut], pending[cut:]
+            yield ready
+
+        if pending:
+            yield pending
@@ -0,0 +1,128 @@
+"""Lecture en flux de `ml_outputs` (NDJSON / Parquet).
+
+Les lignes sont lues via un curseur serveur (``stream_results``) par paquets
+de ``STREAM_CHUNK_ROWS`` et sérialisées au fil de l'eau : la mémoire reste
+bornée à un paquet, quelle que soit la taille de la plage demandée.
+"""
+import json
+from collections.abc import Iterator
+from datetime import datetime
+
+from sqlalchemy import Select
+from sqlalchemy.engine import Engine
+
+from src.models.ml_output import MLOutput
+
+STREAM_CHUNK_ROWS = 5_000
+
+PREDICTION_COLUMNS = [
+    MLOutput.id,
+    MLOutput.input_id,
+    MLOutput.request_id,
+    MLOutput.model_name,
+    MLOutput.model_version,
+    MLOutput.created_at,
+    MLOutput.prediction,
+    MLOutput.prob,
+    MLOutput.proba_defaut,
+    MLOutput.proba_solvable,
+    MLOutput.threshold,
+    MLOutput.latency_ms,
+    MLOutput.error,
+    MLOutput.meta,
+]
+
+
+def _iter_chunks(engine: Engine, stmt: Select, chunk_rows: int) -> Iterator[list]:
+    with engine.connect().execution_options(stream_results=True, yield_per=chunk_rows) as conn:
+        for part in conn.execute(stmt).mappings().partitions(chunk_rows):
+            yield part
+
+
+def _jsonable(v):
+    if isinstance(v, datetime):
+        return v.isoformat()
+    return str(v)
+
+
+def iter_ndjson(engine: Engine, stmt: Select, chunk_rows: int = STREAM_CHUNK_ROWS) -> Iterator[bytes]:
+    for part in _iter_chunks(engine, stmt, chunk_rows):
+        yield "".join(
+            json.dumps(dict(row), default=_jsonable, ensure_ascii=False) + "\n"
+            for row in part
+        ).encode()
+
+
+def prediction_schema():
+    import pyarrow as pa
+
+    return pa.schema([
+        ("id", pa.string()),
+        ("input_id", pa.string()),
+        ("request_id", pa.string()),
+        ("model_name", pa.string()),
+        ("model_version", pa.string()),
+        ("created_at", pa.timestamp("us", tz="UTC")),
+        ("prediction", pa.string()),
+        ("prob", pa.float64()),
+        ("proba_defaut", pa.float64()),
+        ("proba_solvable", pa.float64()),
+        ("threshold", pa.float64()),
+        ("latency_ms", pa.int64()),
+        ("error", pa.string()),
+        ("meta", pa.string()),
+    ])
+
+
+class _Sink:
+    """Fichier en écriture seule dont on vide le contenu après chaque row group."""
+
+    def __init__(self):
+        self._parts: list[bytes] = []
+        self._pos = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        b = bytes(data)
+        self._parts.append(b)
+        self._pos += len(b)
+        return len(b)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data, self._parts = b"".join(self._parts), []
+        return data
+
+
+def iter_parquet(engine: Engine, stmt: Select, chunk_rows: int = STREAM_CHUNK_ROWS) -> Iterator[bytes]:
+    """Un row group par paquet ; le footer est émis à la fin du flux."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = prediction_schema()
+    sink = _Sink()
+    writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    try:
+        for part in _iter_chunks(engine, stmt, chunk_rows):
+            columns = {name: [] for name in schema.names}
+            for row in part:
+                for name in schema.names:
+                    v = row[name]
+                    if name == "meta":
+                        v = json.dumps(v, default=_jsonable) if v is not None else None
+                    elif name in ("id", "input_id") and v is not None:
+                        v = str(v)
+                    columns[name].append(v)
+            writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
@@ -0,0 +1,316 @@
+"""Validation des lignes de ``/predict``.
+
+Petits lots : ``ModelFeatures`` ligne par ligne (Pydantic). Au-delà de
+``BULK_VALIDATION_MIN_ROWS`` lignes, validation colonne par colonne avec
+pandas/NumPy, générée depuis le même schéma : mêmes coercitions (mode lax),
+mêmes bornes ``ge``, même nettoyage des chaînes, et erreurs au format
+Pydantic (``loc = ("body", "inputs", i, champ)``).
+
+Les colonnes déjà numériques (``int64`` / ``float64``) sont vérifiées en
+vectoriel. Les autres (chaînes, booléens mêlés, listes...) et les entiers
+au-delà de 2**53, qu'un ``float64`` ne représente plus exactement, passent
+valeur par valeur par les règles lax de Pydantic (``_coerce_int`` /
+``_coerce_float``), sans passer par un flottant pour les champs entiers.
+
+Écart connu : dans une colonne ``float64``, un ``NaN`` explicite est traité
+comme ``null`` (pandas ne distingue pas les deux).
+"""
+import os
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any, List, Optional
+
+import numpy as np
+import pandas as pd
+from annotated_types import Ge
+from fastapi.exceptions import RequestValidationError
+from pydantic import TypeAdapter, ValidationError
+
+from src.schemas.ModelFeatures import ModelFeatures
+
+BULK_VALIDATION_MIN_ROWS = int(os.getenv("BULK_VALIDATION_MIN_ROWS", "100"))
+
+MAX_STR_LEN = 255
+
+_INT_BOUND = 2**63
+
+
+@dataclass(frozen=True)
+class FieldSpec:
+    name: str
+    kind: str  # "int" | "float" | "str"
+    required: bool
+    ge: float | None
+
+
+def _field_specs() -> list[FieldSpec]:
+    kinds = {int: "int", Optional[int]: "int", Optional[float]: "float", Optional[str]: "str", float: "float"}
+    specs = []
+    for name, field in ModelFeatures.model_fields.items():
+        ge = next((m.ge for m in field.metadata if isinstance(m, Ge)), None)
+        specs.append(FieldSpec(name, kinds[field.annotation], field.is_required(), ge))
+    return specs
+
+
+FIELD_SPECS = _field_specs()
+
+_ROWS_ADAPTER = TypeAdapter(List[ModelFeatures])
+
+_MESSAGES = {
+    "missing": "Field required",
+    "int_type": "Input should be a valid integer",
+    "int_parsing": "Input should be a valid integer, unable to parse string as an integer",
+    "int_from_float": "Input should be a valid integer, got a number with a fractional part",
+    "int_parsing_size": "Unable to parse input string as an integer, exceeded maximum size",
+    "finite_number": "Input should be a finite number",
+    "float_type": "Input should be a valid number",
+    "float_parsing": "Input should be a valid number, unable to parse string as a number",
+    "string_type": "Input should be a valid string",
+    "model_type": "Input should be a valid dictionary or instance of ModelFeatures",
+}
+
+
+def _error(type_: str, i: int, field: str | None, value: Any, msg: str | None = None) -> dict:
+    loc = ("body", "inputs", i) + ((field,) if field else ())
+    if isinstance(value, np.generic):
+        value = value.item()
+    return {"type": type_, "loc": loc, "msg": msg or _MESSAGES[type_], "input": value}
+
+
+def _collect(errors: list, mask, s: pd.Series, type_: str, field: str, msg: str | None = None) -> None:
+    for i in np.flatnonzero(np.asarray(mask, dtype=bool)):
+        errors.append(_error(type_, int(i), field, s.iat[i], msg))
+
+
+def _finalize(values: pd.Series, null: np.ndarray, kind: str) -> pd.Series:
+    """Même dtype que ``pd.DataFrame([m.model_dump() ...])`` sur le chemin Pydantic."""
+    if null.all():
+        return pd.Series([None] * len(values), dtype=object)
+    if kind == "int" and not null.any():
+        return values.astype(np.int64)
+    return values.astype(np.float64)
+
+
+def _clean_str(v: str) -> str:
+    # ``ModelFeatures._strip_strings`` s'applique avant la conversion numérique.
+    return v.strip()[:MAX_STR_LEN]
+
+
+def _strip_underscores(s: str) -> str | None:
+    # Comme Pydantic : « _ » seulement entre deux caractères, jamais doublé.
+    if "_" not in s:
+        return s
+    if s.startswith("_") or s.endswith("_") or "__" in s:
+        return None
+    return s.replace("_", "")
+
+
+def _int_from_str(s: str) -> int | str:
+    if not s.isascii():
+        return "int_parsing"
+    if "." in s:
+        # "4.0", "4.00" : entier ; "4.", "4.5" : refusé.
+        s, _, frac = s.partition(".")
+        if not frac or frac.strip("0"):
+            return "int_parsing"
+    s = _strip_underscores(s)
+    if s is None or not s.lstrip("+-").isdigit() or len(s) - len(s.lstrip("+-")) > 1:
+        return "int_parsing"
+    return int(s)
+
+
+def _float_from_str(s: str) -> float | str:
+    s = _strip_underscores(s) if s.isascii() else None
+    if not s:
+        return "float_parsing"
+    try:
+        return float(s)
+    except ValueError:
+        return "float_parsing"
+
+
+def _coerce_int(v: Any) -> int | str | None:
+    """Entier Pydantic (lax) : valeur, ``None`` (null) ou type d'erreur."""
+    if v is None:
+        return None
+    if isinstance(v, (bool, np.bool_)):
+        return int(v)
+    if isinstance(v, (int, np.integer)):
+        return int(v)
+    if isinstance(v, (float, np.floating)):
+        if not np.isfinite(v):
+            return "finite_number"
+        if v % 1:
+            return "int_from_float"
+        if not -_INT_BOUND < v < _INT_BOUND:
+            return "int_parsing_size"
+        return int(v)
+    if isinstance(v, str):
+        return _int_from_str(_clean_str(v))
+    return "int_type"
+
+
+def _coerce_float(v: Any) -> float | str | None:
+    """Flottant Pydantic (lax) : valeur, ``None`` (null) ou type d'erreur."""
+    if v is None:
+        return None
+    if isinstance(v, (bool, np.bool_)):
+        return float(v)
+    if isinstance(v, (int, float, np.integer, np.floating)):
+        try:
+            return float(v)
+        except OverflowError:
+            return "float_type"
+    if isinstance(v, str):
+        return _float_from_str(_clean_str(v))
+    return "float_type"
+
+
+def _check_ge(values, valid: np.ndarray, s: pd.Series, spec: FieldSpec, errors: list) -> None:
+    if spec.ge is None:
+        return
+    below = np.zeros(len(valid), dtype=bool)
+    with np.errstate(invalid="ignore"):
+        # ``not v >= ge`` : un NaN est refusé, comme par Pydantic.
+        below[valid] = ~np.asarray(np.asarray(values)[valid] >= spec.ge, dtype=bool)
+    _collect(
+        errors, below, s, "greater_than_equal", spec.name,
+        f"Input should be greater than or equal to {spec.ge}",
+    )
+
+
+def _validate_values(raw: list, spec: FieldSpec, errors: list) -> pd.Series:
+    """Valeur par valeur : colonnes mixtes, chaînes, grands entiers."""
+    coerce = _coerce_int if spec.kind == "int" else _coerce_float
+    values: list = []
+    s = pd.Series(raw, dtype=object)
+    for i, v in enumerate(raw):
+        out = coerce(v)
+        if isinstance(out, str):
+            errors.append(_error(out, i, spec.name, v))
+            out = None
+        elif out is None and spec.required:
+            errors.append(_error("int_type", i, spec.name, v))
+        values.append(out)
+
+    valid = np.array([v is not None for v in values], dtype=bool)
+    _check_ge(values, valid, s, spec, errors)
+
+    if not valid.any():
+        return pd.Series([None] * len(values), dtype=object)
+    # Même inférence que la construction du DataFrame sur le chemin Pydantic.
+    return pd.Series(values)
+
+
+def _validate_numeric(s: pd.Series, spec: FieldSpec, errors: list, raw: Callable[[], list]) -> pd.Series:
+    if s.dtype == bool:
+        s = s.astype(np.int64)
+    if s.dtype.kind in "iu":
+        # Entiers déjà exacts (int64 / uint64).
+        values = s.to_numpy()
+        valid = np.ones(len(s), dtype=bool)
+        _check_ge(values, valid, s, spec, errors)
+        return s.reset_index(drop=True) if spec.kind == "int" else s.astype(np.float64)
+
+    if s.dtype != np.float64 or (spec.kind == "int" and (np.abs(s.to_numpy()) >= 2**53).any()):
+        return _validate_values(raw(), spec, errors)
+
+    values = s.to_numpy()
+    null = np.isnan(values)
+    if spec.required:
+        _collect(errors, null, s, "int_type", spec.name)
+
+    valid = ~null
+    if spec.kind == "int":
+        # Entiers < 2**53 exacts en float64 ; seuls les vrais flottants restent à contrôler.
+        _collect(errors, valid & (np.mod(values, 1) != 0), s, "int_from_float", spec.name)
+    _check_ge(values, valid, s, spec, errors)
+
+    return _finalize(s, null, spec.kind)
+
+
+def _validate_str(s: pd.Series, spec: FieldSpec, errors: list) -> pd.Series:
+    null = s.isna().to_numpy()
+    if pd.api.types.infer_dtype(s, skipna=True) in ("string", "empty"):
+        is_str = ~null
+    else:
+        is_str = s.map(lambda v: isinstance(v, str)).to_numpy(dtype=bool)
+    _collect(errors, ~null & ~is_str, s, "string_type", spec.name)
+
+    if null.all():
+        return pd.Series([None] * len(s), dtype=object)
+    out = s.where(is_str, None).astype(object)
+    cleaned = out[is_str].str.strip().str.slice(0, MAX_STR_LEN)
+    out[is_str] = cleaned
+    return out
+
+
+def bulk_validate(rows: list) -> tuple[pd.DataFrame, list[dict]]:
+    """Valide ``rows`` (liste de dicts) colonne par colonne.
+
+    Retourne le DataFrame brut (colonnes dans l'ordre de ``ModelFeatures``)
+    et la liste des erreurs, vide si tout est valide.
+    """
+    errors: list[dict] = []
+
+    not_dict = [i for i, r in enumerate(rows) if not isinstance(r, dict)]
+    for i in not_dict:
+        errors.append(_error("model_type", i, None, rows[i]))
+    if not_dict:
+        return pd.DataFrame(), errors
+
+    df = pd.DataFrame.from_records(rows) if rows else pd.DataFrame()
+    columns = {}
+    for spec in FIELD_SPECS:
+        if spec.name in df.columns:
+            s = df[spec.name].reset_index(drop=True)
+        else:
+            s = pd.Series([None] * len(df), dtype=object)
+
+        if spec.required:
+            missing = [i for i, r in enumerate(rows) if spec.name not in r]
+            for i in missing:
+                errors.append(_error("missing", i, spec.name, rows[i]))
+            if missing:
+                s = s.copy()
+                s.iloc[missing] = 0
+
+        if spec.kind == "str":
+            columns[spec.name] = _validate_str(s, spec, errors)
+        else:
+            # Valeurs d'origine (sans conversion pandas), lues seulement si nécessaire.
+            def raw(name=spec.name, default=0 if spec.required else None):
+                return [r.get(name, default) for r in rows]
+
+            columns[spec.name] = _validate_numeric(s, spec, errors, raw)
+
+    errors.sort(key=lambda e: e["loc"][2])
+    return pd.DataFrame(columns), errors
+
+
+def validate_inputs(inputs: Any) -> pd.DataFrame:
+    """Valide ``PredictRequest.inputs`` et retourne le DataFrame brut.
+
+    Lève ``RequestValidationError`` (réponse 422) au premier lot invalide.
+    """
+    if not isinstance(inputs, list):
+        raise RequestValidationError([{
+            "type": "list_type",
+            "loc": ("body", "inputs"),
+            "msg": "Input should be a valid list",
+            "input": inputs,
+        }])
+
+    if len(inputs) < BULK_VALIDATION_MIN_ROWS:
+        try:
+            rows = _ROWS_ADAPTER.validate_python(inputs)
+        except ValidationError as e:
+            raise RequestValidationError([
+                {**err, "loc": ("body", "inputs", *err["loc"])} for err in e.errors()
+            ])
+        return pd.DataFrame([x.model_dump() for x in rows])
+
+    df, errors = bulk_validate(inputs)
+    if errors:
+        raise RequestValidationError(errors)
+    return df
@@ -1,6 +1,66 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.compose import ColumnTransformer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+from sqlalchemy import create_engine
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.compiler import compiles
 
 @compiles(JSONB, "sqlite")
 def compile_jsonb_sqlite(type_, compiler, **kw):
     return "JSON"
+
+
+@pytest.fixture(autouse=True)
+def local_artifacts(monkeypatch):
+    """Artefacts lus en local (``ENV = "dev"``) même sous ``APP_ENV=test`` :
+    pas d'appel au Hub, et caches de seuils vides à chaque test."""
+    import src.model_loader as ml
+
+    monkeypatch.setattr(ml, "ENV", "dev")
+    monkeypatch.setattr(ml, "_threshold_misses", {})
+    ml._read_threshold.cache_clear()
+
+
+@pytest.fixture
+def pg_engine():
+    """Base Postgres migrée (``alembic upgrade head``, comme en CI) ; test ignoré sinon."""
+    url = os.getenv("DATABASE_URL", "")
+    if not url.startswith("postgresql"):
+        pytest.skip("Postgres requis (DATABASE_URL)")
+    engine = create_engine(url)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def credit_data():
+    """``credit_data(n)`` : petit jeu (X, y) synthétique pour la validation croisée."""
+    def make(n=300):
+        rng = np.random.default_rng(0)
+        X = pd.DataFrame({
+            "AMT_INCOME_TOTAL": rng.normal(150_000, 40_000, n),
+            "AMT_CREDIT": rng.normal(500_000, 100_000, n),
+            "NAME_CONTRACT_TYPE": rng.choice(["Cash loans", "Revolving loans"], n),
+        })
+        y = pd.Series((X["AMT_CREDIT"] / X["AMT_INCOME_TOTAL"] + rng.normal(0, 1, n) > 3.5).astype(int))
+        return X, y
+
+    return make
+
+
+@pytest.fixture
+def credit_pipeline():
+    """``credit_pipeline(clf)`` : étape ``preprocessing`` (mise en cache) suivie de ``clf``."""
+    def make(clf):
+        preprocessor = ColumnTransformer([
+            ("num", StandardScaler(), ["AMT_INCOME_TOTAL", "AMT_CREDIT"]),
+            ("cat", OneHotEncoder(drop="first", handle_unknown="ignore"), ["NAME_CONTRACT_TYPE"]),
+        ])
+        return Pipeline([("preprocessing", preprocessor), ("clf", clf)])
+
+    return make
@@ -0,0 +1,175 @@
+import asyncio
+from datetime import datetime, timezone
+import threading
+import time
+import uuid
+
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.admission import AdmissionController, AdmissionRejected, admission
+from src.main import app
+from src.config.db import get_db
+from src.models.ml import MLModel
+from src.models.ml_inputs import MLInput
+from src.models.ml_output import MLOutput
+
+ROW = {
+    "SK_ID_CURR": 100005,
+    "NAME_CONTRACT_TYPE": "Cash loans",
+    "CODE_GENDER": "M",
+    "FLAG_OWN_CAR": "N",
+    "FLAG_OWN_REALTY": "Y",
+    "CNT_CHILDREN": 0,
+    "AMT_INCOME_TOTAL": 99000.0,
+    "AMT_CREDIT": 222768.0,
+    "AMT_ANNUITY": 17370.0,
+    "DAYS_BIRTH": -18064,
+    "DAYS_EMPLOYED": -4469,
+}
+
+
+def test_interactive_requests_jump_the_queue():
+    async def scenario():
+        ctl = AdmissionController(
+            max_rows=100, max_rows_per_model=100, interactive_max_rows=10,
+            interactive_reserve=0.2, queue_timeout_s=1.0, retry_after_s=2,
+        )
+        # Les lots plafonnent à 80 lignes : la réserve reste aux interactives.
+        await ctl.acquire("m", 80)
+        await ctl.acquire("m", 5)
+
+        order = []
+
+        async def wait(rows):
+            await ctl.acquire("m", rows)
+            order.append(rows)
+
+        batch = asyncio.create_task(wait(50))
+        await asyncio.sleep(0)
+        small = asyncio.create_task(wait(10))
+        await asyncio.sleep(0)
+        assert ctl.snapshot()["queued"] == 1
+        ctl.release("m", 80)
+        await asyncio.gather(batch, small)
+        assert order == [10, 50]
+
+        ctl.queue_timeout_s = 0.05
+        with pytest.raises(AdmissionRejected) as e:
+            await ctl.acquire("m", 60)
+        assert e.value.retry_after_s == 2
+
+        stats = ctl.snapshot()
+        assert stats["in_flight_rows"] == 65
+        assert stats["admitted"] == 4
+        assert stats["shed"] == {"global_batch": 1}
+
+    asyncio.run(scenario())
+
+
+def test_grant_racing_the_queue_timeout_is_admitted(monkeypatch):
+    async def scenario():
+        ctl = AdmissionController(
+            max_rows=10, max_rows_per_model=10, interactive_max_rows=100,
+            interactive_reserve=0.0, queue_timeout_s=0.05, retry_after_s=1,
+        )
+        await ctl.acquire("m", 10)
+
+        # Comportement de wait_for en 3.12+ : le release accorde la place au
+        # tick où le délai expire, et TimeoutError est levée quand même.
+        async def granted_on_timeout(future, timeout):
+            ctl.release("m", 10)
+            assert future.done()
+            raise asyncio.TimeoutError
+
+        monkeypatch.setattr(asyncio, "wait_for", granted_on_timeout)
+        await ctl.acquire("m", 5)
+        monkeypatch.undo()
+
+        stats = ctl.snapshot()
+        assert stats["in_flight_rows"] == 5
+        assert stats["shed"] == {}
+        ctl.release("m", 5)
+        assert ctl.snapshot()["in_flight_rows"] == 0
+
+        # Même course sur la vraie boucle : release et expiration au même tick.
+        await ctl.acquire("m", 10)
+        loop = asyncio.get_running_loop()
+        waiting = asyncio.create_task(ctl.acquire("m", 5))
+        await asyncio.sleep(0)
+        loop.call_at(loop.time() + 0.045, ctl.release, "m", 10)
+        loop.call_soon(time.sleep, 0.08)
+        await waiting
+        ctl.release("m", 5)
+        assert ctl.snapshot()["in_flight_rows"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_predict_sheds_with_retry_after(tmp_path, monkeypatch):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'testing.db'}",
+        connect_args={"check_same_thread": False},
+    )
+    SQLSession = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    for model in (MLModel, MLInput, MLOutput):
+        model.__table__.create(bind=engine)
+
+    session = SQLSession()
+    session.add(MLModel(
+        id=uuid.uuid4(),
+        name="best_model",
+        created_at=datetime(2025, 9, 15, tzinfo=timezone.utc),
+        is_active=True,
+    ))
+    session.commit()
+
+    def get_db_override():
+        yield SQLSession()
+
+    app.dependency_overrides[get_db] = get_db_override
+    client = TestClient(app, raise_server_exceptions=False)
+
+    started, finish = threading.Event(), threading.Event()
+
+    class SlowModel:
+        classes_ = [0, 1]
+
+        def predict_proba(self, X: pd.DataFrame):
+            started.set()
+            finish.wait(5)
+            return [[0.3, 0.7]] * len(X)
+
+    import src.controllers.predict_controller as pc
+    monkeypatch.setattr(pc, "load_model", lambda name: SlowModel())
+    monkeypatch.setattr(pc, "compute_features", lambda df: df)
+    monkeypatch.setattr(admission, "max_rows", 3)
+    monkeypatch.setattr(admission, "max_rows_per_model", 3)
+    monkeypatch.setattr(admission, "queue_timeout_s", 0)
+    shed_before = sum(admission.snapshot()["shed"].values())
+
+    payload = {"model_name": "best_model", "inputs": [ROW, ROW]}
+    results = {}
+    first = threading.Thread(target=lambda: results.update(first=client.post("/predict/", json=payload)))
+    first.start()
+    assert started.wait(5)
+
+    busy = client.post("/predict/", json=payload)
+    assert busy.status_code == 503
+    assert busy.headers["Retry-After"] == "1"
+
+    stats = client.get("/monitoring/admission").json()
+    assert stats["in_flight_rows"] == 2
+    assert sum(stats["shed"].values()) == shed_before + 1
+
+    finish.set()
+    first.join(5)
+    assert results["first"].status_code == 200, results["first"].text
+
+    again = client.post("/predict/", json=payload)
+    app.dependency_overrides.clear()
+    assert again.status_code == 200
+    assert admission.snapshot()["in_flight_rows"] == 0
@@ -0,0 +1,99 @@
+import asyncio
+
+import numpy as np
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+import src.middleware.profiling as profiling
+from src import alloc_profile
+from src.alloc_profile import alloc_stage, staged
+from src.middleware.profiling import ProfilingMiddleware
+from src.models.profiling import ProfilingLog
+from src.pipeline import run_pipeline
+
+MB = 1024 * 1024
+
+
+def test_stage_peaks_and_sites():
+    assert alloc_profile.tracing() is False
+    trace = alloc_profile.start()
+    assert trace is not None
+    # Une seule requête tracée à la fois.
+    assert alloc_profile.start() is None
+    try:
+        kept = []
+        with alloc_stage("transient"):
+            tmp = np.ones(4 * MB // 8)
+            del tmp
+        with alloc_stage("kept"):
+            kept.append(np.ones(2 * MB // 8))
+            # Étape imbriquée : comptée dans l'englobante.
+            with alloc_stage("inner"):
+                kept.append(np.ones(MB // 8))
+        untraced = np.ones(8 * MB // 8)
+    finally:
+        result = alloc_profile.stop(trace)
+
+    assert alloc_profile.tracing() is False
+    stages = result["stages"]
+    assert set(stages) == {"transient", "kept"}
+    assert stages["transient"]["peak_mb"] >= 4
+    assert stages["transient"]["net_mb"] < 0.5
+    assert stages["kept"]["net_mb"] >= 3
+    # Hors étape, rien n'est tracé.
+    assert result["peak_mb"] < 8 and untraced.size
+
+    top = result["top"][0]
+    assert top["stage"] == "kept"
+    assert top["site"].startswith("tests/functional/test_alloc_profile.py:")
+    assert top["alloc"].startswith("numpy/")
+    assert top["size_mb"] >= 2
+
+
+def test_middleware_stores_sampled_allocations(tmp_path, monkeypatch):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'testing.db'}",
+        connect_args={"check_same_thread": False},
+    )
+    ProfilingLog.__table__.create(bind=engine)
+    SQLSession = sessionmaker(bind=engine)
+    monkeypatch.setattr(profiling, "get_async_sessionmaker", lambda: None)
+    monkeypatch.setattr(profiling, "get_sessionmaker", lambda: SQLSession)
+
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware, enabled=True, alloc_sample_rate=1.0)
+
+    @app.post("/work")
+    async def work():
+        def features():
+            return np.ones(3 * MB // 8)
+
+        X = await asyncio.to_thread(staged, "features", features)
+        written = []
+
+        def pipeline():
+            run_pipeline(
+                [(0, 100), (100, 200), (200, 300)],
+                {"inputs": lambda c: [{"row": i} for i in range(*c)]},
+                lambda chunk, out: written.extend(out["inputs"]),
+                depth=2,
+            )
+
+        await asyncio.to_thread(pipeline)
+        return {"rows": len(written), "sum": float(X.sum())}
+
+    client = TestClient(app)
+    assert client.post("/work").json()["rows"] == 300
+
+    with SQLSession() as db:
+        log = db.execute(select(ProfilingLog)).scalar_one()
+
+    assert log.memory_mb >= 3
+    assert set(log.alloc_stages) == {"features", "inputs", "write"}
+    # Tracé : le pipeline passe en séquentiel, un appel par chunk.
+    assert log.alloc_stages["inputs"]["calls"] == 3
+    assert log.alloc_stages["features"]["peak_mb"] >= 3
+    assert log.alloc_top
+    assert log.cpu_percent is not None
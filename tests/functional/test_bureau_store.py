@@ -0,0 +1,128 @@
+from datetime import datetime, timezone
+import uuid
+
+import numpy as np
+import pandas as pd
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.main import app
+from src.config.db import get_db
+from src.models.ml import MLModel
+from src.models.ml_inputs import MLInput
+from src.models.ml_output import MLOutput
+from src.storage.bureau_store import BureauStore, aggregate_bureau, build_store
+
+ROW = {
+    "SK_ID_CURR": 100005,
+    "NAME_CONTRACT_TYPE": "Cash loans",
+    "CODE_GENDER": "M",
+    "FLAG_OWN_CAR": "N",
+    "FLAG_OWN_REALTY": "Y",
+    "CNT_CHILDREN": 0,
+    "AMT_INCOME_TOTAL": 99000.0,
+    "AMT_CREDIT": 222768.0,
+    "AMT_ANNUITY": 17370.0,
+    "DAYS_BIRTH": -18064,
+    "DAYS_EMPLOYED": -4469,
+}
+
+
+def _bureau_csv(path):
+    pd.DataFrame({
+        "SK_ID_CURR": [100005, 100002, 100005, 100005, 100007],
+        "SK_ID_BUREAU": [1, 2, 3, 4, 5],
+        "AMT_CREDIT_SUM_DEBT": [1000.0, 50.0, np.nan, 250.0, 0.0],
+    }).to_csv(path, index=False)
+    return path
+
+
+def test_store_matches_notebook_groupby(tmp_path):
+    csv = _bureau_csv(tmp_path / "bureau.csv")
+    bureau = pd.read_csv(csv)
+    expected = bureau.groupby("SK_ID_CURR").agg(
+        nb_loans=("SK_ID_BUREAU", "count"), sum_debt=("AMT_CREDIT_SUM_DEBT", "sum"),
+    )
+    agg = aggregate_bureau(csv, chunksize=2)
+    pd.testing.assert_frame_equal(agg, expected, check_dtype=False)
+
+    store_dir = tmp_path / "store"
+    first = build_store(agg, store_dir)
+    store = BureauStore(store_dir, check_s=0)
+
+    df = pd.DataFrame({
+        "SK_ID_CURR": [100005, 100002, 999999, 100007],
+        "nb_loans": [None, 7.0, None, None],
+        "sum_debt": [None, None, None, 12.0],
+    })
+    out = store.enrich(df)
+    assert out["nb_loans"].tolist()[:2] == [3.0, 7.0]
+    assert np.isnan(out["nb_loans"][2])
+    assert out["sum_debt"].tolist()[:2] == [1250.0, 50.0]
+    assert out["sum_debt"][3] == 12.0
+    assert df["nb_loans"].isna().sum() == 3
+
+    stats = store.snapshot()
+    assert stats["version"] == first
+    assert stats["rows"] == 3
+    assert (stats["lookups"], stats["rows_looked_up"], stats["hits"]) == (1, 4, 3)
+
+    # Reconstruction : la nouvelle version est prise, les anciennes élaguées.
+    build_store(agg.assign(nb_loans=agg["nb_loans"] + 1), store_dir)
+    third = build_store(agg.assign(nb_loans=agg["nb_loans"] + 2), store_dir)
+    assert store.enrich(df)["nb_loans"][0] == 5.0
+    assert store.snapshot()["version"] == third
+    assert len([p for p in store_dir.iterdir() if p.is_dir()]) == 2
+
+
+def test_predict_fills_missing_bureau_aggregates(tmp_path, monkeypatch):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'testing.db'}",
+        connect_args={"check_same_thread": False},
+    )
+    SQLSession = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    for model in (MLModel, MLInput, MLOutput):
+        model.__table__.create(bind=engine)
+
+    session = SQLSession()
+    session.add(MLModel(
+        id=uuid.uuid4(),
+        name="best_model",
+        created_at=datetime(2025, 9, 15, tzinfo=timezone.utc),
+        is_active=True,
+    ))
+    session.commit()
+
+    def get_db_override():
+        yield session
+
+    app.dependency_overrides[get_db] = get_db_override
+    client = TestClient(app, raise_server_exceptions=False)
+
+    seen = []
+
+    class FakeModel:
+        classes_ = [0, 1]
+
+        def predict_proba(self, X: pd.DataFrame):
+            seen.append(X[["nb_loans", "sum_debt"]].copy())
+            return [[0.3, 0.7]] * len(X)
+
+    store_dir = tmp_path / "store"
+    build_store(aggregate_bureau(_bureau_csv(tmp_path / "bureau.csv")), store_dir)
+
+    import src.controllers.predict_controller as pc
+    monkeypatch.setattr(pc, "load_model", lambda name: FakeModel())
+    monkeypatch.setattr(pc, "compute_features", lambda df: df)
+    monkeypatch.setattr(pc, "bureau_store", BureauStore(store_dir, check_s=0))
+
+    payload = {"model_name": "best_model", "inputs": [ROW, {**ROW, "SK_ID_CURR": 100002, "nb_loans": 9.0}]}
+    resp = client.post("/predict/", json=payload)
+    app.dependency_overrides.clear()
+
+    assert resp.status_code == 200, resp.text
+    assert seen[0]["nb_loans"].tolist() == [3.0, 9.0]
+    assert seen[0]["sum_debt"].tolist() == [1250.0, 50.0]
+    stored = sorted(r.raw_data["nb_loans"] for r in session.query(MLInput).all())
+    assert stored == [3.0, 9.0]
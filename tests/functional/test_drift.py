@@ -0,0 +1,149 @@
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.main import app
+from src.config.db import get_db
+from src.drift.sketch import record_feature_stats
+from src.models.drift_stats import DriftFeatureStat
+
+
+def test_drift_scores_from_stats(tmp_path):
+    db_path = tmp_path / "testing.db"
+    engine = create_engine(
+        f"sqlite:///{db_path}",
+        connect_args={"check_same_thread": False},
+        future=True,
+    )
+    SQLSession = sessionmaker(
+        bind=engine,
+        autoflush=False,
+        autocommit=False,
+        future=True,
+    )
+
+    DriftFeatureStat.__table__.create(bind=engine)
+
+    session = SQLSession()
+
+    def get_db_override():
+        try:
+            yield session
+        finally:
+            pass
+
+    app.dependency_overrides[get_db] = get_db_override
+
+    client = TestClient(app, raise_server_exceptions=False)
+
+    now = datetime(2025, 11, 20, 12, 30, tzinfo=timezone.utc)
+    ref_ts = now - timedelta(days=2)
+
+    ref = pd.DataFrame({
+        "SK_ID_CURR": range(200),
+        "EXT_SOURCE_2": [i / 200 for i in range(200)],
+        "AMT_CREDIT": [100000.0 + i for i in range(200)],
+        "CODE_GENDER": ["M", "F"] * 100,
+    })
+    cur = ref.assign(
+        EXT_SOURCE_2=[0.9 + i / 2000 for i in range(200)],
+        CODE_GENDER=["M"] * 200,
+    )
+
+    record_feature_stats(session, "best_model", ref.iloc[:100], ref_ts)
+    record_feature_stats(session, "best_model", ref.iloc[100:], ref_ts)
+    record_feature_stats(session, "best_model", cur, now)
+    session.commit()
+
+    assert session.get(
+        DriftFeatureStat, ("best_model", ref_ts.replace(minute=0), "CODE_GENDER", "F")
+    ).count == 100
+
+    resp = client.get(
+        "/drift/best_model",
+        params={
+            "start": (now - timedelta(hours=1)).isoformat(),
+            "end": (now + timedelta(hours=1)).isoformat(),
+        },
+    )
+    missing = client.get("/drift/unknown")
+
+    app.dependency_overrides.clear()
+    session.close()
+
+    assert resp.status_code == 200, resp.text
+    scores = {f["feature"]: f for f in resp.json()["features"]}
+
+    assert scores["EXT_SOURCE_2"]["drifted"] is True
+    assert scores["EXT_SOURCE_2"]["ks"] > 0.8
+    assert scores["CODE_GENDER"]["drifted"] is True
+    assert scores["CODE_GENDER"]["ks"] is None
+    assert scores["AMT_CREDIT"]["drifted"] is False
+    assert scores["AMT_CREDIT"]["psi"] == 0.0
+    assert "SK_ID_CURR" not in scores
+
+    assert missing.status_code == 404
+
+
+def test_drift_against_reference_profile(tmp_path, monkeypatch):
+    from src.drift.reference import (
+        build_reference_profile,
+        out_of_range,
+        read_reference_profile,
+        save_reference_profile,
+    )
+    import src.controllers.drift_controller as dc
+
+    train = pd.DataFrame({
+        "SK_ID_CURR": range(1000),
+        "EXT_SOURCE_2": [i / 1000 for i in range(1000)],
+        "AMT_CREDIT": [None] * 100 + [50000.0 + 10 * i for i in range(900)],
+        "CODE_GENDER": ["M", "F"] * 500,
+    })
+    path = save_reference_profile(build_reference_profile(train, "best_model"), tmp_path)
+    profile = read_reference_profile(path)
+
+    amt = profile["features"]["AMT_CREDIT"]
+    assert amt["null_count"] == 100
+    assert len(amt["quantile_edges"]) == 11
+    assert sum(amt["quantile_hist"]) == 900
+    assert profile["features"]["CODE_GENDER"]["mode"] in ("M", "F")
+    assert "DAYS_BIRTH" in profile["missing_features"]
+
+    live = pd.DataFrame({
+        "EXT_SOURCE_2": [0.5, 1.5],
+        "AMT_CREDIT": [55000.0, 55000.0],
+        "CODE_GENDER": ["XNA", "M"],
+    })
+    mask = out_of_range(profile, live)
+    assert mask.columns[mask.loc[0]].tolist() == ["CODE_GENDER"]
+    assert mask.columns[mask.loc[1]].tolist() == ["EXT_SOURCE_2"]
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'testing.db'}", future=True)
+    DriftFeatureStat.__table__.create(bind=engine)
+    session = sessionmaker(bind=engine, future=True)()
+
+    now = datetime.now(timezone.utc)
+    record_feature_stats(session, "best_model", train.assign(CODE_GENDER="M"), now)
+    session.commit()
+
+    def get_db_override():
+        yield session
+
+    app.dependency_overrides[get_db] = get_db_override
+    monkeypatch.setattr(dc, "load_reference_profile", lambda name: profile)
+
+    resp = TestClient(app).get("/drift/best_model", params={"baseline": "profile"})
+
+    app.dependency_overrides.clear()
+    session.close()
+
+    assert resp.status_code == 200, resp.text
+    body = resp.json()
+    assert body["reference_profile_version"] == profile["version"]
+    scores = {f["feature"]: f for f in body["features"]}
+    assert scores["EXT_SOURCE_2"]["psi"] == 0.0
+    assert scores["CODE_GENDER"]["drifted"] is True
@@ -0,0 +1,104 @@
+from datetime import datetime, timezone
+import uuid
+
+import numpy as np
+import pandas as pd
+from fastapi.testclient import TestClient
+from lightgbm import LGBMClassifier
+from sklearn.compose import ColumnTransformer
+from sklearn.pipeline import Pipeline
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from src.main import app
+from src.config.db import get_db
+from src.explain import get_explainer
+from src.models.ml import MLModel
+from src.models.ml_explanation import MLExplanation
+from src.models.ml_inputs import MLInput
+from src.models.ml_output import MLOutput
+
+FEATURES = ["EXT_SOURCE_2", "EXT_SOURCE_3", "AMT_CREDIT"]
+
+
+def _tree_pipeline():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.random((300, 3)), columns=FEATURES)
+    y = (X["EXT_SOURCE_2"] + 0.3 * X["EXT_SOURCE_3"] < 0.6).astype(int)
+    return Pipeline([
+        ("preprocessing", ColumnTransformer([("num", "passthrough", FEATURES)])),
+        ("clf", LGBMClassifier(n_estimators=20, num_leaves=4, verbose=-1)),
+    ]).fit(X, y)
+
+
+def test_explain_sync_and_background(tmp_path, monkeypatch):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'testing.db'}",
+        connect_args={"check_same_thread": False},
+        future=True,
+    )
+    SQLSession = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+
+    for table in (MLModel, MLInput, MLOutput, MLExplanation):
+        table.__table__.create(bind=engine)
+
+    session = SQLSession()
+
+    def get_db_override():
+        try:
+            yield session
+        finally:
+            pass
+
+    app.dependency_overrides[get_db] = get_db_override
+
+    session.add(MLModel(
+        id=uuid.uuid4(),
+        name="best_model",
+        created_at=datetime(2025, 9, 15, tzinfo=timezone.utc),
+        is_active=True,
+    ))
+    session.commit()
+
+    model = _tree_pipeline()
+
+    import src.controllers.predict_controller as pc
+
+    monkeypatch.setattr(pc, "load_model", lambda name: model)
+
+    inputs = [
+        {"SK_ID_CURR": 1, "EXT_SOURCE_2": 0.1, "EXT_SOURCE_3": 0.2, "AMT_CREDIT": 0.5},
+        {"SK_ID_CURR": 2, "EXT_SOURCE_2": 0.9, "EXT_SOURCE_3": 0.8, "AMT_CREDIT": 0.5},
+    ]
+    client = TestClient(app)
+
+    sync = client.post(
+        "/predict/explain", params={"top_k": 2},
+        json={"model_name": "best_model", "inputs": inputs},
+    )
+    explainer = get_explainer(model)
+
+    background = client.post(
+        "/predict/", params={"explain": "background", "top_k": 2},
+        json={"model_name": "best_model", "inputs": inputs},
+    )
+    stored = session.execute(select(MLExplanation.contributions)).scalars().all()
+
+    app.dependency_overrides.clear()
+    session.close()
+
+    assert sync.status_code == 200, sync.text
+    results = sync.json()["results"]
+    assert [r["label"] for r in results] == ["non_solvable", "solvable"]
+    for r in results:
+        assert len(r["contributions"]) == 2
+        abs_values = [abs(c["contribution"]) for c in r["contributions"]]
+        assert abs_values == sorted(abs_values, reverse=True)
+    assert results[0]["contributions"][0]["feature"] == "num__EXT_SOURCE_2"
+
+    # Explainer construit une fois et réutilisé pour la seconde requête.
+    assert get_explainer(model) is explainer
+
+    assert background.status_code == 200, background.text
+    assert len(stored) == 2
+    assert stored[0] == results[0]["contributions"]
@@ -0,0 +1,271 @@
+from datetime import datetime, timezone
+import uuid
+
+import pandas as pd
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from src.main import app
+from src.config.db import get_db
+from src.models.ml import MLModel
+from src.models.ml_inputs import MLInput
+from src.models.ml_input_features import ml_input_features
+from src.models.ml_output import MLOutput
+from src.features import compute_features
+from src.schemas.ModelFeatures import ModelFeatures
+from src.storage.feature_archive import ParquetFeatureArchive
+from src.storage.feature_rebuild import iter_rebuilt_features
+
+
+class FakeModel:
+    classes_ = [0, 1]
+
+    def predict_proba(self, X: pd.DataFrame):
+        return [[0.3, 0.7] for _ in range(len(X))]
+
+
+def test_predict_with_typed_feature_columns(tmp_path, monkeypatch):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'testing.db'}",
+        connect_args={"check_same_thread": False},
+        future=True,
+    )
+    SQLSession = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+
+    MLModel.__table__.create(bind=engine)
+    MLInput.__table__.create(bind=engine)
+    MLOutput.__table__.create(bind=engine)
+    ml_input_features.create(bind=engine)
+
+    session = SQLSession()
+
+    def get_db_override():
+        try:
+            yield session
+        finally:
+            pass
+
+    app.dependency_overrides[get_db] = get_db_override
+
+    session.add(MLModel(
+        id=uuid.uuid4(),
+        name="best_model",
+        created_at=datetime(2025, 9, 15, tzinfo=timezone.utc),
+        is_active=True,
+    ))
+    session.commit()
+
+    import src.controllers.predict_controller as pc
+
+    monkeypatch.setattr(pc, "load_model", lambda name: FakeModel())
+    monkeypatch.setattr(pc, "FEATURE_STORAGE", "columns")
+
+    payload = {
+        "model_name": "best_model",
+        "inputs": [
+            {
+                "SK_ID_CURR": 100005,
+                "CODE_GENDER": "M",
+                "CNT_CHILDREN": 0,
+                "CNT_FAM_MEMBERS": 2.0,
+                "AMT_INCOME_TOTAL": 99000.0,
+                "AMT_CREDIT": 222768.0,
+                "AMT_ANNUITY": 17370.0,
+                "DAYS_BIRTH": -18064,
+                "DAYS_EMPLOYED": -4469,
+                "EXT_SOURCE_2": 0.29,
+            },
+            {
+                "SK_ID_CURR": 100006,
+                "CODE_GENDER": "F",
+                "CNT_CHILDREN": 1,
+                "CNT_FAM_MEMBERS": 3.0,
+                "AMT_INCOME_TOTAL": 120000.0,
+                "AMT_CREDIT": 300000.0,
+                "AMT_ANNUITY": 20000.0,
+                "DAYS_BIRTH": -12000,
+                "DAYS_EMPLOYED": -1000,
+            },
+        ],
+    }
+
+    resp = TestClient(app).post("/predict/", json=payload)
+
+    inputs = session.execute(select(MLInput.features)).scalars().all()
+    rows = session.execute(
+        select(ml_input_features).order_by(ml_input_features.c.SK_ID_CURR)
+    ).mappings().all()
+
+    app.dependency_overrides.clear()
+    session.close()
+
+    assert resp.status_code == 200, resp.text
+    assert inputs == [None, None]
+    assert [r["SK_ID_CURR"] for r in rows] == [100005, 100006]
+    assert rows[0]["CODE_GENDER"] == "M"
+    assert rows[0]["EXT_SOURCE_2_ISNA"] == 0
+    assert rows[1]["EXT_SOURCE_2_ISNA"] == 1
+    assert rows[1]["CHILDREN_RATIO"] == 1 / 3
+    assert rows[0]["model_name"] == "best_model"
+
+
+def test_parquet_feature_archive_rotation(tmp_path):
+    archive = ParquetFeatureArchive(tmp_path, max_rows=3, max_age_s=3600)
+    ts = datetime(2025, 11, 20, 12, 0, tzinfo=timezone.utc)
+    X = pd.DataFrame({"SK_ID_CURR": [1, 2], "AMT_CREDIT": [1.0, None], "CODE_GENDER": ["M", None]})
+
+    archive.append([uuid.uuid4(), uuid.uuid4()], X, "best_model", ts)
+    assert not list(tmp_path.rglob("*.parquet"))
+
+    archive.append([uuid.uuid4(), uuid.uuid4()], X, "best_model", ts)
+    segments = list(tmp_path.rglob("*.parquet"))
+    assert len(segments) == 1
+    assert segments[0].parent == tmp_path / "model_name=best_model" / "date=2025-11-20"
+
+    archive.append([uuid.uuid4()], X.iloc[:1], "other_model", ts)
+    archive.flush()
+
+    df = pd.read_parquet(tmp_path / "model_name=best_model")
+    assert len(df) == 4
+    assert df["AMT_CREDIT"].isna().sum() == 2
+    assert "EXT_SOURCE_1_ISNA" in df.columns
+    assert len(list(tmp_path.rglob("*.parquet"))) == 2
+
+
+def test_lazy_features_rebuilt_per_request(tmp_path, monkeypatch):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'testing.db'}",
+        connect_args={"check_same_thread": False},
+        future=True,
+    )
+    SQLSession = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+
+    MLModel.__table__.create(bind=engine)
+    MLInput.__table__.create(bind=engine)
+    MLOutput.__table__.create(bind=engine)
+
+    session = SQLSession()
+
+    def get_db_override():
+        try:
+            yield session
+        finally:
+            pass
+
+    app.dependency_overrides[get_db] = get_db_override
+
+    session.add(MLModel(
+        id=uuid.uuid4(),
+        name="best_model",
+        created_at=datetime(2025, 9, 15, tzinfo=timezone.utc),
+        is_active=True,
+    ))
+    session.commit()
+
+    import src.controllers.predict_controller as pc
+
+    monkeypatch.setattr(pc, "load_model", lambda name: FakeModel())
+    monkeypatch.setattr(pc, "FEATURE_STORAGE", "lazy")
+
+    base = {"CNT_FAM_MEMBERS": 3.0, "AMT_INCOME_TOTAL": 90000.0, "AMT_ANNUITY": 9000.0}
+    batches = [
+        [
+            {**base, "SK_ID_CURR": 1, "CODE_GENDER": "M", "CNT_CHILDREN": 0, "DAYS_BIRTH": -12000,
+             "AMT_CREDIT": 1000.0, "EXT_SOURCE_2": 0.2},
+            {**base, "SK_ID_CURR": 2, "CODE_GENDER": "F", "CNT_CHILDREN": 2, "DAYS_BIRTH": -15000,
+             "AMT_CREDIT": 3000.0},
+            {**base, "SK_ID_CURR": 3, "CNT_CHILDREN": 1, "DAYS_BIRTH": -9000,
+             "AMT_CREDIT": 5000.0, "EXT_SOURCE_2": 0.6},
+        ],
+        [
+            {**base, "SK_ID_CURR": 4, "CODE_GENDER": "F", "CNT_CHILDREN": 0, "DAYS_BIRTH": -20000,
+             "AMT_CREDIT": 4000.0, "EXT_SOURCE_2": 0.9},
+            {**base, "SK_ID_CURR": 5, "CNT_CHILDREN": 3, "DAYS_BIRTH": -11000, "AMT_CREDIT": 2000.0},
+        ],
+    ]
+    client = TestClient(app)
+    request_ids = []
+    for inputs in batches:
+        resp = client.post("/predict/", json={"model_name": "best_model", "inputs": inputs})
+        assert resp.status_code == 200, resp.text
+        request_ids.append(resp.headers["X-Request-ID"])
+
+    stored = session.execute(
+        select(MLInput.features, MLInput.feature_pipeline_version)
+    ).all()
+    stored_request_ids = session.execute(select(MLInput.request_id)).scalars().all()
+
+    app.dependency_overrides.clear()
+    session.close()
+
+    # chunk_rows=2 : le premier lot (3 lignes) chevauche deux paquets.
+    chunks = list(iter_rebuilt_features(engine, "best_model", chunk_rows=2))
+    rebuilt = pd.concat(chunks, ignore_index=True).sort_values("SK_ID_CURR", ignore_index=True)
+
+    expected = pd.concat(
+        [
+            compute_features(pd.DataFrame([ModelFeatures(**x).model_dump() for x in inputs]))
+            for inputs in batches
+        ],
+        ignore_index=True,
+    )
+
+    assert stored == [(None, "1")] * 5
+    assert sorted(stored_request_ids) == sorted([request_ids[0]] * 3 + [request_ids[1]] * 2)
+    assert len(chunks) == 2
+    pd.testing.assert_frame_equal(
+        rebuilt.drop(columns=["input_id", "created_at"]),
+        expected,
+        check_dtype=False,
+    )
+
+
+def test_rebuild_separates_requests_with_same_created_at(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'testing.db'}", future=True)
+    MLInput.__table__.create(bind=engine)
+
+    created_at = datetime(2026, 9, 1, 12, tzinfo=timezone.utc)
+    base = {"CNT_FAM_MEMBERS": 3.0, "AMT_INCOME_TOTAL": 90000.0, "AMT_ANNUITY": 9000.0}
+    batches = {
+        "req-a": [
+            {**base, "SK_ID_CURR": 1, "CODE_GENDER": "M", "CNT_CHILDREN": 0, "DAYS_BIRTH": -12000,
+             "AMT_CREDIT": 1000.0, "EXT_SOURCE_2": 0.2},
+            {**base, "SK_ID_CURR": 2, "CNT_CHILDREN": 2, "DAYS_BIRTH": -15000, "AMT_CREDIT": 3000.0},
+        ],
+        "req-b": [
+            {**base, "SK_ID_CURR": 3, "CODE_GENDER": "F", "CNT_CHILDREN": 4, "DAYS_BIRTH": -20000,
+             "AMT_CREDIT": 9000.0, "EXT_SOURCE_2": 0.9},
+            {**base, "SK_ID_CURR": 4, "CNT_CHILDREN": 1, "DAYS_BIRTH": -9000, "AMT_CREDIT": 5000.0},
+        ],
+    }
+    # Deux /predict concurrents, même created_at : l'imputation reste propre à chaque lot.
+    with engine.begin() as conn:
+        conn.execute(MLInput.__table__.insert(), [
+            {
+                "id": uuid.uuid4(),
+                "created_at": created_at,
+                "model_name": "best_model",
+                "request_id": request_id,
+                "raw_data": ModelFeatures(**row).model_dump(),
+                "feature_pipeline_version": "1",
+            }
+            for request_id, rows in batches.items()
+            for row in rows
+        ])
+
+    rebuilt = pd.concat(list(iter_rebuilt_features(engine, "best_model")), ignore_index=True)
+    rebuilt = rebuilt.sort_values("SK_ID_CURR", ignore_index=True)
+    expected = pd.concat(
+        [
+            compute_features(pd.DataFrame([ModelFeatures(**x).model_dump() for x in rows]))
+            for rows in batches.values()
+        ],
+        ignore_index=True,
+    )
+
+    pd.testing.assert_frame_equal(
+        rebuilt.drop(columns=["input_id", "created_at"]),
+        expected,
+        check_dtype=False,
+    )
@@ -0,0 +1,95 @@
+import asyncio
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+import src.middleware.profiling as profiling
+from src import stack_profile
+from src.config.db import get_db
+from src.main import app
+from src.middleware.profiling import ProfilingMiddleware
+from src.models.profiling import ProfilingLog
+
+
+def busy_scoring(seconds: float) -> int:
+    n = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        n += 1
+    return n
+
+
+def test_sampler_collapses_worker_thread_stacks():
+    sampler = stack_profile.start(interval_ms=2)
+    assert sampler is not None
+    # Une seule requête échantillonnée à la fois.
+    assert stack_profile.start() is None
+    try:
+        asyncio.run(asyncio.to_thread(busy_scoring, 0.2))
+    finally:
+        stacks = stack_profile.stop(sampler)
+
+    busy = {s: c for s, c in stacks.items() if s.endswith("busy_scoring (tests/functional/test_flamegraph.py)")}
+    assert sum(busy.values()) >= 10
+    # Pile complète, de la racine du thread à la fonction.
+    assert all(s.startswith("Thread._bootstrap (threading.py)") for s in busy)
+    assert stack_profile.decode(stack_profile.encode(stacks)) == stacks
+
+
+def test_flamegraph_merges_sampled_profiles(tmp_path, monkeypatch):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'testing.db'}",
+        connect_args={"check_same_thread": False},
+    )
+    ProfilingLog.__table__.create(bind=engine)
+    SQLSession = sessionmaker(bind=engine)
+    monkeypatch.setattr(profiling, "get_async_sessionmaker", lambda: None)
+    monkeypatch.setattr(profiling, "get_sessionmaker", lambda: SQLSession)
+
+    work = FastAPI()
+    work.add_middleware(ProfilingMiddleware, enabled=True, stacks_sample_rate=1.0)
+
+    @work.post("/score/{model_name}")
+    async def score(model_name: str, request: Request):
+        request.state.model_name = model_name
+        return {"n": await asyncio.to_thread(busy_scoring, 0.1)}
+
+    with TestClient(work) as client:
+        for model_name in ("best_model", "best_model", "other_model"):
+            assert client.post(f"/score/{model_name}").status_code == 200
+
+    with SQLSession() as db:
+        logs = db.execute(select(ProfilingLog)).scalars().all()
+    assert len(logs) == 3
+    assert {log.model_name for log in logs} == {"best_model", "other_model"}
+    assert all(log.full_profile for log in logs)
+
+    session = SQLSession()
+
+    def get_db_override():
+        yield session
+
+    app.dependency_overrides[get_db] = get_db_override
+    client = TestClient(app, raise_server_exceptions=False)
+
+    merged = client.get("/monitoring/flamegraph", params={"model_name": "best_model"})
+    everything = client.get("/monitoring/flamegraph", params={"endpoint": "/score/other_model"})
+    empty = client.get("/monitoring/flamegraph", params={"model_name": "unknown"})
+
+    app.dependency_overrides.clear()
+    session.close()
+
+    assert merged.status_code == 200, merged.text
+    assert merged.headers["content-type"].startswith("text/plain")
+    assert merged.headers["X-Profiles"] == "2"
+    lines = merged.text.splitlines()
+    counts = [int(line.rpartition(" ")[2]) for line in lines]
+    assert counts == sorted(counts, reverse=True)
+    busy = sum(c for line, c in zip(lines, counts) if "busy_scoring (" in line)
+    assert busy >= 5
+
+    assert everything.headers["X-Profiles"] == "1"
+    assert empty.status_code == 404
@@ -75,3 +75,71 @@ def test_list_ml_models_simple(tmp_path):
     data = resp.json()
     names = {row["name"] for row in data}
     assert names == {"baseline", "best_model", "logistic_regression"}
+
+
+def test_list_ml_models_keyset_and_etag(tmp_path):
+    from src.model_registry import model_list_cache
+    from src.models.ml import MLRegistryVersion
+
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'testing.db'}",
+        connect_args={"check_same_thread": False},
+        future=True,
+    )
+    SQLSession = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+
+    MLModel.__table__.create(bind=engine)
+    MLRegistryVersion.__table__.create(bind=engine)
+
+    session = SQLSession()
+
+    def get_db_override():
+        try:
+            yield session
+        finally:
+            pass
+
+    app.dependency_overrides[get_db] = get_db_override
+    model_list_cache.clear()
+
+    session.add(MLRegistryVersion(id=1, version=1))
+    session.add_all([
+        MLModel(
+            id=uuid.UUID(f"5b1c7b3a-0000-4000-8000-00000000000{i}"),
+            name=f"model_{i}",
+            created_at=datetime(2025, 9, 15 + i // 2, tzinfo=timezone.utc),
+            is_active=True,
+        )
+        for i in range(5)
+    ])
+    session.commit()
+
+    client = TestClient(app)
+
+    names, url = [], "/?limit=2"
+    while url:
+        resp = client.get(url)
+        assert resp.status_code == 200
+        names += [row["name"] for row in resp.json()]
+        url = resp.links.get("next", {}).get("url")
+
+    first = client.get("/?limit=2")
+    cached = client.get("/?limit=2", headers={"If-None-Match": first.headers["ETag"]})
+
+    # Modèle ajouté mais version inchangée : page resservie depuis le cache.
+    session.add(MLModel(name="model_new", created_at=datetime(2026, 1, 1), is_active=True))
+    session.get(MLRegistryVersion, 1).version = 2
+    session.commit()
+    stale = client.get("/?limit=2")
+    model_list_cache.clear()
+    fresh = client.get("/?limit=2", headers={"If-None-Match": first.headers["ETag"]})
+
+    app.dependency_overrides.clear()
+    model_list_cache.clear()
+    session.close()
+
+    assert names == ["model_4", "model_3", "model_2", "model_1", "model_0"]
+    assert cached.status_code == 304
+    assert stale.json() == first.json()
+    assert fresh.status_code == 200
+    assert fresh.json()[0]["name"] == "model_new"
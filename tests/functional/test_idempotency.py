@@ -0,0 +1,123 @@
+from datetime import datetime, timezone
+import threading
+import uuid
+
+import pandas as pd
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import src.idempotency as idem
+from src.main import app
+from src.config.db import get_db
+from src.models.idempotency import IdempotencyClaim
+from src.models.ml import MLModel
+from src.models.ml_inputs import MLInput
+from src.models.ml_output import MLOutput
+
+ROW = {
+    "SK_ID_CURR": 100005,
+    "NAME_CONTRACT_TYPE": "Cash loans",
+    "CODE_GENDER": "M",
+    "FLAG_OWN_CAR": "N",
+    "FLAG_OWN_REALTY": "Y",
+    "CNT_CHILDREN": 0,
+    "AMT_INCOME_TOTAL": 99000.0,
+    "AMT_CREDIT": 222768.0,
+    "AMT_ANNUITY": 17370.0,
+    "DAYS_BIRTH": -18064,
+    "DAYS_EMPLOYED": -4469,
+}
+
+
+def test_idempotency_key_replays_and_waits(tmp_path, monkeypatch):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'testing.db'}",
+        connect_args={"check_same_thread": False},
+    )
+    SQLSession = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    for model in (MLModel, MLInput, MLOutput, IdempotencyClaim):
+        model.__table__.create(bind=engine)
+
+    session = SQLSession()
+    session.add(MLModel(
+        id=uuid.uuid4(),
+        name="best_model",
+        created_at=datetime(2025, 9, 15, tzinfo=timezone.utc),
+        is_active=True,
+    ))
+    session.commit()
+
+    def get_db_override():
+        yield session
+
+    app.dependency_overrides[get_db] = get_db_override
+    client = TestClient(app, raise_server_exceptions=False)
+
+    calls = []
+
+    class FakeModel:
+        classes_ = [0, 1]
+
+        def predict_proba(self, X: pd.DataFrame):
+            calls.append(len(X))
+            return [[0.2 + 0.5 * i, 0.8 - 0.5 * i] for i in range(len(X))]
+
+    import src.controllers.predict_controller as pc
+    monkeypatch.setattr(pc, "load_model", lambda name: FakeModel())
+    monkeypatch.setattr(pc, "compute_features", lambda df: df)
+    monkeypatch.setattr(idem, "IDEMPOTENCY_POLL_S", 0.05)
+
+    payload = {"model_name": "best_model", "inputs": [ROW, {**ROW, "SK_ID_CURR": 100006}]}
+    headers = {"Idempotency-Key": "client-42"}
+
+    first = client.post("/predict/", json=payload, headers=headers)
+    assert first.status_code == 200, first.text
+    assert first.headers["X-Request-ID"] == "client-42"
+    assert "Idempotent-Replayed" not in first.headers
+
+    again = client.post("/predict/", json=payload, headers=headers)
+    assert again.status_code == 200
+    assert again.headers["Idempotent-Replayed"] == "true"
+    assert again.json() == first.json()
+    assert calls == [2]
+    assert session.query(MLOutput).filter(MLOutput.request_id == "client-42").count() == 2
+    assert session.query(IdempotencyClaim).count() == 0
+
+    other = client.post("/predict/", json={**payload, "inputs": [ROW]}, headers=headers)
+    assert other.status_code == 422
+
+    # Même nombre de lignes, autres valeurs : refusé, pas resservi.
+    changed = client.post(
+        "/predict/",
+        json={**payload, "inputs": [ROW, {**ROW, "SK_ID_CURR": 100007}]},
+        headers=headers,
+    )
+    assert changed.status_code == 422
+    assert "Idempotent-Replayed" not in changed.headers
+
+    # Ordre des clés JSON sans effet sur l'empreinte.
+    reordered = {**payload, "inputs": [dict(reversed(list(r.items()))) for r in payload["inputs"]]}
+    assert client.post("/predict/", json=reordered, headers=headers).status_code == 200
+    assert calls == [2]
+
+    # Clé tenue par une requête en cours : le doublon attend sa fin.
+    session.add(IdempotencyClaim(key="client-43", created_at=datetime.now(timezone.utc)))
+    session.commit()
+    monkeypatch.setattr(idem, "IDEMPOTENCY_WAIT_S", 0.2)
+    busy = client.post("/predict/", json=payload, headers={"Idempotency-Key": "client-43"})
+    assert busy.status_code == 409
+
+    monkeypatch.setattr(idem, "IDEMPOTENCY_WAIT_S", 5)
+
+    def finish_first():
+        other_session = SQLSession()
+        idem.release_claim(other_session, "client-43")
+        other_session.close()
+
+    threading.Timer(0.3, finish_first).start()
+    waited = client.post("/predict/", json=payload, headers={"Idempotency-Key": "client-43"})
+    app.dependency_overrides.clear()
+
+    assert waited.status_code == 200, waited.text
+    assert calls == [2, 2]
@@ -0,0 +1,127 @@
+from datetime import datetime, timezone
+import uuid
+
+import pandas as pd
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.main import app
+from src.config.db import get_async_engine, get_db
+from src.models.ml import MLModel
+from src.models.ml_inputs import MLInput
+from src.models.ml_output import MLOutput
+from src.pool_metrics import InstrumentedQueuePool, pool_metrics
+
+ROW = {
+    "SK_ID_CURR": 100005,
+    "NAME_CONTRACT_TYPE": "Cash loans",
+    "CODE_GENDER": "M",
+    "FLAG_OWN_CAR": "N",
+    "FLAG_OWN_REALTY": "Y",
+    "CNT_CHILDREN": 0,
+    "AMT_INCOME_TOTAL": 99000.0,
+    "AMT_CREDIT": 222768.0,
+    "AMT_ANNUITY": 17370.0,
+    "AMT_GOODS_PRICE": 180000.0,
+    "NAME_TYPE_SUITE": "Unaccompanied",
+    "NAME_INCOME_TYPE": "Working",
+    "NAME_EDUCATION_TYPE": "Secondary / secondary special",
+    "NAME_FAMILY_STATUS": "Married",
+    "NAME_HOUSING_TYPE": "House / apartment",
+    "REGION_POPULATION_RELATIVE": 0.035792,
+    "DAYS_BIRTH": -18064,
+    "DAYS_EMPLOYED": -4469,
+    "DAYS_REGISTRATION": -9118,
+    "DAYS_ID_PUBLISH": -1623,
+    "WEEKDAY_APPR_PROCESS_START": "FRIDAY",
+    "HOUR_APPR_PROCESS_START": 9,
+    "ORGANIZATION_TYPE": "Self-employed",
+}
+
+
+def test_predict_releases_connection_during_inference(tmp_path, monkeypatch):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'testing.db'}",
+        connect_args={"check_same_thread": False},
+        poolclass=InstrumentedQueuePool,
+        pool_size=2,
+        max_overflow=0,
+    )
+    SQLSession = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    for model in (MLModel, MLInput, MLOutput):
+        model.__table__.create(bind=engine)
+
+    session = SQLSession()
+    session.add(MLModel(
+        id=uuid.uuid4(),
+        name="best_model",
+        created_at=datetime(2025, 9, 15, tzinfo=timezone.utc),
+        is_active=True,
+    ))
+    session.commit()
+    session.close()
+
+    def get_db_override():
+        yield session
+
+    app.dependency_overrides[get_db] = get_db_override
+    client = TestClient(app, raise_server_exceptions=False)
+
+    checked_out = []
+
+    class FakeModel:
+        classes_ = [0, 1]
+
+        def predict_proba(self, X: pd.DataFrame):
+            checked_out.append(engine.pool.checkedout())
+            return [[0.3, 0.7] for _ in range(len(X))]
+
+    def fake_compute_features(df: pd.DataFrame) -> pd.DataFrame:
+        checked_out.append(engine.pool.checkedout())
+        return df
+
+    import src.controllers.predict_controller as pc
+    monkeypatch.setattr(pc, "load_model", lambda name: FakeModel())
+    monkeypatch.setattr(pc, "compute_features", fake_compute_features)
+
+    pool_metrics.reset()
+    resp = client.post("/predict/", json={"model_name": "best_model", "inputs": [ROW, ROW]})
+    app.dependency_overrides.clear()
+
+    assert resp.status_code == 200, resp.text
+    assert checked_out == [0, 0]
+    assert engine.pool.checkedout() == 0
+    assert session.query(MLOutput).count() == 2
+    session.close()
+
+    # Lookup du modèle, puis écritures : deux checkouts chronométrés.
+    stats = pool_metrics.snapshot(engine.pool)
+    assert stats["checkouts"] >= 2
+    assert stats["checkout_latency_ms"]["count"] == stats["checkouts"]
+    assert stats["size"] == 2 and stats["checked_out"] == 0
+
+    resp = client.get("/monitoring/pool")
+    assert resp.status_code == 200
+    assert set(resp.json()["checkout_latency_ms"]) == {
+        *(f"le_{b}" for b in pool_metrics.bounds_ms), "count",
+    }
+    # 404 sans engine async (SQLite), 200 avec (Postgres en CI).
+    expected = 404 if get_async_engine() is None else 200
+    assert client.get("/monitoring/pool?engine=async").status_code == expected
+
+
+def test_overridden_get_db_disables_async_session(tmp_path, monkeypatch):
+    import asyncio
+
+    import src.config.db as db_config
+
+    # Engine async configuré (Postgres en CI) : ignoré dès que get_db est surchargé.
+    monkeypatch.setattr(db_config, "get_async_sessionmaker", lambda: object())
+    engine = create_engine(f"sqlite:///{tmp_path / 'testing.db'}")
+
+    async def first(db):
+        return await anext(db_config.get_async_db(db))
+
+    with sessionmaker(bind=engine)() as session:
+        assert asyncio.run(first(session)) is None
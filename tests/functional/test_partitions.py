@@ -0,0 +1,114 @@
+import asyncio
+import uuid
+from datetime import date, datetime, timezone
+
+import pandas as pd
+from sqlalchemy import text
+
+from src.jobs.partitions import _add_months, _partition_month, apply_retention, ensure_partitions, list_partitions
+
+
+def test_add_months():
+    assert _add_months(date(2025, 1, 15), 0) == date(2025, 1, 1)
+    assert _add_months(date(2025, 1, 31), 1) == date(2025, 2, 1)
+    assert _add_months(date(2025, 3, 1), 9) == date(2025, 12, 1)
+    assert _add_months(date(2025, 12, 1), 1) == date(2026, 1, 1)
+    assert _add_months(date(2025, 1, 1), 25) == date(2027, 2, 1)
+    assert _add_months(date(2025, 1, 1), -1) == date(2024, 12, 1)
+    assert _add_months(date(2025, 6, 1), -18) == date(2023, 12, 1)
+
+
+def test_partition_month():
+    assert _partition_month("ml_inputs_p2025_03") == date(2025, 3, 1)
+    assert _partition_month("ml_input_features_p2024_12") == date(2024, 12, 1)
+    assert _partition_month("ml_inputs_default") is None
+    assert _partition_month("ml_inputs_p2025_03_old") is None
+    assert _partition_month("ml_inputs_p2025_13") is None
+
+
+def _name(table: str, month: date) -> str:
+    return f"{table}_p{month:%Y_%m}"
+
+
+def test_ensure_partitions_and_retention(pg_engine, tmp_path):
+    table = f"test_part_{uuid.uuid4().hex[:8]}"
+    this_month = datetime.now(timezone.utc).date().replace(day=1)
+    months = {k: _add_months(this_month, k) for k in (-9, -8, -7, -6)}
+
+    with pg_engine.begin() as conn:
+        conn.execute(text(
+            f'CREATE TABLE "{table}" (id integer, created_at timestamptz NOT NULL) '
+            "PARTITION BY RANGE (created_at)"
+        ))
+    try:
+        with pg_engine.begin() as conn:
+            assert ensure_partitions(conn, months_ahead=2, tables=[table]) == 3
+            assert ensure_partitions(conn, months_ahead=2, tables=[table]) == 0
+            conn.execute(
+                text("SELECT ensure_monthly_partitions(:t, :a, :b)"),
+                {"t": table, "a": months[-8], "b": months[-6]},
+            )
+            conn.execute(
+                text(f'INSERT INTO "{table}" VALUES (1, :a), (2, :a), (3, :b)'),
+                {
+                    "a": datetime.combine(months[-8], datetime.min.time(), timezone.utc),
+                    "b": datetime.combine(months[-6], datetime.min.time(), timezone.utc),
+                },
+            )
+            listed = list_partitions(conn, table)
+
+        assert [month for _, month in listed] == [
+            months[-8], months[-7], months[-6],
+            this_month, _add_months(this_month, 1), _add_months(this_month, 2),
+        ]
+        assert listed[0][0] == _name(table, months[-8])
+
+        # Rétention 6 mois : les mois -8 et -7 partent, -6 reste.
+        handled = apply_retention(pg_engine, keep_months=6, mode="archive", archive_dir=tmp_path, tables=[table])
+        assert handled == [_name(table, months[-8]), _name(table, months[-7])]
+
+        archived = pd.read_parquet(tmp_path / table / _name(table, months[-8]))
+        assert sorted(archived["id"]) == [1, 2]
+
+        with pg_engine.begin() as conn:
+            assert conn.execute(text("SELECT to_regclass(:p)"), {"p": handled[0]}).scalar() is None
+            assert conn.execute(text(f'SELECT count(*) FROM "{table}"')).scalar() == 1
+            conn.execute(
+                text("SELECT ensure_monthly_partitions(:t, :a, :a)"),
+                {"t": table, "a": months[-9]},
+            )
+
+        # Mode detach : la partition sort de la table mais reste en base.
+        detached = apply_retention(pg_engine, keep_months=6, mode="detach", tables=[table])
+        assert detached == [_name(table, months[-9])]
+        with pg_engine.begin() as conn:
+            assert conn.execute(text("SELECT to_regclass(:p)"), {"p": detached[0]}).scalar() is not None
+            assert months[-9] not in [month for _, month in list_partitions(conn, table)]
+    finally:
+        with pg_engine.begin() as conn:
+            conn.execute(text(f'DROP TABLE IF EXISTS "{table}" CASCADE'))
+            conn.execute(text(f'DROP TABLE IF EXISTS "{_name(table, months[-9])}"'))
+
+
+def test_partition_loop_keeps_creating_partitions(monkeypatch):
+    import src.jobs.partitions as partitions
+
+    calls = []
+
+    def ensure_once(engine):
+        calls.append(engine)
+        if len(calls) == 1:
+            raise RuntimeError("base indisponible")
+        return 1
+
+    monkeypatch.setattr(partitions, "ensure_once", ensure_once)
+
+    async def scenario():
+        loop = asyncio.create_task(partitions.partition_loop("engine", interval_s=0.01))
+        while len(calls) < 3:
+            await asyncio.sleep(0.01)
+        loop.cancel()
+
+    # Une erreur n'arrête pas la boucle.
+    asyncio.run(asyncio.wait_for(scenario(), 5))
+    assert calls[:3] == ["engine"] * 3
@@ -3,7 +3,7 @@ import uuid
 
 import pandas as pd
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, func, select
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.compiler import compiles
@@ -131,3 +131,83 @@ def test_batch_predict_simple(tmp_path, monkeypatch):
     item = body["results"][0]
     assert item["label"] in ("solvable", "non_solvable")
     assert 0.0 <= item["proba"] <= 1.0
+
+
+def test_batch_predict_pipelined_chunks(tmp_path, monkeypatch):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'testing.db'}",
+        connect_args={"check_same_thread": False},
+        future=True,
+    )
+    SQLSession = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+
+    MLModel.__table__.create(bind=engine)
+    MLInput.__table__.create(bind=engine)
+    MLOutput.__table__.create(bind=engine)
+
+    session = SQLSession()
+
+    def get_db_override():
+        try:
+            yield session
+        finally:
+            pass
+
+    app.dependency_overrides[get_db] = get_db_override
+
+    session.add(MLModel(
+        id=uuid.uuid4(),
+        name="best_model",
+        created_at=datetime(2025, 9, 15, tzinfo=timezone.utc),
+        is_active=True,
+    ))
+    session.commit()
+
+    class ParityModel:
+        """Défaut si SK_ID_CURR impair ; échoue sur SK_ID_CURR == 99."""
+
+        classes_ = [0, 1]
+
+        def predict_proba(self, X: pd.DataFrame):
+            if (X["SK_ID_CURR"] == 99).any():
+                raise ValueError("boom")
+            return [[0.1, 0.9] if x % 2 else [0.9, 0.1] for x in X["SK_ID_CURR"]]
+
+    import src.controllers.predict_controller as pc
+
+    monkeypatch.setattr(pc, "load_model", lambda name: ParityModel())
+    monkeypatch.setattr(pc, "PREDICT_CHUNK_ROWS", 2)
+
+    client = TestClient(app)
+    ok = client.post("/predict/", json={
+        "model_name": "best_model",
+        "inputs": [{"SK_ID_CURR": i} for i in range(1, 8)],
+    })
+    failed = client.post("/predict/", json={
+        "model_name": "best_model",
+        "inputs": [{"SK_ID_CURR": i} for i in (10, 11, 12, 99, 13)],
+    })
+
+    pairs = session.execute(
+        select(MLInput.raw_data, MLOutput.prediction)
+        .join(MLOutput, MLOutput.input_id == MLInput.id)
+    ).all()
+    n_inputs = session.execute(select(func.count()).select_from(MLInput)).scalar_one()
+
+    app.dependency_overrides.clear()
+    session.close()
+
+    assert ok.status_code == 200, ok.text
+    assert [r["label"] for r in ok.json()["results"]] == [
+        "non_solvable" if i % 2 else "solvable" for i in range(1, 8)
+    ]
+    assert len(pairs) == 7
+    assert all(
+        label == ("non_solvable" if raw["SK_ID_CURR"] % 2 else "solvable")
+        for raw, label in pairs
+    )
+
+    # Échec au 2e chunk : rien n'est persisté pour cette requête.
+    assert failed.status_code == 400
+    assert "prédiction" in failed.json()["detail"]
+    assert n_inputs == 7
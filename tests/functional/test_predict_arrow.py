@@ -0,0 +1,99 @@
+from datetime import datetime, timezone
+import uuid
+
+import pandas as pd
+import pyarrow as pa
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.main import app
+from src.config.db import get_db
+from src.models.idempotency import IdempotencyClaim
+from src.models.ml import MLModel
+from src.models.ml_inputs import MLInput
+from src.models.ml_output import MLOutput
+from src.negotiation import ARROW_STREAM, preferred_format
+
+
+def test_preferred_format():
+    assert preferred_format(None) == "json"
+    assert preferred_format("*/*") == "json"
+    assert preferred_format("application/json") == "json"
+    assert preferred_format(ARROW_STREAM) == "arrow"
+    assert preferred_format(f"{ARROW_STREAM}, application/json;q=0.5") == "arrow"
+    assert preferred_format(f"application/json, {ARROW_STREAM};q=0.9") == "json"
+    assert preferred_format(f"{ARROW_STREAM};q=0") == "json"
+
+
+def test_predict_arrow_matches_json(tmp_path, monkeypatch):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'testing.db'}",
+        connect_args={"check_same_thread": False},
+    )
+    SQLSession = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    for model in (MLModel, MLInput, MLOutput, IdempotencyClaim):
+        model.__table__.create(bind=engine)
+
+    session = SQLSession()
+    session.add(MLModel(
+        id=uuid.uuid4(),
+        name="best_model",
+        created_at=datetime(2025, 9, 15, tzinfo=timezone.utc),
+        is_active=True,
+    ))
+    session.commit()
+
+    def get_db_override():
+        yield session
+
+    app.dependency_overrides[get_db] = get_db_override
+    client = TestClient(app, raise_server_exceptions=False)
+
+    class ParityModel:
+        classes_ = [0, 1]
+
+        def predict_proba(self, X: pd.DataFrame):
+            return [[0.2, 0.8] if x % 2 else [0.7, 0.3] for x in X["SK_ID_CURR"]]
+
+    import src.controllers.predict_controller as pc
+    monkeypatch.setattr(pc, "load_model", lambda name: ParityModel())
+    monkeypatch.setattr(pc, "compute_features", lambda df: df)
+    monkeypatch.setattr(pc, "PREDICT_CHUNK_ROWS", 2)
+
+    payload = {"model_name": "best_model", "inputs": [{"SK_ID_CURR": i} for i in range(1, 6)]}
+
+    as_json = client.post("/predict/", json=payload)
+    as_arrow = client.post("/predict/", json=payload, headers={"Accept": ARROW_STREAM})
+    replayed = client.post(
+        "/predict/", json=payload, headers={"Accept": ARROW_STREAM, "Idempotency-Key": "k-1"},
+    )
+    replayed = client.post(
+        "/predict/", json=payload, headers={"Accept": ARROW_STREAM, "Idempotency-Key": "k-1"},
+    )
+
+    app.dependency_overrides.clear()
+    session.close()
+
+    assert as_json.status_code == 200, as_json.text
+    assert as_json.headers["content-type"] == "application/json"
+    expected = as_json.json()["results"]
+    assert [r["label"] for r in expected] == ["non_solvable", "solvable"] * 2 + ["non_solvable"]
+
+    assert as_arrow.status_code == 200, as_arrow.text
+    assert as_arrow.headers["content-type"] == ARROW_STREAM
+    assert as_arrow.headers["X-Request-ID"]
+    table = pa.ipc.open_stream(as_arrow.content).read_all()
+    assert pa.types.is_dictionary(table.schema.field("label").type)
+    assert table.schema.field("proba").type == pa.float64()
+    assert table.schema.metadata[b"model_name"] == b"best_model"
+    assert table.column("label").to_pylist() == [r["label"] for r in expected]
+    assert table.column("proba").to_pylist() == [r["proba"] for r in expected]
+    assert table.column("proba_defaut").to_pylist() == [0.8, 0.3, 0.8, 0.3, 0.8]
+
+    assert replayed.status_code == 200, replayed.text
+    assert replayed.headers["Idempotent-Replayed"] == "true"
+    assert replayed.headers["content-type"] == ARROW_STREAM
+    replay_table = pa.ipc.open_stream(replayed.content).read_all()
+    assert replay_table.column("label").to_pylist() == [r["label"] for r in expected]
+    assert replay_table.column("proba").to_pylist() == [r["proba"] for r in expected]
@@ -0,0 +1,99 @@
+from datetime import datetime, timedelta, timezone
+import io
+import json
+import uuid
+
+import pandas as pd
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.main import app
+from src.config.db import get_db
+from src.models.ml_output import MLOutput
+
+
+def test_predictions_keyset_stream(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'testing.db'}",
+        connect_args={"check_same_thread": False},
+        future=True,
+    )
+    SQLSession = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+
+    MLOutput.__table__.create(bind=engine)
+
+    session = SQLSession()
+
+    def get_db_override():
+        try:
+            yield session
+        finally:
+            pass
+
+    app.dependency_overrides[get_db] = get_db_override
+
+    t0 = datetime(2025, 11, 20, 12, 0, tzinfo=timezone.utc)
+    rows = []
+    # 3 requêtes de 3 lignes : plusieurs lignes partagent le même created_at.
+    for r in range(3):
+        for _ in range(3):
+            rows.append(MLOutput(
+                id=uuid.uuid4(),
+                input_id=uuid.uuid4(),
+                request_id=f"req-{r}",
+                model_name="best_model",
+                created_at=t0 + timedelta(minutes=r),
+                prediction="solvable",
+                proba_defaut=0.2,
+                meta={"request_id": f"req-{r}"},
+            ))
+    rows.append(MLOutput(
+        id=uuid.uuid4(), input_id=uuid.uuid4(), model_name="other_model",
+        created_at=t0, prediction="solvable",
+    ))
+    session.add_all(rows)
+    expected = [
+        str(r.id)
+        for r in sorted(rows[:-1], key=lambda r: (r.created_at, r.id.hex))
+    ]
+    session.commit()
+
+    client = TestClient(app)
+
+    pages, url = [], "/predictions?" + "&".join([
+        "model_name=best_model",
+        "start=2025-11-20T00:00:00%2B00:00",
+        "end=2025-11-21T00:00:00%2B00:00",
+        "limit=4",
+    ])
+    while url:
+        resp = client.get(url)
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("application/x-ndjson")
+        pages.append([json.loads(line) for line in resp.text.splitlines()])
+        url = resp.links.get("next", {}).get("url")
+
+    parquet = client.get("/predictions/requests/req-1", params={"format": "parquet"})
+
+    request_pages, url = [], "/predictions/requests/req-2?limit=2"
+    while url:
+        resp = client.get(url)
+        assert resp.status_code == 200
+        request_pages.append([json.loads(line)["id"] for line in resp.text.splitlines()])
+        url = resp.links.get("next", {}).get("url")
+
+    app.dependency_overrides.clear()
+    session.close()
+
+    assert [len(p) for p in pages] == [4, 4, 1]
+    assert [row["id"] for p in pages for row in p] == expected
+    assert pages[0][0]["meta"] == {"request_id": "req-0"}
+
+    assert parquet.status_code == 200
+    df = pd.read_parquet(io.BytesIO(parquet.content))
+    assert len(df) == 3
+    assert set(df["request_id"]) == {"req-1"}
+
+    assert [len(p) for p in request_pages] == [2, 1]
+    assert [i for p in request_pages for i in p] == expected[6:]
@@ -0,0 +1,101 @@
+from datetime import datetime, timedelta, timezone
+import uuid
+
+import pytest
+from sqlalchemy import create_engine, select
+
+import src.model_loader as model_loader
+from src.jobs.rescore import _groups, rescore
+from src.models.ml_inputs import MLInput
+from src.models.ml_output import MLOutput
+from src.models.rescore import RescoreCheckpoint
+
+T0 = datetime(2026, 9, 1, 12, tzinfo=timezone.utc)
+
+
+class FakeModel:
+    classes_ = [0, 1]
+    fail_on = None
+
+    def predict_proba(self, X):
+        ids = X["SK_ID_CURR"].tolist()
+        if self.fail_on in ids:
+            raise RuntimeError("boom")
+        return [[0.9, 0.1] if i % 2 else [0.2, 0.8] for i in ids]
+
+
+def _add_request(conn, created_at, ids, model_name="best_model"):
+    conn.execute(MLInput.__table__.insert(), [
+        {
+            "id": uuid.uuid4(),
+            "created_at": created_at,
+            "model_name": model_name,
+            "raw_data": {"SK_ID_CURR": i, "AMT_CREDIT": 1000.0},
+            "feature_pipeline_version": "1",
+        }
+        for i in ids
+    ])
+
+
+def test_groups_split_requests_sharing_created_at():
+    rows = [
+        MLInput(created_at=T0, request_id="req-a", feature_pipeline_version="1", raw_data={"SK_ID_CURR": 1}),
+        MLInput(created_at=T0, request_id="req-b", feature_pipeline_version="1", raw_data={"SK_ID_CURR": 2}),
+        MLInput(created_at=T0, request_id="req-a", feature_pipeline_version="1", raw_data={"SK_ID_CURR": 3}),
+        MLInput(created_at=T0, request_id=None, feature_pipeline_version="1", raw_data={"SK_ID_CURR": 4}),
+    ]
+    groups = _groups(rows)
+    assert [positions for positions, _, _ in groups] == [[0, 2], [1], [3]]
+    assert groups[0][2] == [{"SK_ID_CURR": 1}, {"SK_ID_CURR": 3}]
+
+
+def test_rescore_resumes_from_checkpoint(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'testing.db'}")
+    # Curseur de lecture ouvert pendant les écritures : WAL, comme Postgres, ne bloque pas l'écrivain.
+    with engine.connect() as conn:
+        conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+    for model in (MLInput, MLOutput, RescoreCheckpoint):
+        model.__table__.create(bind=engine)
+    with engine.begin() as conn:
+        _add_request(conn, T0, [1, 2, 3])
+        _add_request(conn, T0 + timedelta(minutes=1), [4, 5])
+        _add_request(conn, T0 + timedelta(minutes=2), [6], model_name="other_model")
+
+    model = FakeModel()
+    monkeypatch.setattr(model_loader, "load_model", lambda name: model)
+    monkeypatch.setattr(model_loader, "load_threshold", lambda name, model_version=None: 0.5)
+
+    # Échec sur la seconde requête : seul le premier paquet est validé.
+    model.fail_on = 4
+    with pytest.raises(RuntimeError):
+        rescore(engine, "best_model_v2", "v2", source_model="best_model", chunk_rows=2)
+
+    def outputs():
+        with engine.connect() as conn:
+            return conn.execute(
+                select(MLOutput.input_id, MLOutput.prediction, MLOutput.request_id, MLOutput.model_version)
+            ).all()
+
+    assert len(outputs()) == 3
+
+    model.fail_on = None
+    ck = rescore(engine, "best_model_v2", "v2", source_model="best_model", chunk_rows=2, workers=2)
+    assert ck.rows_done == 5
+
+    rows = outputs()
+    assert len({r.input_id for r in rows}) == 5
+    assert {(r.request_id, r.model_version) for r in rows} == {("rescore-best_model_v2@v2", "v2")}
+    assert sorted(r.prediction for r in rows) == ["non_solvable", "non_solvable", "solvable", "solvable", "solvable"]
+
+    # Nouvelles entrées : seules celles-ci sont re-scorées.
+    with engine.begin() as conn:
+        _add_request(conn, T0 + timedelta(minutes=3), [7])
+    ck = rescore(engine, "best_model_v2", "v2", source_model="best_model")
+    assert ck.rows_done == 6
+    assert len(outputs()) == 6
+
+    with engine.connect() as conn:
+        assert conn.execute(select(RescoreCheckpoint.completed_at)).scalar_one() is not None
+
+    with pytest.raises(ValueError):
+        rescore(engine, "best_model_v2", "v3", source_model="best_model", run_id="best_model_v2@v2")
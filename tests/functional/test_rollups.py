@@ -0,0 +1,84 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import insert, select
+
+from src.jobs.rollups import run_rollups
+from src.models.ml_output import MLOutput
+from src.models.profiling import ProfilingLog
+from src.models.rollups import PredictionRollup, RequestRollup
+
+
+def _output(model_name: str, created_at: datetime, label: str, request_id: str = "req-1") -> dict:
+    return {
+        "input_id": uuid.uuid4(),
+        "request_id": request_id,
+        "model_name": model_name,
+        "prediction": label,
+        "proba_defaut": 0.25,
+        "latency_ms": 40,
+        "created_at": created_at,
+    }
+
+
+def _log(model_name: str, created_at: datetime, total_time_ms: float) -> dict:
+    return {
+        "endpoint": "/predict/",
+        "method": "POST",
+        "model_name": model_name,
+        "total_time_ms": total_time_ms,
+        "num_predictions": 2,
+        "created_at": created_at,
+    }
+
+
+def test_rollups_replace_buckets_and_count_late_rows(pg_engine):
+    model_name = f"rollup-{uuid.uuid4().hex[:8]}"
+    # Début de requête il y a 30 min : lignes validées bien après (gros lot).
+    started = datetime.now(timezone.utc) - timedelta(minutes=30)
+    minute = started.replace(second=0, microsecond=0)
+
+    def counts(conn):
+        rows = conn.execute(
+            select(PredictionRollup.label, PredictionRollup.count, PredictionRollup.lat_le_50)
+            .where(PredictionRollup.model_name == model_name, PredictionRollup.granularity == "1m")
+        ).all()
+        assert all(r.count == r.lat_le_50 for r in rows)
+        return {r.label: r.count for r in rows}
+
+    def requests(conn):
+        return conn.execute(
+            select(RequestRollup.count, RequestRollup.max_total_ms, RequestRollup.bucket_start)
+            .where(RequestRollup.model_name == model_name, RequestRollup.granularity == "1h")
+        ).one()
+
+    with pg_engine.connect() as conn:
+        trans = conn.begin()
+        try:
+            conn.execute(insert(MLOutput.__table__), [
+                _output(model_name, started, "solvable"),
+                _output(model_name, started, "non_solvable"),
+                _output(model_name, started, "solvable", request_id="rescore-v2-abc"),
+            ])
+            conn.execute(insert(ProfilingLog.__table__), [_log(model_name, started, 120.0)])
+            run_rollups(conn, late_s=3600)
+
+            assert counts(conn) == {"solvable": 1, "non_solvable": 1}
+            assert requests(conn).count == 1
+
+            # Passe répétée : buckets remplacés, pas additionnés.
+            run_rollups(conn, late_s=3600)
+            assert counts(conn) == {"solvable": 1, "non_solvable": 1}
+
+            # Lignes validées après la passe, avec un created_at antérieur au watermark.
+            conn.execute(insert(MLOutput.__table__), [_output(model_name, started, "solvable", request_id="req-2")])
+            conn.execute(insert(ProfilingLog.__table__), [_log(model_name, started, 900.0)])
+            run_rollups(conn, late_s=3600)
+
+            assert counts(conn) == {"solvable": 2, "non_solvable": 1}
+            hourly = requests(conn)
+            assert hourly.count == 2
+            assert hourly.max_total_ms == 900.0
+            assert hourly.bucket_start == minute.replace(minute=0)
+        finally:
+            trans.rollback()
@@ -0,0 +1,52 @@
+from joblib import Parallel, parallel_config
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import StratifiedKFold, cross_validate
+from sklearn.tree import DecisionTreeClassifier
+
+from utils.scoring import _scoring, score_classification
+
+
+def test_parallel_cached_scoring_matches_cross_validate(credit_data, credit_pipeline, tmp_path):
+    X, y = credit_data()
+    model = credit_pipeline(LogisticRegression())
+
+    reference = cross_validate(
+        model, X, y,
+        cv=StratifiedKFold(n_splits=3, shuffle=True, random_state=42),
+        scoring=_scoring(),
+    )
+    serial = score_classification("LR", model, X, y, cv=3)
+    assert serial["Test"]["ROC-AUC"] == round(reference["test_roc_auc"].mean(), 3)
+    assert serial["Test"]["F1"] == round(reference["test_f1"].mean(), 3)
+
+    cached = score_classification("LR", model, X, y, cv=3, n_jobs=2, memory=tmp_path, track_memory=True)
+    assert cached["Test"] == serial["Test"]
+    assert cached["Train"] == serial["Train"]
+    assert [f["Fold"] for f in cached["Folds"]] == [0, 1, 2]
+    assert not any(f["Preprocessing cached"] for f in cached["Folds"])
+    assert all(f["Peak memory (MB)"] is not None for f in cached["Folds"])
+    assert all(f["Peak memory (MB)"] is None for f in serial["Folds"])
+
+    # Même préprocesseur, autre classifieur : les folds transformés sont réutilisés.
+    tree = score_classification(
+        "Tree", credit_pipeline(DecisionTreeClassifier(random_state=0)), X, y, cv=3, memory=tmp_path
+    )
+    assert all(f["Preprocessing cached"] for f in tree["Folds"])
+
+
+def test_track_memory_serializes_thread_backend(credit_data, credit_pipeline, monkeypatch):
+    import utils.scoring as scoring
+
+    calls = []
+    monkeypatch.setattr(scoring, "Parallel", lambda n_jobs: calls.append(n_jobs) or Parallel(n_jobs=n_jobs))
+    X, y = credit_data()
+    model = credit_pipeline(LogisticRegression())
+
+    with parallel_config(backend="threading"):
+        tracked = score_classification("LR", model, X, y, cv=3, n_jobs=2, track_memory=True)
+        score_classification("LR", model, X, y, cv=3, n_jobs=2)
+    score_classification("LR", model, X, y, cv=3, n_jobs=2, track_memory=True)
+
+    # tracemalloc global : pas deux folds suivis en même temps dans un processus.
+    assert calls == [1, 2, 2]
+    assert all(f["Peak memory (MB)"] is not None for f in tracked["Folds"])
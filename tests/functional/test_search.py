@@ -0,0 +1,40 @@
+from sklearn.tree import DecisionTreeClassifier
+
+from utils.search import halving_search
+
+
+def test_halving_search_prunes_and_checks_latency_budget(credit_data, credit_pipeline, tmp_path):
+    X, y = credit_data(600)
+    grid = {"clf__max_depth": [1, 2, 3, 4, 6, 8], "clf__min_samples_leaf": [1, 20]}
+
+    result = halving_search(
+        "Tree",
+        credit_pipeline(DecisionTreeClassifier(random_state=0)),
+        grid,
+        X,
+        y,
+        cv=3,
+        min_resources=50,
+        n_jobs=2,
+        cache_dir=tmp_path,
+        latency_budget_ms=1e6,
+        latency_rows=5,
+        tracking_uri=None,
+    )
+
+    # 12 candidats, factor 3 : 12 -> 4 -> 2 sur 3 tours, le dernier sur tout le fold.
+    assert result["Resources"][-1] == 400
+    assert len(result["Resources"]) == 3
+    rungs = [len(c["Rungs"]) for c in result["Candidates"]]
+    assert rungs.count(3) == 2 and rungs.count(2) == 2 and rungs.count(1) == 8
+    assert all(c["Within budget"] for c in result["Candidates"])
+    assert result["Best"] is result["Candidates"][0]
+
+    # Folds relus depuis le cache ; un budget intenable n'élit aucun candidat.
+    again = halving_search(
+        "Tree", credit_pipeline(DecisionTreeClassifier(random_state=0)), grid, X, y,
+        cv=3, min_resources=50, n_jobs=1, cache_dir=tmp_path,
+        latency_budget_ms=0, latency_rows=5, tracking_uri=None,
+    )
+    assert again["Best"] is None
+    assert [c["Params"] for c in again["Candidates"]] == [c["Params"] for c in result["Candidates"]]
@@ -0,0 +1,47 @@
+from datetime import datetime, timezone
+import os
+import uuid
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import src.config.db as db_config
+import src.model_loader as model_loader
+from src.models.ml import MLModel
+from src.server import memory_report, preload_models
+
+
+def test_preload_active_models_most_recent_first(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'testing.db'}")
+    SQLSession = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    MLModel.__table__.create(bind=engine)
+
+    session = SQLSession()
+    for name, day, active in (("old_model", 1, True), ("new_model", 2, True), ("off_model", 3, False)):
+        session.add(MLModel(
+            id=uuid.uuid4(),
+            name=name,
+            created_at=datetime(2025, 9, day, tzinfo=timezone.utc),
+            is_active=active,
+        ))
+    session.commit()
+    session.close()
+
+    loaded = []
+    monkeypatch.setattr(db_config, "SessionLocal", SQLSession)
+    monkeypatch.setattr(model_loader, "load_model", loaded.append)
+    monkeypatch.setattr(model_loader, "load_threshold", lambda name, model_version=None: 0.5)
+    monkeypatch.setattr(model_loader, "load_reference_profile", lambda name: None)
+
+    monkeypatch.setattr(model_loader, "MODEL_CACHE_SIZE", 1)
+    assert preload_models() == ["new_model"]
+
+    monkeypatch.setattr(model_loader, "MODEL_CACHE_SIZE", 4)
+    assert preload_models() == ["new_model", "old_model"]
+    assert loaded == ["new_model", "new_model", "old_model"]
+
+
+def test_memory_report_lists_workers():
+    report = memory_report({os.getpid(): 0, 999999999: 1})
+    assert [r["worker"] for r in report] == [0]
+    assert report[0]["uss_mb"] > 0
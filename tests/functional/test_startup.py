@@ -0,0 +1,31 @@
+import os
+import subprocess
+import sys
+
+from src.jobs.startup_profile import parse_importtime
+
+IMPORTTIME = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     _json
+import time:      1500 |       1620 |   json
+import time:       300 |       1920 | src.main
+"""
+
+
+def test_parse_importtime():
+    rows = parse_importtime(IMPORTTIME)
+    assert [r["module"] for r in rows] == ["_json", "json", "src.main"]
+    assert rows[1] == {"module": "json", "self_ms": 1.5, "cumulative_ms": 1.62, "depth": 1}
+
+
+def test_import_main_is_lazy():
+    # Sans DATABASE_URL : ni Settings, ni engine, ni client Hugging Face à l'import.
+    env = {k: v for k, v in os.environ.items() if k != "DATABASE_URL"}
+    out = subprocess.run(
+        [sys.executable, "-c", (
+            "import sys, src.main; "
+            "print(sorted(m for m in ('huggingface_hub', 'joblib', 'psutil', 'psycopg') if m in sys.modules))"
+        )],
+        capture_output=True, text=True, env=env, check=True,
+    )
+    assert out.stdout.strip() == "[]"
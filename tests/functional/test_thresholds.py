@@ -0,0 +1,140 @@
+import json
+
+import numpy as np
+from sklearn.metrics import confusion_matrix
+
+from src.model_loader import threshold_filename
+from utils.thresholds import cost_curve, optimal_threshold, save_threshold
+
+
+def _brute_force(y, proba, grid, cost_fn=10.0, cost_fp=1.0):
+    costs = []
+    for s in grid:
+        tn, fp, fn, tp = confusion_matrix(y, (proba >= s).astype(int), labels=[0, 1]).ravel()
+        costs.append(fp * cost_fp + fn * cost_fn)
+    return np.array(costs)
+
+
+def test_cost_curve_matches_confusion_matrices():
+    rng = np.random.default_rng(0)
+    y = rng.integers(0, 2, 500)
+    proba = np.round(np.clip(0.3 * y + rng.random(500) * 0.7, 0, 1), 2)  # ex aequo
+
+    grid = np.linspace(0, 1, 200)
+    _, costs = cost_curve(y, proba, grid=grid)
+    np.testing.assert_array_equal(costs, _brute_force(y, proba, grid))
+
+    thresholds, costs = cost_curve(y, proba)
+    np.testing.assert_array_equal(costs, _brute_force(y, proba, thresholds))
+
+    t, cost = optimal_threshold(y, proba)
+    assert cost == _brute_force(y, proba, [t])[0] == _brute_force(y, proba, grid).min()
+
+
+def test_threshold_loaded_with_model(tmp_path, monkeypatch):
+    import src.model_loader as ml
+
+    save_threshold(tmp_path / "best_model.threshold.json", 0.12, cost=3.0)
+    monkeypatch.setattr(ml, "ARTIFACTS_DIR", tmp_path)
+
+    assert ml.load_threshold("best_model") == 0.12
+    assert ml.load_threshold("missing_model") == ml.DEFAULT_THRESHOLD
+    assert json.loads((tmp_path / "best_model.threshold.json").read_text())["cost_fn"] == 10.0
+
+
+def test_threshold_keyed_on_model_version(tmp_path, monkeypatch):
+    import src.model_loader as ml
+
+    monkeypatch.setattr(ml, "ARTIFACTS_DIR", tmp_path)
+    save_threshold(tmp_path / threshold_filename("best_model", "1"), 0.2, model_version="1")
+
+    assert ml.load_threshold("best_model", "1") == 0.2
+    assert ml.load_threshold("best_model", "2") == ml.DEFAULT_THRESHOLD
+    assert ml.load_threshold("best_model") == ml.DEFAULT_THRESHOLD
+
+    # Absence mise en cache jusqu'à THRESHOLD_MISS_TTL_S : pas de nouvelle recherche.
+    save_threshold(tmp_path / threshold_filename("best_model", "2"), 0.3, model_version="2")
+    assert ml.load_threshold("best_model", "2") == ml.DEFAULT_THRESHOLD
+
+    monkeypatch.setattr(ml, "_threshold_misses", {})
+    assert ml.load_threshold("best_model", "2") == 0.3
+    assert ml.load_threshold("best_model", "1") == 0.2
+
+
+def test_threshold_miss_not_retried_within_ttl(monkeypatch):
+    import src.model_loader as ml
+
+    reads = []
+
+    def missing(name, model_version):
+        reads.append((name, model_version))
+        raise FileNotFoundError(name)
+
+    monkeypatch.setattr(ml, "_read_threshold", missing)
+    for _ in range(3):
+        assert ml.load_threshold("best_model", "3") == ml.DEFAULT_THRESHOLD
+    assert reads == [("best_model", "3")]
+
+    monkeypatch.setattr(ml, "THRESHOLD_MISS_TTL_S", 0)
+    monkeypatch.setattr(ml, "_threshold_misses", {})
+    ml.load_threshold("best_model", "3")
+    ml.load_threshold("best_model", "3")
+    assert len(reads) == 3
+
+
+def test_predict_uses_registered_model_version(tmp_path, monkeypatch):
+    import uuid
+    from datetime import datetime, timezone
+
+    import pandas as pd
+    from fastapi.testclient import TestClient
+    from sqlalchemy import create_engine, select
+    from sqlalchemy.orm import sessionmaker
+
+    import src.controllers.predict_controller as pc
+    import src.model_loader as ml
+    from src.config.db import get_db
+    from src.main import app
+    from src.models.ml import MLModel
+    from src.models.ml_inputs import MLInput
+    from src.models.ml_output import MLOutput
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'testing.db'}", connect_args={"check_same_thread": False})
+    for model in (MLModel, MLInput, MLOutput):
+        model.__table__.create(bind=engine)
+    session = sessionmaker(bind=engine)()
+    session.add(MLModel(
+        id=uuid.uuid4(), name="best_model", created_at=datetime.now(timezone.utc), is_active=True, version="7",
+    ))
+    session.commit()
+
+    # Seuil de la version enregistrée, pas celui du modèle sans version.
+    monkeypatch.setattr(ml, "ARTIFACTS_DIR", tmp_path)
+    save_threshold(tmp_path / threshold_filename("best_model", "7"), 0.8, model_version="7")
+    save_threshold(tmp_path / threshold_filename("best_model"), 0.1)
+
+    class FakeModel:
+        classes_ = [0, 1]
+
+        def predict_proba(self, X: pd.DataFrame):
+            return [[0.4, 0.6] for _ in range(len(X))]
+
+    monkeypatch.setattr(pc, "load_model", lambda name: FakeModel())
+    monkeypatch.setattr(pc, "compute_features", lambda df: df)
+
+    def get_db_override():
+        yield session
+
+    app.dependency_overrides[get_db] = get_db_override
+    try:
+        resp = TestClient(app, raise_server_exceptions=False).post(
+            "/predict/", json={"model_name": "best_model", "inputs": [{"SK_ID_CURR": 1}]},
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert resp.status_code == 200, resp.text
+    assert resp.json()["results"][0]["label"] == "solvable"
+    out = session.execute(select(MLOutput.model_version, MLOutput.threshold)).one()
+    assert tuple(out) == ("7", 0.8)
+    session.close()
@@ -0,0 +1,83 @@
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter, ValidationError
+
+from src.main import app
+from src.schemas.ModelFeatures import ModelFeatures
+from src.validation import bulk_validate
+
+
+ROWS = [
+    {"SK_ID_CURR": 1, "CNT_CHILDREN": 2.0, "AMT_CREDIT": "1e3", "CODE_GENDER": "  M  "},
+    {"SK_ID_CURR": 2, "CNT_CHILDREN": True, "AMT_CREDIT": None, "NAME_TYPE_SUITE": "x" * 300},
+    {"SK_ID_CURR": "3", "CNT_CHILDREN": " 4 ", "AMT_INCOME_TOTAL": 0, "unknown_field": 1},
+]
+
+
+def test_bulk_validation_matches_pydantic():
+    df, errors = bulk_validate(ROWS)
+    expected = pd.DataFrame([ModelFeatures(**r).model_dump() for r in ROWS])
+
+    assert errors == []
+    pd.testing.assert_frame_equal(df, expected)
+
+
+def _pydantic(rows: list) -> tuple[pd.DataFrame | None, list]:
+    try:
+        models = TypeAdapter(list[ModelFeatures]).validate_python(rows)
+    except ValidationError as e:
+        return None, [(err["type"], err["loc"]) for err in e.errors()]
+    return pd.DataFrame([m.model_dump() for m in models]), []
+
+
+@pytest.mark.parametrize("rows", [
+    # Entiers au-delà de 2**53 : conservés exactement, sans passer par float64.
+    [{"SK_ID_CURR": 2**62 + 1, "DAYS_BIRTH": -(2**53) - 1}, {"SK_ID_CURR": 2, "DAYS_BIRTH": None}],
+    [{"SK_ID_CURR": 2**63}, {"SK_ID_CURR": 2**64 + 5}],
+    [{"SK_ID_CURR": "4611686018427387905", "CNT_CHILDREN": 2.0}],
+    # Chaînes : règles lax de Pydantic.
+    [{"SK_ID_CURR": "1e3", "AMT_CREDIT": "1e3"}, {"SK_ID_CURR": 2, "CNT_CHILDREN": "0x10"}],
+    [{"SK_ID_CURR": "1_000", "AMT_CREDIT": "2_500.5", "CNT_CHILDREN": " 4.00 "}],
+    [{"SK_ID_CURR": "_1", "CNT_CHILDREN": "1__0", "DAYS_BIRTH": "4.", "AMT_CREDIT": "nan"}],
+    # Valeurs non scalaires.
+    [{"SK_ID_CURR": [1], "CNT_CHILDREN": {}, "AMT_CREDIT": [1.0]}, {"SK_ID_CURR": 2}],
+    # Flottants non finis ou hors bornes pour un entier.
+    [{"SK_ID_CURR": float("inf"), "CNT_CHILDREN": 1e20}, {"SK_ID_CURR": 2, "CNT_CHILDREN": "3"}],
+])
+def test_bulk_validation_parity_with_pydantic(rows):
+    df, errors = bulk_validate(rows)
+    expected_df, expected_errors = _pydantic(rows)
+
+    assert [(e["type"], e["loc"][2:]) for e in errors] == expected_errors
+    if expected_df is not None:
+        pd.testing.assert_frame_equal(df, expected_df)
+
+
+def test_bulk_validation_keeps_large_ints_exact():
+    df, errors = bulk_validate([{"SK_ID_CURR": 2**62 + 1}, {"SK_ID_CURR": "1_000"}])
+
+    assert errors == []
+    assert df["SK_ID_CURR"].tolist() == [2**62 + 1, 1000]
+
+
+def test_bulk_validation_errors_via_predict(monkeypatch):
+    import src.validation as validation
+
+    monkeypatch.setattr(validation, "BULK_VALIDATION_MIN_ROWS", 1)
+
+    inputs = [dict(r) for r in ROWS]
+    inputs[0]["CNT_CHILDREN"] = 2.5
+    inputs[1]["AMT_ANNUITY"] = -1
+    inputs[2]["CODE_GENDER"] = 7
+    del inputs[2]["SK_ID_CURR"]
+
+    resp = TestClient(app).post("/predict/", json={"model_name": "best_model", "inputs": inputs})
+
+    assert resp.status_code == 422
+    assert [(e["type"], e["loc"]) for e in resp.json()["detail"]] == [
+        ("int_from_float", ["body", "inputs", 0, "CNT_CHILDREN"]),
+        ("greater_than_equal", ["body", "inputs", 1, "AMT_ANNUITY"]),
+        ("missing", ["body", "inputs", 2, "SK_ID_CURR"]),
+        ("string_type", ["body", "inputs", 2, "CODE_GENDER"]),
+    ]
@@ -1,66 +1,202 @@
-from sklearn.metrics import average_precision_score, make_scorer, precision_score, recall_score, f1_score, roc_auc_score
-from sklearn.model_selection import StratifiedKFold, cross_validate
+import time
+import tracemalloc
 
+from joblib import Memory, Parallel, delayed
+from joblib.parallel import BACKENDS, get_active_backend
+from sklearn.base import clone
+from sklearn.metrics import average_precision_score, get_scorer, make_scorer, precision_score, recall_score, f1_score, roc_auc_score
+from sklearn.model_selection import StratifiedKFold
 
-def score_classification(name, model_or_class, X, y, model_params=None, cv=5):
-    if callable(model_or_class):
-        model = model_or_class(**(model_params or {}))
-    else:
-        model = model_or_class
 
-    scoring = {
+def _scoring():
+    return {
         'accuracy': 'accuracy',
         'precision': make_scorer(precision_score, zero_division=0),
         'recall': make_scorer(recall_score, zero_division=0),
         'f1': make_scorer(f1_score, zero_division=0),
-        'roc_auc': make_scorer(roc_auc_score), 
-        'pr_auc': make_scorer(average_precision_score) 
+        'roc_auc': make_scorer(roc_auc_score),
+        'pr_auc': make_scorer(average_precision_score)
+    }
+
+
+def _take(X, idx):
+    return X.iloc[idx] if hasattr(X, "iloc") else X[idx]
+
+
+def _split_preprocessing(model):
+    """Sépare la première étape d'un pipeline (le préprocesseur) du reste.
+
+    Seule la première étape est mise en cache : dans un pipeline imblearn,
+    un SMOTE placé ensuite ne sait pas faire ``transform``.
+    """
+    steps = getattr(model, "steps", None)
+    if not steps or len(steps) < 2:
+        return None, model
+    first = steps[0][1]
+    if first in (None, "passthrough") or not hasattr(first, "transform"):
+        return None, model
+    return first, model[1:]
+
+
+def _fit_transform(preprocessor, X_train, y_train, X_test):
+    # Fonction cachée par joblib Memory : la clé est le hash des paramètres
+    # du préprocesseur et des données du fold, pas le classifieur.
+    fitted = clone(preprocessor).fit(X_train, y_train)
+    return fitted.transform(X_train), fitted.transform(X_test)
+
+
+def _shares_process(n_jobs) -> bool:
+    """Vrai si les folds tourneraient à plusieurs dans le même processus (threads)."""
+    backend, default_n_jobs = get_active_backend()
+    n_jobs = backend.effective_n_jobs(default_n_jobs if n_jobs is None else n_jobs)
+    return n_jobs > 1 and not isinstance(backend, (BACKENDS["loky"], BACKENDS["multiprocessing"]))
+
+
+def _score_fold(fold, model, X, y, train_idx, test_idx, scoring, fit_transform, track_memory):
+    if track_memory:
+        tracemalloc.start()
+
+    X_train, X_test = _take(X, train_idx), _take(X, test_idx)
+    y_train, y_test = _take(y, train_idx), _take(y, test_idx)
+
+    preprocessor, estimator = _split_preprocessing(model) if fit_transform else (None, model)
+    estimator = clone(estimator)
+
+    cached = False
+    start = time.perf_counter()
+    if preprocessor is not None:
+        cached = fit_transform.check_call_in_cache(preprocessor, X_train, y_train, X_test)
+        X_train, X_test = fit_transform(preprocessor, X_train, y_train, X_test)
+    preprocessing_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    estimator.fit(X_train, y_train)
+    fit_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    test_scores = {k: scorer(estimator, X_test, y_test) for k, scorer in scoring.items()}
+    score_time = time.perf_counter() - start
+    train_scores = {k: scorer(estimator, X_train, y_train) for k, scorer in scoring.items()}
+
+    peak = None
+    if track_memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return {
+        "fold": fold,
+        "train": train_scores,
+        "test": test_scores,
+        "preprocessing_time": preprocessing_time,
+        # Comme `fit_time` de cross_validate : préprocessing compris.
+        "fit_time": preprocessing_time + fit_time,
+        "score_time": score_time,
+        "peak_bytes": peak,
+        "cached": cached,
     }
 
 
-    results_cv = cross_validate(
-        model,
-        X,
-        y,
-        cv=StratifiedKFold(n_splits=cv, shuffle=True, random_state=42),
-        scoring=scoring,
-        return_train_score=True
+def score_classification(
+    name,
+    model_or_class,
+    X,
+    y,
+    model_params=None,
+    cv=5,
+    n_jobs=None,
+    memory=None,
+    track_memory=False,
+):
+    """Validation croisée stratifiée d'un classifieur.
+
+    - ``n_jobs`` : folds évalués en parallèle (joblib/loky). Les threads
+      OpenMP/BLAS de chaque worker (LightGBM) sont limités par loky pour
+      éviter la sur-souscription.
+    - ``memory`` : dossier ou ``joblib.Memory``. La première étape du pipeline
+      (ex. ``'preprocessing'``) est ajustée une fois par fold et mise en cache :
+      plusieurs classifieurs avec le même préprocesseur réutilisent les mêmes
+      folds transformés.
+    - ``track_memory`` : pic d'allocation (tracemalloc, Python et NumPy) par
+      fold, désactivé par défaut (tracemalloc ralentit l'ajustement).
+      ``tracemalloc`` est global au processus : avec un backend joblib à
+      threads, les folds sont alors évalués un par un.
+    """
+    if callable(model_or_class):
+        model = model_or_class(**(model_params or {}))
+    else:
+        model = model_or_class
+
+    scoring = {k: get_scorer(v) for k, v in _scoring().items()}
+
+    fit_transform = None
+    if memory is not None:
+        if not isinstance(memory, Memory):
+            memory = Memory(memory, verbose=0)
+        fit_transform = memory.cache(_fit_transform)
+
+    if track_memory and _shares_process(n_jobs):
+        print("[WARN] track_memory avec un backend joblib à threads : folds évalués un par un")
+        n_jobs = 1
+
+    splitter = StratifiedKFold(n_splits=cv, shuffle=True, random_state=42)
+    folds = Parallel(n_jobs=n_jobs)(
+        delayed(_score_fold)(i, model, X, y, train_idx, test_idx, scoring, fit_transform, track_memory)
+        for i, (train_idx, test_idx) in enumerate(splitter.split(X, y))
     )
 
-    
+    def mean(split, metric):
+        return sum(f[split][metric] for f in folds) / len(folds)
+
+    def mean_time(key):
+        return sum(f[key] for f in folds) / len(folds)
+
     print(f"📊 Model: {name}")
-    print(f"→ Accuracy      | Train: {results_cv['train_accuracy'].mean():.3f} | Test: {results_cv['test_accuracy'].mean():.3f}")
-    print(f"→ Precision     | Train: {results_cv['train_precision'].mean():.3f} | Test: {results_cv['test_precision'].mean():.3f}")
-    print(f"→ Recall        | Train: {results_cv['train_recall'].mean():.3f} | Test: {results_cv['test_recall'].mean():.3f}")
-    print(f"→ F1-score      | Train: {results_cv['train_f1'].mean():.3f} | Test: {results_cv['test_f1'].mean():.3f}")
-    print(f"→ ROC-AUC-score | Train: {results_cv['train_roc_auc'].mean():.3f} | Test: {results_cv['test_roc_auc'].mean():.3f}")
-    print(f"→ PR-AUC-score  | Train: {results_cv['train_pr_auc'].mean():.3f} | Test: {results_cv['test_pr_auc'].mean():.3f}")
+    print(f"→ Accuracy      | Train: {mean('train', 'accuracy'):.3f} | Test: {mean('test', 'accuracy'):.3f}")
+    print(f"→ Precision     | Train: {mean('train', 'precision'):.3f} | Test: {mean('test', 'precision'):.3f}")
+    print(f"→ Recall        | Train: {mean('train', 'recall'):.3f} | Test: {mean('test', 'recall'):.3f}")
+    print(f"→ F1-score      | Train: {mean('train', 'f1'):.3f} | Test: {mean('test', 'f1'):.3f}")
+    print(f"→ ROC-AUC-score | Train: {mean('train', 'roc_auc'):.3f} | Test: {mean('test', 'roc_auc'):.3f}")
+    print(f"→ PR-AUC-score  | Train: {mean('train', 'pr_auc'):.3f} | Test: {mean('test', 'pr_auc'):.3f}")
 
 
-    print(f"→ Train Time: {(results_cv['fit_time'].mean() * 1000):.2f} ms")
-    print(f"→ Predict Time: {(results_cv['score_time'].mean() * 1000):.2f} ms")
+    print(f"→ Train Time: {(mean_time('fit_time') * 1000):.2f} ms")
+    print(f"→ Predict Time: {(mean_time('score_time') * 1000):.2f} ms")
+    if track_memory:
+        print(f"→ Peak Memory: {max(f['peak_bytes'] for f in folds) / 2**20:.1f} MB")
 
     return {
         "Model": name,
         "Train": {
-            "Accuracy":  round(results_cv["train_accuracy"].mean(), 3),
-            "Precision": round(results_cv["train_precision"].mean(), 3),
-            "Recall":    round(results_cv["train_recall"].mean(), 3),
-            "F1":        round(results_cv["train_f1"].mean(), 3),
-            "ROC-AUC":   round(results_cv["train_roc_auc"].mean(), 3),
-            "PR-AUC":    round(results_cv["train_pr_auc"].mean(), 3),
+            "Accuracy":  round(mean("train", "accuracy"), 3),
+            "Precision": round(mean("train", "precision"), 3),
+            "Recall":    round(mean("train", "recall"), 3),
+            "F1":        round(mean("train", "f1"), 3),
+            "ROC-AUC":   round(mean("train", "roc_auc"), 3),
+            "PR-AUC":    round(mean("train", "pr_auc"), 3),
         },
         "Test": {
-            "Accuracy":  round(results_cv["test_accuracy"].mean(), 3),
-            "Precision": round(results_cv["test_precision"].mean(), 3),
-            "Recall":    round(results_cv["test_recall"].mean(), 3),
-            "F1":        round(results_cv["test_f1"].mean(), 3),
-            "ROC-AUC":   round(results_cv["test_roc_auc"].mean(), 3),
-            "PR-AUC":    round(results_cv["test_pr_auc"].mean(), 3),
+            "Accuracy":  round(mean("test", "accuracy"), 3),
+            "Precision": round(mean("test", "precision"), 3),
+            "Recall":    round(mean("test", "recall"), 3),
+            "F1":        round(mean("test", "f1"), 3),
+            "ROC-AUC":   round(mean("test", "roc_auc"), 3),
+            "PR-AUC":    round(mean("test", "pr_auc"), 3),
         },
         "Times (ms)": {
-            "Train":   round(results_cv["fit_time"].mean() * 1000, 2),
-            "Predict": round(results_cv["score_time"].mean() * 1000, 2),
-        }
+            "Train":   round(mean_time("fit_time") * 1000, 2),
+            "Predict": round(mean_time("score_time") * 1000, 2),
+        },
+        "Folds": [
+            {
+                "Fold": f["fold"],
+                "Preprocessing (ms)": round(f["preprocessing_time"] * 1000, 2),
+                "Train (ms)": round(f["fit_time"] * 1000, 2),
+                "Predict (ms)": round(f["score_time"] * 1000, 2),
+                "Peak memory (MB)": (
+                    round(f["peak_bytes"] / 2**20, 1) if f["peak_bytes"] is not None else None
+                ),
+                "Preprocessing cached": f["cached"],
+            }
+            for f in folds
+        ],
     }
-
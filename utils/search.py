@@ -0,0 +1,274 @@
+"""Recherche d'hyperparamètres par successive halving sur des folds en cache.
+
+Le préprocesseur (première étape du pipeline) est ajusté une fois par fold et
+stocké sur disque par joblib ``Memory`` — même cache que
+``score_classification(..., memory=...)``. Les matrices transformées sont
+rechargées en ``mmap_mode="r"`` : les workers loky les lisent sans copie.
+
+À chaque tour, les candidats restants sont entraînés sur un sous-échantillon
+des lignes de chaque fold ; seul le meilleur tiers (``factor``) passe au tour
+suivant, avec ``factor`` fois plus de lignes. Le dernier tour utilise tout le fold.
+"""
+import math
+import time
+from pathlib import Path
+
+import numpy as np
+from joblib import Memory, Parallel, delayed
+from sklearn.base import clone
+from sklearn.metrics import get_scorer
+from sklearn.model_selection import ParameterGrid, ParameterSampler, StratifiedKFold
+
+from utils.scoring import _fit_transform, _scoring, _split_preprocessing, _take
+
+SEARCH_CACHE_DIR = "cache/search"
+MLFLOW_TRACKING_URI = "file:./mlruns"
+LATENCY_SAMPLE_ROWS = 200
+
+METRIC_NAMES = {
+    "accuracy": "Accuracy",
+    "precision": "Precision",
+    "recall": "Recall",
+    "f1": "F1",
+    "roc_auc": "ROC-AUC",
+    "pr_auc": "PR-AUC",
+}
+
+
+def _cached_folds(preprocessor, X, y, cv, memory):
+    """Folds transformés, chargés depuis le cache disque en memmap."""
+    fit_transform = memory.cache(_fit_transform)
+    splitter = StratifiedKFold(n_splits=cv, shuffle=True, random_state=42)
+
+    folds = []
+    for train_idx, test_idx in splitter.split(X, y):
+        # Mêmes arguments que score_classification : mêmes entrées de cache.
+        X_train, X_test = _take(X, train_idx), _take(X, test_idx)
+        y_train, y_test = _take(y, train_idx), _take(y, test_idx)
+        Xt_train, Xt_test = fit_transform.call_and_shelve(
+            preprocessor, X_train, y_train, X_test
+        ).get()
+        folds.append((Xt_train, np.asarray(y_train), Xt_test, np.asarray(y_test), test_idx))
+    return folds
+
+
+def _evaluate(params, estimator, fold, n_resources, order, scoring, return_estimator):
+    X_train, y_train, X_test, y_test, _ = fold
+    estimator = clone(estimator).set_params(**params)
+
+    if n_resources is not None and n_resources < len(y_train):
+        rows = np.sort(order[:n_resources])
+        X_train, y_train = X_train[rows], y_train[rows]
+
+    start = time.perf_counter()
+    estimator.fit(X_train, y_train)
+    fit_time = time.perf_counter() - start
+
+    return {
+        "scores": {k: scorer(estimator, X_test, y_test) for k, scorer in scoring.items()},
+        "fit_time": fit_time,
+        "estimator": estimator if return_estimator else None,
+    }
+
+
+def _latency(preprocessor, estimator, X_rows):
+    """Latence d'une prédiction unitaire (préprocessing compris), en ms."""
+    times = []
+    for i in range(len(X_rows)):
+        row = X_rows.iloc[[i]] if hasattr(X_rows, "iloc") else X_rows[i:i + 1]
+        start = time.perf_counter()
+        estimator.predict_proba(preprocessor.transform(row))
+        times.append((time.perf_counter() - start) * 1000)
+    return float(np.percentile(times, 50)), float(np.percentile(times, 95))
+
+
+def _rung_resources(n_train, n_candidates, factor, min_resources):
+    n_rungs = 1
+    while factor ** n_rungs <= n_candidates:
+        n_rungs += 1
+    resources = [
+        max(min(min_resources, n_train), int(n_train * factor ** (i - n_rungs + 1)))
+        for i in range(n_rungs)
+    ]
+    resources[-1] = n_train
+    return resources
+
+
+def _log_mlflow(name, candidates, best, settings, tracking_uri, experiment):
+    import mlflow
+
+    mlflow.set_tracking_uri(tracking_uri)
+    mlflow.set_experiment(experiment)
+
+    with mlflow.start_run(run_name=f"{name}_halving"):
+        mlflow.set_tags({"stage": "search", "model_family": name, "strategy": "successive_halving"})
+        mlflow.log_params(settings)
+
+        for i, c in enumerate(candidates):
+            with mlflow.start_run(run_name=f"{name}_{i}", nested=True):
+                mlflow.log_params(c["Params"])
+                for rung in c["Rungs"]:
+                    mlflow.log_metrics(
+                        {f"test_{k}": v for k, v in rung["Test"].items()},
+                        step=rung["Resources"],
+                    )
+                if c["Latency p95 (ms)"] is not None:
+                    mlflow.log_metrics({
+                        "latency_p50_ms": c["Latency p50 (ms)"],
+                        "latency_p95_ms": c["Latency p95 (ms)"],
+                    })
+                mlflow.set_tags({
+                    "rung": len(c["Rungs"]) - 1,
+                    "within_budget": c["Within budget"],
+                })
+
+        if best is not None:
+            mlflow.log_params({f"best_{k}": v for k, v in best["Params"].items()})
+            mlflow.log_metrics({f"test_{k}": v for k, v in best["Rungs"][-1]["Test"].items()})
+
+
+def halving_search(
+    name,
+    pipeline,
+    param_grid,
+    X,
+    y,
+    cv=5,
+    n_candidates=None,
+    factor=3,
+    min_resources=500,
+    metric="roc_auc",
+    n_jobs=-1,
+    cache_dir=SEARCH_CACHE_DIR,
+    latency_budget_ms=None,
+    latency_rows=LATENCY_SAMPLE_ROWS,
+    tracking_uri=MLFLOW_TRACKING_URI,
+    experiment="credit_scoring",
+):
+    """Successive halving sur ``pipeline`` ; renvoie les candidats classés.
+
+    - ``param_grid`` : paramètres des étapes après le préprocesseur
+      (ex. ``{"clf__num_leaves": [15, 31]}``). Avec ``n_candidates``, tirage
+      aléatoire (``ParameterSampler``) au lieu de la grille complète.
+    - ``metric`` : clé de ``_scoring()`` utilisée pour classer (moyenne des folds).
+    - ``latency_budget_ms`` : budget p95 d'une prédiction unitaire ; la latence
+      est mesurée en série, hors pool, sur ``latency_rows`` lignes brutes.
+    - ``tracking_uri`` : store MLflow (fichiers locaux par défaut) ; ``None``
+      pour ne rien journaliser.
+    """
+    preprocessor, estimator = _split_preprocessing(pipeline)
+    if preprocessor is None:
+        raise ValueError("Le pipeline doit commencer par une étape de préprocessing.")
+
+    first_step = pipeline.steps[0][0]
+    if n_candidates is None:
+        candidates = list(ParameterGrid(param_grid))
+    else:
+        candidates = list(ParameterSampler(param_grid, n_candidates, random_state=42))
+    for params in candidates:
+        if any(k.startswith(f"{first_step}__") for k in params):
+            raise ValueError(f"Le préprocesseur '{first_step}' est partagé par tous les candidats.")
+
+    Path(cache_dir).mkdir(parents=True, exist_ok=True)
+    memory = Memory(cache_dir, mmap_mode="r", verbose=0)
+    folds = _cached_folds(preprocessor, X, y, cv, memory)
+
+    rng = np.random.default_rng(42)
+    orders = [rng.permutation(len(fold[1])) for fold in folds]
+    n_train = min(len(fold[1]) for fold in folds)
+    resources = _rung_resources(n_train, len(candidates), factor, min_resources)
+
+    # Préprocesseur ajusté une fois, pour mesurer la latence de bout en bout.
+    latency_preprocessor = None
+    latency_X = None
+    if latency_budget_ms is not None:
+        train_idx = np.setdiff1d(np.arange(len(X)), folds[0][4])
+        latency_preprocessor = clone(preprocessor).fit(_take(X, train_idx), _take(y, train_idx))
+        latency_X = _take(X, folds[0][4][:latency_rows])
+
+    scoring = {k: get_scorer(v) for k, v in _scoring().items()}
+    results = [
+        {"Params": params, "Rungs": [], "Latency p50 (ms)": None, "Latency p95 (ms)": None, "Within budget": None}
+        for params in candidates
+    ]
+    alive = list(range(len(candidates)))
+
+    with Parallel(n_jobs=n_jobs) as parallel:
+        for rung, n_resources in enumerate(resources):
+            start = time.perf_counter()
+            jobs = [(c, f) for c in alive for f in range(len(folds))]
+            outputs = parallel(
+                delayed(_evaluate)(
+                    candidates[c], estimator, folds[f],
+                    None if rung == len(resources) - 1 else n_resources, orders[f], scoring,
+                    latency_budget_ms is not None and f == 0,
+                )
+                for c, f in jobs
+            )
+
+            per_candidate = {c: [] for c in alive}
+            for (c, _), out in zip(jobs, outputs):
+                per_candidate[c].append(out)
+
+            for c, outs in per_candidate.items():
+                results[c]["Rungs"].append({
+                    "Rung": rung,
+                    "Resources": n_resources,
+                    "Test": {
+                        k: round(float(np.mean([o["scores"][k] for o in outs])), 3)
+                        for k in scoring
+                    },
+                    "Train (ms)": round(float(np.mean([o["fit_time"] for o in outs])) * 1000, 2),
+                })
+
+            ranked = sorted(alive, key=lambda c: results[c]["Rungs"][-1]["Test"][metric], reverse=True)
+            keep = ranked if rung == len(resources) - 1 else ranked[:max(1, math.ceil(len(ranked) / factor))]
+
+            # Latence mesurée au dernier tour de chaque candidat (modèle du fold 0).
+            if latency_budget_ms is not None:
+                for c in alive:
+                    if c in keep and rung < len(resources) - 1:
+                        continue
+                    p50, p95 = _latency(latency_preprocessor, per_candidate[c][0]["estimator"], latency_X)
+                    results[c]["Latency p50 (ms)"] = round(p50, 3)
+                    results[c]["Latency p95 (ms)"] = round(p95, 3)
+                    results[c]["Within budget"] = p95 <= latency_budget_ms
+
+            print(
+                f"→ Tour {rung} | {len(alive)} candidat(s) x {len(folds)} folds "
+                f"| {n_resources} lignes | {time.perf_counter() - start:.1f} s"
+            )
+            alive = keep
+
+    ordered = sorted(
+        results,
+        key=lambda r: (len(r["Rungs"]), r["Rungs"][-1]["Test"][metric]),
+        reverse=True,
+    )
+    eligible = [r for r in ordered if r["Within budget"] is not False]
+    best = eligible[0] if eligible else None
+
+    print(f"📊 Search: {name} ({len(candidates)} candidats, métrique {METRIC_NAMES[metric]})")
+    for r in ordered[:10]:
+        latency = "" if r["Latency p95 (ms)"] is None else f" | p95: {r['Latency p95 (ms)']:.2f} ms"
+        flag = "" if r["Within budget"] is None else (" ✅" if r["Within budget"] else " ❌")
+        print(f"→ {METRIC_NAMES[metric]}: {r['Rungs'][-1]['Test'][metric]:.3f} (tour {len(r['Rungs']) - 1}){latency}{flag} | {r['Params']}")
+    if best is not None:
+        print(f"→ Meilleur dans le budget : {best['Params']}")
+    elif latency_budget_ms is not None:
+        print(f"[WARN] Aucun candidat sous {latency_budget_ms} ms (p95)")
+
+    if tracking_uri is not None:
+        settings = {
+            "cv": cv, "factor": factor, "min_resources": min_resources, "metric": metric,
+            "n_candidates": len(candidates), "latency_budget_ms": latency_budget_ms,
+        }
+        _log_mlflow(name, ordered, best, settings, tracking_uri, experiment)
+
+    return {
+        "Model": name,
+        "Metric": metric,
+        "Resources": resources,
+        "Best": best,
+        "Candidates": ordered,
+    }
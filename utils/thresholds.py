@@ -0,0 +1,82 @@
+"""Seuil de décision optimal au sens d'un coût métier.
+
+Coût = ``cost_fn`` × faux négatifs (mauvais client accepté)
+     + ``cost_fp`` × faux positifs (bon client refusé),
+avec la prédiction « défaut » si ``proba >= seuil``.
+
+La courbe de coût complète s'obtient en une passe O(n log n) : tri des
+probabilités par ordre décroissant, puis sommes cumulées des positifs et des
+négatifs. Chaque seuil candidat (probabilités distinctes) correspond à un
+préfixe du tableau trié.
+
+    from utils.thresholds import optimal_threshold, save_threshold
+    t, cost = optimal_threshold(y_test, pipe.predict_proba(X_test)[:, 1])
+    save_threshold("artifacts/best_model.threshold.json", t, cost=cost)
+"""
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+COST_FN = 10.0
+COST_FP = 1.0
+
+
+def cost_curve(y_true, proba, cost_fn: float = COST_FN, cost_fp: float = COST_FP, grid=None):
+    """Coûts pour chaque seuil candidat.
+
+    Sans ``grid`` : seuils = probabilités distinctes (décroissantes) puis
+    ``inf`` (aucun défaut prédit). Avec ``grid`` : coûts aux seuils donnés,
+    identiques à une matrice de confusion recalculée pour chacun.
+    """
+    y = np.asarray(y_true).astype(bool).ravel()
+    p = np.asarray(proba, dtype=float).ravel()
+
+    order = np.argsort(-p, kind="mergesort")
+    p_sorted = p[order]
+    tp = np.concatenate([[0], np.cumsum(y[order])])
+    fp = np.concatenate([[0], np.cumsum(~y[order])])
+    n_pos = tp[-1]
+
+    if grid is None:
+        # Dernier indice de chaque groupe de probabilités égales.
+        last = np.flatnonzero(np.diff(p_sorted, append=-np.inf) != 0)
+        thresholds = np.concatenate([p_sorted[last], [np.inf]])
+        k = np.concatenate([last + 1, [0]])
+    else:
+        thresholds = np.asarray(grid, dtype=float)
+        # Nombre de probabilités >= seuil, sur le tableau croissant.
+        k = len(p) - np.searchsorted(p_sorted[::-1], thresholds, side="left")
+
+    costs = cost_fp * fp[k] + cost_fn * (n_pos - tp[k])
+    return thresholds, costs
+
+
+def optimal_threshold(y_true, proba, cost_fn: float = COST_FN, cost_fp: float = COST_FP) -> tuple[float, float]:
+    """(seuil, coût) minimisant le coût ; à coût égal, le seuil le plus haut."""
+    thresholds, costs = cost_curve(y_true, proba, cost_fn, cost_fp)
+    i = int(np.argmin(costs))
+    return float(thresholds[i]), float(costs[i])
+
+
+def save_threshold(
+    path,
+    threshold: float,
+    cost: float | None = None,
+    cost_fn: float = COST_FN,
+    cost_fp: float = COST_FP,
+    model_version: str | None = None,
+) -> Path:
+    """Artefact publié à côté du ``.joblib`` et chargé avec le modèle par l'API."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({
+        "threshold": min(float(threshold), 1.0),
+        "cost": cost,
+        "cost_fn": cost_fn,
+        "cost_fp": cost_fp,
+        "model_version": model_version,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+    }, indent=2))
+    return path